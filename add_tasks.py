@@ -1,462 +1,262 @@
 #!/usr/bin/env python3
 """
-Batch-add all tasks to the Task Matrix.
-Run: python add_tasks.py
+Load tasks into the Task Matrix from a JSONL or CSV seed file.
+Run: python add_tasks.py [FILE | -] [--format jsonl|csv]
+     python add_tasks.py --bulk [--batch-size 50] [--workers 4]
+
+FILE defaults to seed/agency-tasks.jsonl; "-" reads stdin. Rows are validated
+against the schema constraints and streamed straight into the API, so even
+very large exports load in constant memory. Invalid rows are reported by line
+number and skipped.
+
+Tasks already on the board (matched by source_id or normalized title) are
+skipped, so re-running is safe; pass --update to also overwrite changed fields.
+--category "Client Work" limits the run to one category subtree, and --fuzzy
+also treats near-identical titles (trigram similarity, looked up in the
+database) as already present. --profile prints per-endpoint latency and the
+server's stage timings (Server-Timing) at the end.
+
+API_BASE points the script at another deployment, e.g. the local stub in
+scripts/task_api_stub.py (default: https://agency-task-matrix.vercel.app).
 """
 
-import json
-import urllib.request
-import urllib.error
+import argparse
+import http.client
+import os
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+from taskmatrix import APIError, Profile, TaskIndex, TaskMatrixClient, in_category
+from taskmatrix.seed import batched, read_seed, with_defaults
+from taskmatrix.sync import DUPLICATE, INSERT, UNCHANGED, UPDATE, iter_fuzzy, iter_sync
+
+API_BASE = os.environ.get("API_BASE", "https://agency-task-matrix.vercel.app").rstrip("/")
+API_URL = f"{API_BASE}/api/tasks"
+SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed", "agency-tasks.jsonl")
+
+# Fields compared against existing rows when run with --update
+SEED_FIELDS = ("description", "leverage", "effort", "urgency", "category")
+
+
+# ─── Loading ─────────────────────────────────────────────────────────────────
+# Bulk mode sends whole chunks to /api/tasks/bulk from several threads; the
+# client caps how many are actually in flight and backs off when the API
+# pushes back. Rows are only POSTed one by one when the API rejects their
+# chunk, so a single bad row can't sink the rest of the batch.
+
+def fetch_existing(api: TaskMatrixClient, fields=()) -> TaskIndex:
+    """Index every task already on the board, including completed/killed ones."""
+    return TaskIndex(api.iter_tasks(status="all", fields=("id", "title", "source_id", *fields)))
+
+
+def load_chunk(api: TaskMatrixClient, chunk: list) -> tuple:
+    """Insert one chunk of (line, task); returns ([(line, task, error)], chunk_error)."""
+    try:
+        api.bulk_create([t for _, t in chunk])
+        return [(i, t, None) for i, t in chunk], None
+    except (OSError, http.client.HTTPException) as chunk_err:
+        # A timeout or reset may come after the server committed the batch; POSTing the
+        # rows again would duplicate every one without a source_id. A re-run skips
+        # whatever did land.
+        return [(i, t, chunk_err) for i, t in chunk], chunk_err
+    except APIError as chunk_err:
+        results = []
+        for i, t in chunk:
+            try:
+                api.create_task(t)
+                results.append((i, t, None))
+            except (APIError, OSError) as e:
+                results.append((i, t, e))
+        return results, chunk_err
+
+
+def _chunk_results(future, line: int):
+    results, chunk_err = future.result()
+    if isinstance(chunk_err, APIError):
+        print(f"  ⚠️  Batch at line {line} failed ({chunk_err}) — retried rows individually")
+    elif chunk_err is not None:
+        print(f"  ⚠️  Batch at line {line} got no answer ({chunk_err}) — it may have been saved; "
+              f"re-run to load whatever is missing")
+    return results
+
+
+def run_bulk(api: TaskMatrixClient, rows, batch_size: int):
+    """Yield (line, task, error) per row as chunks complete.
 
-API_URL = "https://agency-task-matrix.vercel.app/api/tasks"
-
-tasks = [
-    # ─── TODAY ───────────────────────────────────────────────────────────────
-
-    # Client Work > ListKit
-    {
-        "title": "Remove Andre from ListKit flows → switch to support.listkit.io",
-        "description": "Turn off any flows coming from Andre at ListKit. They should come from support.listkit.io instead.",
-        "urgency": "today",
-        "category": "Client Work > ListKit",
-        "leverage": 8,
-        "effort": 3,
-    },
-    {
-        "title": "Send ListKit KPI report (this week + next week agenda)",
-        "description": "Send weekly KPI report: what was worked on this week and what's on the agenda for next week.",
-        "urgency": "today",
-        "category": "Client Work > ListKit",
-        "leverage": 8,
-        "effort": 2,
-    },
-    {
-        "title": "Resume ListKit daily email broadcasts",
-        "description": "Resume sending daily broadcasts for ListKit.",
-        "urgency": "today",
-        "category": "Client Work > ListKit",
-        "leverage": 7,
-        "effort": 2,
-    },
-    {
-        "title": "Send ListKit free trial flow weekly analytics",
-        "description": "From Fathom PLG call with François: send weekly analytics report on free trial email flow.",
-        "urgency": "today",
-        "category": "Client Work > ListKit",
-        "leverage": 7,
-        "effort": 3,
-    },
-
-    # Client Work > Atlas
-    {
-        "title": "Remove false social proof claims from Atlas emails",
-        "description": "Found in Atlas Slack: remove any false social proof claims from email flows.",
-        "urgency": "today",
-        "category": "Client Work > Atlas",
-        "leverage": 8,
-        "effort": 2,
-    },
-    {
-        "title": "Send Atlas weekly report + revised campaigns",
-        "description": "Send the weekly status report for Atlas and share revised campaign emails.",
-        "urgency": "today",
-        "category": "Client Work > Atlas",
-        "leverage": 7,
-        "effort": 2,
-    },
-    {
-        "title": "Fix first two Atlas email flows (copy + flow logic)",
-        "description": "Atlas requested fixes to the first two email flows — update copy and fix flow logic.",
-        "urgency": "today",
-        "category": "Client Work > Atlas",
-        "leverage": 8,
-        "effort": 5,
-    },
-
-    # Sales
-    {
-        "title": "Follow up with all past sales calls (last month)",
-        "description": "Send follow-ups to everyone from sales calls over the past month. Update pipeline with where each lead stands.",
-        "urgency": "today",
-        "category": "Sales",
-        "leverage": 9,
-        "effort": 4,
-    },
-
-    # Hiring
-    {
-        "title": "Set up hiring meetings with Shimon and Mojo (Editor roles)",
-        "description": "Book meetings with Shimon and Mojo for the Editor and Editor Plus Strategist roles at the agency.",
-        "urgency": "today",
-        "category": "Hiring",
-        "leverage": 8,
-        "effort": 2,
-    },
-
-    # Marketing > Cold Email
-    {
-        "title": "Respond to all past cold email replies",
-        "description": "Reply to all outstanding cold email replies in inbox.",
-        "urgency": "today",
-        "category": "Marketing > Cold Email",
-        "leverage": 8,
-        "effort": 3,
-    },
-
-    # ─── THIS WEEK ────────────────────────────────────────────────────────────
-
-    # Client Work > ListKit
-    {
-        "title": "Scrub email lists for ListKit",
-        "description": "Find a way to scrub lists for ListKit to improve deliverability.",
-        "urgency": "this_week",
-        "category": "Client Work > ListKit",
-        "leverage": 7,
-        "effort": 4,
-    },
-    {
-        "title": "Write ListKit 30-email broadcast",
-        "description": "Write a 30-email broadcast sequence for ListKit.",
-        "urgency": "this_week",
-        "category": "Client Work > ListKit",
-        "leverage": 7,
-        "effort": 5,
-    },
-    {
-        "title": "Launch ListKit win-back campaign with A/B test",
-        "description": "From Fathom PLG call: launch win-back campaign. Set up A/B test on subject lines / content.",
-        "urgency": "this_week",
-        "category": "Client Work > ListKit",
-        "leverage": 8,
-        "effort": 5,
-    },
-    {
-        "title": "Reschedule ListKit recurring call to Tuesdays 4pm UK",
-        "description": "From Fathom PLG call: move recurring call to Tuesdays 4pm UK time starting in March.",
-        "urgency": "this_week",
-        "category": "Client Work > ListKit",
-        "leverage": 4,
-        "effort": 1,
-    },
-
-    # Client Work > Tunzilla
-    {
-        "title": "Book onboarding call with Mohammed at Tunzilla",
-        "description": "Respond to Mohammed at Tunzilla and book their onboarding call.",
-        "urgency": "this_week",
-        "category": "Client Work > Tunzilla",
-        "leverage": 9,
-        "effort": 2,
-    },
-    {
-        "title": "Go through Tunzilla onboarding form",
-        "description": "Review and complete Tunzilla's onboarding form in preparation for the kickoff call.",
-        "urgency": "this_week",
-        "category": "Client Work > Tunzilla",
-        "leverage": 8,
-        "effort": 3,
-    },
-    {
-        "title": "Put together timeline and delivery plan for Tunzilla",
-        "description": "Map out a timeline and plan for Tunzilla's email marketing delivery.",
-        "urgency": "this_week",
-        "category": "Client Work > Tunzilla",
-        "leverage": 8,
-        "effort": 4,
-    },
-
-    # Client Work > Atlas
-    {
-        "title": "Create new third email flow for Atlas",
-        "description": "Atlas requested a new third email flow. Design and build it.",
-        "urgency": "this_week",
-        "category": "Client Work > Atlas",
-        "leverage": 7,
-        "effort": 5,
-    },
-    {
-        "title": "Improve design across all Atlas email flows",
-        "description": "Atlas feedback: improve email design for all flows.",
-        "urgency": "this_week",
-        "category": "Client Work > Atlas",
-        "leverage": 6,
-        "effort": 4,
-    },
-    {
-        "title": "Fix dead links in Atlas emails (Discord links)",
-        "description": "Atlas Slack: fix dead links, particularly Discord links in emails.",
-        "urgency": "this_week",
-        "category": "Client Work > Atlas",
-        "leverage": 6,
-        "effort": 2,
-    },
-
-    # Sales
-    {
-        "title": "Update CRM pipeline for all active leads",
-        "description": "Go through all leads, update pipeline stages and notes for each one.",
-        "urgency": "this_week",
-        "category": "Sales",
-        "leverage": 7,
-        "effort": 3,
-    },
-    {
-        "title": "Send meeting follow-up emails to all prospects",
-        "description": "Send tailored follow-up emails to all prospects from recent sales meetings.",
-        "urgency": "this_week",
-        "category": "Sales",
-        "leverage": 8,
-        "effort": 3,
-    },
-
-    # Hiring
-    {
-        "title": "Review Contra applications for landing page designer",
-        "description": "Go through all Contra applications for the landing page designer role and start interviewing.",
-        "urgency": "this_week",
-        "category": "Hiring",
-        "leverage": 7,
-        "effort": 3,
-    },
-    {
-        "title": "Send copywriter test tasks to two candidates",
-        "description": "Two copywriters sent their info via email. Send them their test tasks.",
-        "urgency": "this_week",
-        "category": "Hiring",
-        "leverage": 7,
-        "effort": 2,
-    },
-
-    # ─── WHENEVER (backlog) ───────────────────────────────────────────────────
-
-    # Client Work > ListKit
-    {
-        "title": "Plan ListKit email engine launch campaign",
-        "description": "From Fathom PLG call: plan the campaign for launching the email engine.",
-        "urgency": "whenever",
-        "category": "Client Work > ListKit",
-        "leverage": 8,
-        "effort": 6,
-    },
-
-    # Marketing > Funnel
-    {
-        "title": "Script confirmation page videos for ads funnel",
-        "description": "Write scripts for the confirmation page videos to use in the ads funnel.",
-        "urgency": "whenever",
-        "category": "Marketing > Funnel",
-        "leverage": 7,
-        "effort": 5,
-    },
-    {
-        "title": "Script VSL for the funnel",
-        "description": "Write the VSL (video sales letter) script for the main funnel.",
-        "urgency": "whenever",
-        "category": "Marketing > Funnel",
-        "leverage": 9,
-        "effort": 7,
-    },
-    {
-        "title": "Build confirmation page in ClickFunnels",
-        "description": "Set up and build the confirmation page in ClickFunnels.",
-        "urgency": "whenever",
-        "category": "Marketing > Funnel",
-        "leverage": 8,
-        "effort": 5,
-    },
-    {
-        "title": "Set up Facebook pixel standard event code in ClickFunnels",
-        "description": "Install and configure the Facebook pixel standard event tracking code on ClickFunnels pages.",
-        "urgency": "whenever",
-        "category": "Marketing > Funnel",
-        "leverage": 7,
-        "effort": 3,
-    },
-
-    # Marketing > Cold Email
-    {
-        "title": "Scrape and set up cold email campaign for Airr Digital agency prospects",
-        "description": "Scrape a list of agency prospects and set up an outbound cold email campaign targeting them.",
-        "urgency": "whenever",
-        "category": "Marketing > Cold Email",
-        "leverage": 8,
-        "effort": 5,
-    },
-    {
-        "title": "Scrape and set up cold email campaign for Airr Digital SaaS prospects",
-        "description": "Scrape a list of SaaS prospects and set up an outbound cold email campaign.",
-        "urgency": "whenever",
-        "category": "Marketing > Cold Email",
-        "leverage": 8,
-        "effort": 5,
-    },
-    {
-        "title": "Buy inboxes from Scaled Mail and set up Haven.io outreach",
-        "description": "Buy inboxes from Scaled Mail, configure them, and launch cold outreach for Haven.io.",
-        "urgency": "whenever",
-        "category": "Marketing > Cold Email",
-        "leverage": 7,
-        "effort": 4,
-    },
-    {
-        "title": "Vibe-code a landing page/website for Haven.io",
-        "description": "Build a test website for Haven.io to use in cold email campaigns.",
-        "urgency": "whenever",
-        "category": "Marketing > Cold Email",
-        "leverage": 6,
-        "effort": 6,
-    },
-
-    # Systems
-    {
-        "title": "Map out full client delivery process for paid ads offer",
-        "description": "Document the end-to-end client delivery process for the new paid ads service.",
-        "urgency": "whenever",
-        "category": "Systems",
-        "leverage": 8,
-        "effort": 6,
-    },
-    {
-        "title": "Set up onboarding system for agency paid ads clients",
-        "description": "Build out the full onboarding flow: welcome, forms, kickoff, delivery checklist.",
-        "urgency": "whenever",
-        "category": "Systems",
-        "leverage": 8,
-        "effort": 7,
-    },
-    {
-        "title": "Update Airtable to support paid ads client tracking",
-        "description": "Configure Airtable so we can offer and track paid ads deliverables for clients.",
-        "urgency": "whenever",
-        "category": "Systems",
-        "leverage": 7,
-        "effort": 4,
-    },
-    {
-        "title": "Map out weekly marketing metrics dashboard",
-        "description": "Define all the metrics to review every week across all marketing channels. Build a review system.",
-        "urgency": "whenever",
-        "category": "Systems",
-        "leverage": 7,
-        "effort": 4,
-    },
-
-    # Sales Process
-    {
-        "title": "Create sales process + pitch deck for agency clients",
-        "description": "Build a structured sales process and pitch deck specifically for agency client sales calls.",
-        "urgency": "whenever",
-        "category": "Sales",
-        "leverage": 9,
-        "effort": 6,
-    },
-    {
-        "title": "Create sales process + pitch deck for SaaS clients",
-        "description": "Build a second version of the sales process and pitch deck tailored to SaaS client prospects.",
-        "urgency": "whenever",
-        "category": "Sales",
-        "leverage": 9,
-        "effort": 6,
-    },
-
-    # Content / Social
-    {
-        "title": "Set up daily Twitter posting system",
-        "description": "Create a structure and workflow to post on Twitter every single day.",
-        "urgency": "whenever",
-        "category": "Content",
-        "leverage": 6,
-        "effort": 5,
-    },
-    {
-        "title": "Book call with Starborn.ai about LinkedIn content management",
-        "description": "Explore working with Starborn.ai to handle LinkedIn daily posting.",
-        "urgency": "whenever",
-        "category": "Content",
-        "leverage": 7,
-        "effort": 1,
-    },
-    {
-        "title": "Book calls with other LinkedIn content agencies",
-        "description": "Research and book discovery calls with 2-3 other LinkedIn content agencies.",
-        "urgency": "whenever",
-        "category": "Content",
-        "leverage": 6,
-        "effort": 2,
-    },
-    {
-        "title": "Launch YouTube channel (3 videos/week — SaaS GTM content)",
-        "description": "Start posting on YouTube every week. Minimum 3 videos/week focused on helping SaaS companies with their GTM strategy. Set up video production + editing workflow.",
-        "urgency": "whenever",
-        "category": "Content",
-        "leverage": 7,
-        "effort": 9,
-    },
-
-    # Hiring
-    {
-        "title": "Film new video for STR application (LinkedIn recruitment)",
-        "description": "Film a new recruitment video for the STR application currently live on LinkedIn.",
-        "urgency": "whenever",
-        "category": "Hiring",
-        "leverage": 5,
-        "effort": 4,
-    },
-    {
-        "title": "Update Gamma doc with LinkedIn applicant tracking",
-        "description": "Update the Gamma paid doc to track where LinkedIn applicants are being sent in the funnel.",
-        "urgency": "whenever",
-        "category": "Hiring",
-        "leverage": 5,
-        "effort": 2,
-    },
-]
-
-
-def post_task(task: dict) -> dict:
-    payload = json.dumps({
-        "title": task["title"],
-        "description": task.get("description", ""),
-        "source": "manual",
-        "leverage": task.get("leverage", 5),
-        "effort": task.get("effort", 5),
-        "urgency": task.get("urgency", "whenever"),
-        "category": task.get("category"),
-    }).encode("utf-8")
-
-    req = urllib.request.Request(
-        API_URL,
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        return json.loads(resp.read())
+    The pool has a thread for every request the client's limiter could allow;
+    the limiter decides how many of them are actually in flight. rows is
+    consumed lazily; at most 2 × that many chunks are held at a time.
+    """
+    workers = api.limiter.maximum
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for chunk in batched(rows, batch_size):
+            pending[pool.submit(load_chunk, api, chunk)] = chunk[0][0]
+            if len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from _chunk_results(future, pending.pop(future))
+        for future in as_completed(pending):
+            yield from _chunk_results(future, pending[future])
+
+
+def run_sequential(api: TaskMatrixClient, rows):
+    for i, task in rows:
+        try:
+            api.create_task(task)
+            yield i, task, None
+        except (APIError, OSError) as e:
+            yield i, task, e
 
 
 def main():
-    print(f"Adding {len(tasks)} tasks to Task Matrix...\n")
-    success = 0
+    parser = argparse.ArgumentParser(description="Load tasks into the Task Matrix from a seed file.")
+    parser.add_argument("seed", nargs="?", default=SEED_FILE,
+                        help='JSONL or CSV file, or "-" for stdin (default: seed/agency-tasks.jsonl)')
+    parser.add_argument("--format", choices=("jsonl", "csv"),
+                        help="seed format (default: from the file extension; stdin is JSONL)")
+    parser.add_argument("--category", metavar="PREFIX",
+                        help='only load seed rows in this category subtree, e.g. "Client Work"')
+    parser.add_argument("--bulk", action="store_true", help="insert in batches via /api/tasks/bulk")
+    parser.add_argument("--batch-size", type=int, default=50, help="rows per bulk request (default: 50)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="concurrent bulk requests to start with; grows while the API keeps up "
+                             "and halves when it throttles (default: 4)")
+    parser.add_argument("--update", action="store_true",
+                        help="also overwrite existing tasks whose fields differ from the seed")
+    parser.add_argument("--fuzzy", action="store_true",
+                        help="treat rows whose title closely matches an existing task as already present")
+    parser.add_argument("--min-similarity", type=float, default=0.6,
+                        help="trigram similarity needed for --fuzzy (default: 0.6)")
+    parser.add_argument("--profile", action="store_true",
+                        help="report request latency per endpoint and server stage timings")
+    args = parser.parse_args()
+    if args.batch_size < 1 or args.workers < 1:
+        parser.error("--batch-size and --workers must be at least 1")
+
+    profile = Profile() if args.profile else None
+    api = TaskMatrixClient(API_URL, concurrency=args.workers,
+                           max_concurrency=max(32, args.workers), profile=profile)
+    fields = SEED_FIELDS if args.update else ()
+    try:
+        existing = fetch_existing(api, fields)
+    except (APIError, OSError) as e:
+        print(f"❌ Could not fetch existing tasks — {e}")
+        raise SystemExit(1)
+
+    print(f"Adding tasks from {args.seed} to Task Matrix...\n")
+    counts = {"rows": 0, "invalid": 0, UNCHANGED: 0, DUPLICATE: 0, "added": 0, "updated": 0}
     failed = []
+    updates = []
+    line = 0
+    started = time.perf_counter()
+
+    def valid_tasks():
+        nonlocal line
+        for line, task, error in read_seed(args.seed, args.format):
+            if error is None and args.category and not in_category(task.get("category"), args.category):
+                continue
+            counts["rows"] += 1
+            if error is not None:
+                print(f"  {line:2}. ❌ INVALID: {error}")
+                counts["invalid"] += 1
+                continue
+            yield task
+
+    def flush_updates():
+        try:
+            api.bulk_update([patch for _, _, patch in updates])
+        except (APIError, OSError) as e:
+            for i, task, _ in updates:
+                print(f"  {i:2}. ❌ FAILED: {task['title'][:50]} — {e}")
+                failed.append(task["title"])
+        else:
+            for i, task, patch in updates:
+                changed = ", ".join(k for k in patch if k != "id")
+                print(f"  {i:2}. ✏️  {task['title'][:50]} ({changed})")
+                counts["updated"] += 1
+        updates.clear()
+
+    def record_update(i, task, patch):
+        updates.append((i, task, patch))
+        if len(updates) >= args.batch_size:
+            flush_updates()
 
-    for i, task in enumerate(tasks, 1):
+    claimed = set()
+
+    def fuzzy_lookup(titles):
         try:
-            result = post_task(task)
+            return api.match_titles(titles, args.min_similarity)
+        except APIError as e:
+            if e.status != 501:
+                raise
+            print("  ⚠️  Fuzzy matching isn't set up on the server — exact titles only")
+            args.fuzzy = False
+            return [{"task": None} for _ in titles]
+
+    def resolve_fuzzy(candidates):
+        """Drop candidates whose title is a near-duplicate of a task already on the board."""
+        # The database also holds rows this run has inserted by now — only tasks on the
+        # board before the run started can make a row a near-duplicate
+        results = iter_fuzzy([t for _, t in candidates], fuzzy_lookup, fields, claimed, existing.ids)
+        for (i, task), (kind, _, patch, match) in zip(candidates, results):
+            if kind == INSERT:
+                yield i, task
+                continue
+            print(f"  {i:2}. ≈  {task['title'][:50]} → \"{match['task']['title'][:50]}\" ({match['similarity']:.2f})")
+            if kind == UPDATE:
+                record_update(i, task, patch)
+            else:
+                counts[UNCHANGED] += 1
+
+    def inserts():
+        for i, task in classified():
+            yield i, with_defaults(task)
+
+    def classified():
+        candidates = []
+        # iter_sync pulls one row at a time, so `line` is the row just classified
+        for kind, task, detail in iter_sync(valid_tasks(), existing, fields):
+            if kind in (UPDATE, UNCHANGED):
+                claimed.add(detail["id"])
+            if kind == INSERT and args.fuzzy:
+                candidates.append((line, task))
+                if len(candidates) >= args.batch_size:
+                    yield from resolve_fuzzy(candidates)
+                    candidates = []
+            elif kind == INSERT:
+                yield line, task
+            elif kind == UPDATE:
+                record_update(line, task, detail)
+            else:
+                counts[kind] += 1
+        if candidates:
+            yield from resolve_fuzzy(candidates)
+
+    rows = run_bulk(api, inserts(), args.batch_size) if args.bulk else run_sequential(api, inserts())
+    for i, task, error in rows:
+        if error is None:
             urgency_icon = {"today": "🔴", "this_week": "🟡", "whenever": "⚪"}.get(task["urgency"], "⚪")
             print(f"  {i:2}. {urgency_icon} {task['title'][:60]}")
-            success += 1
-            time.sleep(0.3)  # Be gentle on the API
-        except Exception as e:
-            print(f"  {i:2}. ❌ FAILED: {task['title'][:50]} — {e}")
+            counts["added"] += 1
+        else:
+            print(f"  {i:2}. ❌ FAILED: {task['title'][:50]} — {error}")
             failed.append(task["title"])
-            time.sleep(1)
+    if updates:
+        flush_updates()
 
-    print(f"\n✅ {success}/{len(tasks)} tasks added successfully.")
+    elapsed = time.perf_counter() - started
+    done = counts["added"] + counts["updated"]
+    print(f"\n✅ {counts['added']}/{counts['rows']} tasks added successfully.")
+    print(f"   {counts[UNCHANGED]} already present | {counts['updated']} updated | "
+          f"{counts[DUPLICATE]} duplicates in file | {counts['invalid']} invalid")
+    print(f"   {elapsed:.1f}s — {done / elapsed if elapsed else 0:.1f} rows/s")
     if failed:
         print(f"\n❌ Failed tasks ({len(failed)}):")
         for t in failed:
             print(f"   - {t}")
+    if profile:
+        print(f"\n{profile.report()}")
 
 
 if __name__ == "__main__":
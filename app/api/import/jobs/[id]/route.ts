@@ -0,0 +1,19 @@
+import { after, NextRequest, NextResponse } from 'next/server'
+import { getImportJob, needsWorker, runImportJob } from '@/lib/import-jobs'
+import { withTiming } from '@/lib/timing'
+
+export const dynamic = 'force-dynamic'
+export const maxDuration = 60
+
+// Progress for one import job. Polling also keeps the job moving: if its last worker
+// finished a slice (or died), a new one resumes from the saved checkpoint.
+export const GET = withTiming('import.job', async (_request: NextRequest, { params }: { params: Promise<{ id: string }> }) => {
+  const { id } = await params
+  const { job, error } = await getImportJob(id)
+
+  if (error) return NextResponse.json({ error }, { status: 500 })
+  if (!job) return NextResponse.json({ error: 'Import job not found' }, { status: 404 })
+
+  if (needsWorker(job)) after(() => runImportJob(job.id))
+  return NextResponse.json({ job })
+})
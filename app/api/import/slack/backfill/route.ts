@@ -0,0 +1,34 @@
+import { NextResponse } from 'next/server'
+import { supabase } from '@/lib/supabase'
+import { PendingOverviewRow, fillPendingOverviews, overviewsEnabled } from '@/lib/overview'
+import { timed, withTiming } from '@/lib/timing'
+
+export const dynamic = 'force-dynamic'
+export const maxDuration = 60
+
+const BACKFILL_BATCH = 200
+
+// Fills in ai_overview for Slack tasks that were imported after the overview time budget ran
+// out, a batch per call; remaining counts every task still waiting, so callers repeat until 0
+export const POST = withTiming('import.slack_backfill', async () => {
+  if (!overviewsEnabled()) {
+    return NextResponse.json({ backfilled: 0, remaining: 0, message: 'OPENAI_API_KEY not set' })
+  }
+
+  try {
+    const { data, count, error } = await timed('db', () => supabase
+      .from('tasks')
+      .select('id, metadata', { count: 'exact' })
+      .eq('source', 'slack')
+      .eq('metadata->>overview_pending', 'true')
+      .limit(BACKFILL_BATCH))
+
+    if (error) return NextResponse.json({ error: error.message }, { status: 500 })
+
+    const rows = (data || []) as PendingOverviewRow[]
+    const backfilled = await fillPendingOverviews(rows)
+    return NextResponse.json({ backfilled, remaining: Math.max(0, (count ?? rows.length) - backfilled) })
+  } catch (err) {
+    return NextResponse.json({ error: String(err) }, { status: 500 })
+  }
+})
@@ -1,9 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server'
-import { supabase } from '@/lib/supabase'
+import { UPDATABLE_FIELDS, TaskPatch, bulkUpdateTasks, invalidPatch, upsertTasks } from '@/lib/tasks'
+import { withTiming } from '@/lib/timing'
 
 export const dynamic = 'force-dynamic'
 
-export async function POST(request: NextRequest) {
+export const POST = withTiming('tasks.bulk_create', async (request: NextRequest) => {
   const body = await request.json()
 
   if (!Array.isArray(body.tasks)) {
@@ -22,22 +23,56 @@ export async function POST(request: NextRequest) {
     effort: (t.effort as number) ?? 5,
     urgency: (t.urgency as string) || 'whenever',
     category: (t.category as string) || null,
-    status: 'active',
+    status: (t.status as string) || 'active',
     context_url: (t.context_url as string) || null,
     tags: (t.tags as string[]) || [],
   }))
 
-  const { data, error } = await supabase
-    .from('tasks')
-    .insert(rows)
-    .select()
+  // Rows whose source_id already exists are skipped (or refreshed with { refresh: true })
+  const { inserted, updated, skipped, error } = await upsertTasks(rows, { refresh: body.refresh === true })
 
   if (error) {
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
 
   return NextResponse.json(
-    { imported: data?.length || 0, tasks: data },
+    { imported: inserted.length, updated: updated.length, skipped, tasks: [...inserted, ...updated] },
     { status: 201 }
   )
-}
+})
+
+export const PATCH = withTiming('tasks.bulk_update', async (request: NextRequest) => {
+  const body = await request.json()
+
+  if (!Array.isArray(body.tasks)) {
+    return NextResponse.json(
+      { error: 'Expected { tasks: [{ id, ...fields }] }' },
+      { status: 400 }
+    )
+  }
+
+  // Merge repeated ids so every row is written exactly once. Rows are checked against the
+  // table's constraints first: a 400 tells the write queue to drop the batch, not retry it.
+  const patchesById = new Map<string, TaskPatch>()
+  for (const [i, t] of (body.tasks as Record<string, unknown>[]).entries()) {
+    const problem = t && typeof t === 'object' ? invalidPatch(t) : 'expected an object'
+    if (problem) {
+      return NextResponse.json({ error: `tasks[${i}]: ${problem}` }, { status: 400 })
+    }
+    const id = t.id as string
+    const patch: TaskPatch = patchesById.get(id) || { id }
+    for (const field of UPDATABLE_FIELDS) {
+      if (t[field] !== undefined) patch[field] = t[field]
+    }
+    patchesById.set(id, patch)
+  }
+  const patches = [...patchesById.values()]
+
+  const { data, error } = await bulkUpdateTasks(patches)
+
+  if (error) {
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+
+  return NextResponse.json({ updated: data.length, tasks: data })
+})
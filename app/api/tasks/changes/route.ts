@@ -0,0 +1,89 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { supabase, Task } from '@/lib/supabase'
+import { Cursor, compareCursors, decodeCursor, encodeCursor } from '@/lib/cursor'
+import { timed, withTiming } from '@/lib/timing'
+
+export const dynamic = 'force-dynamic'
+
+const MAX_CHANGES = 1000
+// updated_at is the writing transaction's start time, so a slow transaction can commit after
+// a later timestamp has already been served and land behind the watermark. ?overlap=1 also
+// re-reads this much history before the cursor; the board asks for it on the first page of
+// every poll and applyTaskChanges() ignores the rows it already has.
+const OVERLAP_MS = 5_000
+
+type Change = Cursor & { task?: Task }
+
+// Rows changed since a watermark, oldest first, in every status — so the board can drop rows
+// that were completed/killed elsewhere as well as patch edited ones — plus the ids deleted
+// since (task_deletions, which also records rows archive_tasks() moved out).
+// ?since= takes the cursor from a previous response or a plain updated_at timestamp;
+// without it the response is just a cursor for "now". more: true means call again with the
+// returned cursor straight away.
+export const GET = withTiming('tasks.changes', async (request: NextRequest) => {
+  const { searchParams } = new URL(request.url)
+  const since = searchParams.get('since')
+
+  if (!since) {
+    return NextResponse.json({ tasks: [], deleted: [], cursor: new Date().toISOString(), more: false })
+  }
+
+  let after = decodeCursor(since)
+  if (!after) {
+    if (Number.isNaN(Date.parse(since))) return NextResponse.json({ error: 'Invalid since cursor' }, { status: 400 })
+    after = { ts: new Date(since).toISOString(), id: '' }
+  }
+  const overlap = searchParams.get('overlap') === '1'
+  const from = after
+
+  // Same keyset window on both tables: (timestamp, id) past the cursor
+  const pastCursor = (ts: string, id: string) => {
+    if (overlap) return `${ts}.gt."${new Date(Date.parse(from.ts) - OVERLAP_MS).toISOString()}"`
+    if (from.id) return `${ts}.gt."${from.ts}",and(${ts}.eq."${from.ts}",${id}.gt."${from.id}")`
+    return `${ts}.gt."${from.ts}"`
+  }
+
+  const [updated, deleted] = await timed('db', () => Promise.all([
+    supabase
+      .from('tasks')
+      .select('*')
+      .or(pastCursor('updated_at', 'id'))
+      .order('updated_at', { ascending: true })
+      .order('id', { ascending: true })
+      .limit(MAX_CHANGES),
+    supabase
+      .from('task_deletions')
+      .select('task_id, deleted_at')
+      .or(pastCursor('deleted_at', 'task_id'))
+      .order('deleted_at', { ascending: true })
+      .order('task_id', { ascending: true })
+      .limit(MAX_CHANGES),
+  ]))
+
+  if (updated.error) return NextResponse.json({ error: updated.error.message }, { status: 500 })
+
+  const edits: Change[] = ((updated.data || []) as Task[]).map((task) => ({ ts: task.updated_at, id: task.id, task }))
+  // task_deletions not migrated yet — deletes only show up on a full reload, as before
+  const tombstones: Change[] = deleted.error
+    ? []
+    : (deleted.data || []).map((d) => ({ ts: d.deleted_at as string, id: d.task_id as string }))
+
+  // Each table is complete only up to its own last row when it filled a page, so the
+  // merged page stops at the earlier of those and the rest comes on the next call
+  const full = [edits, tombstones].filter((list) => list.length === MAX_CHANGES)
+  const end = full.map((list) => list[list.length - 1]).sort(compareCursors)[0]
+  const changes = [...edits, ...tombstones].sort(compareCursors)
+  const page = end ? changes.filter((c) => compareCursors(c, end) <= 0) : changes
+  const more = full.length > 0
+
+  // With overlap a page that isn't full can end before the watermark; the cursor then stays
+  // put. A full one moves to its last change (even inside the window) so paging continues.
+  const last = page[page.length - 1]
+  const advanced = last && (more || !overlap || compareCursors(last, after) > 0)
+  return NextResponse.json({
+    tasks: page.flatMap((c) => (c.task ? [c.task] : [])),
+    deleted: page.flatMap((c) => (c.task ? [] : [c.id])),
+    cursor: advanced ? encodeCursor(last.ts, last.id) : since,
+    more,
+  })
+})
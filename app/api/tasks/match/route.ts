@@ -0,0 +1,39 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { supabase } from '@/lib/supabase'
+import { timed, withTiming } from '@/lib/timing'
+
+export const dynamic = 'force-dynamic'
+
+const MAX_TITLES = 1000
+
+// Fuzzy title lookup: the closest existing task (trigram similarity) for each title in
+// { titles: [...], min_similarity?: 0.5, status?: 'all' }. Unmatched titles come back with task: null.
+export const POST = withTiming('tasks.match', async (request: NextRequest) => {
+  const body = await request.json()
+  const titles = body.titles
+
+  if (!Array.isArray(titles) || !titles.every((t) => typeof t === 'string')) {
+    return NextResponse.json({ error: 'Expected { titles: [string, ...] }' }, { status: 400 })
+  }
+  if (titles.length > MAX_TITLES) {
+    return NextResponse.json({ error: `At most ${MAX_TITLES} titles per request` }, { status: 400 })
+  }
+  if (titles.length === 0) return NextResponse.json({ matches: [] })
+
+  const { data, error } = await timed('db', () => supabase.rpc('match_task_titles', {
+    titles,
+    min_similarity: typeof body.min_similarity === 'number' ? body.min_similarity : 0.5,
+    task_status: typeof body.status === 'string' ? body.status : 'all',
+  }))
+
+  if (error) {
+    if (error.code === 'PGRST202' || error.message?.includes('match_task_titles')) {
+      return NextResponse.json(
+        { error: 'Fuzzy matching is not set up yet. Run the SQL schema in your Supabase SQL Editor first.' },
+        { status: 501 }
+      )
+    }
+    return NextResponse.json({ error: error.message }, { status: 500 })
+  }
+  return NextResponse.json({ matches: data || [] })
+})
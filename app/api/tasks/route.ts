@@ -1,19 +1,52 @@
 import { NextRequest, NextResponse } from 'next/server'
-import { supabase } from '@/lib/supabase'
+import { supabase, Task } from '@/lib/supabase'
+import { prioritySort } from '@/lib/priority'
+import { Cursor, decodeCursor, encodeCursor } from '@/lib/cursor'
+import { categoryPathLiteral, categoryTextFilter } from '@/lib/categories'
+import { fitTaskRows, missingTaskColumns } from '@/lib/schema'
+import { timed, withTiming } from '@/lib/timing'
 
 export const dynamic = 'force-dynamic'
 
-export async function GET(request: NextRequest) {
-  const { searchParams } = new URL(request.url)
-  const status = searchParams.get('status') || 'active'
+const TASK_COLUMNS = [
+  'id', 'title', 'description', 'source', 'source_id', 'leverage', 'effort', 'status',
+  'urgency', 'category', 'created_at', 'updated_at', 'completed_at', 'context_url', 'tags', 'metadata',
+  'urgency_rank', 'priority_score', 'category_path',
+]
+const MAX_PAGE_SIZE = 1000
+const STREAM_PAGE_SIZE = 500
+
+type PageRow = { created_at: string; id: string }
+
+// [query param, schema object it needs, param that switches buildQuery to the text fallback]
+const TEXT_FALLBACKS = [
+  ['category_prefix', 'category_path', 'category_match'],
+  ['search', 'search_vector', 'search_match'],
+] as const
 
+// Keyset pagination on (created_at desc, id desc) — each page is an index range scan.
+// ?order=priority instead ranks by the generated urgency_rank/priority_score columns
+// (same order as prioritySort), served by tasks_active_priority_idx. Every status other
+// than active reads the tasks_all view, which adds the archived history in tasks_archive.
+function buildQuery(searchParams: URLSearchParams, columns: string, after: Cursor | null, limit: number | null) {
+  const status = searchParams.get('status') || 'active'
   const urgency = searchParams.get('urgency')
   const category = searchParams.get('category')
+  const categoryPrefix = searchParams.get('category_prefix')
+  const search = searchParams.get('search')?.trim()
+
+  // archive=skip is set by the pre-migration fallback
+  const table = status !== 'active' && searchParams.get('archive') !== 'skip' ? 'tasks_all' : 'tasks'
+  const query = supabase.from(table).select(columns)
 
-  const query = supabase
-    .from('tasks')
-    .select('*')
+  if (searchParams.get('order') === 'priority') {
+    query
+      .order('urgency_rank', { ascending: true })
+      .order('priority_score', { ascending: false })
+  }
+  query
     .order('created_at', { ascending: false })
+    .order('id', { ascending: false })
 
   if (status !== 'all') {
     query.eq('status', status)
@@ -24,64 +57,210 @@ export async function GET(request: NextRequest) {
   if (category) {
     query.eq('category', category)
   }
+  if (categoryPrefix) {
+    // The category and everything under it; category_match=text is set by the pre-migration fallback
+    if (searchParams.get('category_match') === 'text') {
+      query.or(categoryTextFilter(categoryPrefix))
+    } else {
+      query.contains('category_path', categoryPathLiteral(categoryPrefix))
+    }
+  }
+  if (search) {
+    // Full-text over title, description and AI overview; search_match=text is the pre-migration fallback
+    if (searchParams.get('search_match') === 'text') {
+      const pattern = search.replace(/[%*,()"\\]/g, ' ')
+      query.or(`title.ilike."*${pattern}*",description.ilike."*${pattern}*"`)
+    } else {
+      query.textSearch('search_vector', search, { type: 'websearch', config: 'english' })
+    }
+  }
+  if (after) {
+    query.or(`created_at.lt."${after.ts}",and(created_at.eq."${after.ts}",id.lt."${after.id}")`)
+  }
+  if (limit) {
+    query.limit(limit)
+  }
+  return query
+}
+
+export const GET = withTiming('tasks.list', async (request: NextRequest) => {
+  const { searchParams } = new URL(request.url)
+
+  // ?fields=id,title,urgency — project only the columns the caller needs
+  let columns = '*'
+  const fields = searchParams.get('fields')
+  if (fields) {
+    const requested = fields.split(',').map((f) => f.trim()).filter(Boolean)
+    const unknown = requested.filter((f) => !TASK_COLUMNS.includes(f))
+    if (unknown.length > 0) {
+      return NextResponse.json({ error: `Unknown fields: ${unknown.join(', ')}` }, { status: 400 })
+    }
+    const missing = await missingTaskColumns()
+    const unmigrated = requested.filter((f) => missing.has(f))
+    if (unmigrated.length > 0) {
+      return NextResponse.json(
+        { error: `Fields not in this database yet (run supabase-schema.sql): ${unmigrated.join(', ')}` },
+        { status: 400 }
+      )
+    }
+    // created_at and id are always needed to build the next cursor
+    columns = [...new Set([...requested, 'created_at', 'id'])].join(',')
+  }
+
+  const limitParam = searchParams.get('limit')
+  const limit = limitParam ? Math.min(Math.max(parseInt(limitParam, 10) || 1, 1), MAX_PAGE_SIZE) : null
+
+  const byPriority = searchParams.get('order') === 'priority'
+  const cursorParam = searchParams.get('cursor')
+  const after = cursorParam ? decodeCursor(cursorParam) : null
+  if (cursorParam && (!after || byPriority)) {
+    return NextResponse.json(
+      { error: byPriority ? 'cursor is not supported with order=priority; use limit for a top-N' : 'Invalid cursor' },
+      { status: 400 }
+    )
+  }
+
+  const ndjson =
+    searchParams.get('format') === 'ndjson' ||
+    (request.headers.get('accept') || '').includes('application/x-ndjson')
+
+  // Priority order is a single top-N query; only the default order streams page by page.
+  // Without a limit it is capped at MAX_PAGE_SIZE, and one extra row shows whether the cap cut anything.
+  const firstPageSize = byPriority
+    ? limit ?? MAX_PAGE_SIZE + 1
+    : ndjson ? Math.min(limit ?? STREAM_PAGE_SIZE, STREAM_PAGE_SIZE) : limit
+  let queryParams = searchParams
+  let result = await timed('db', () => buildQuery(queryParams, columns, after, firstPageSize))
+
+  // tasks_all not migrated yet — there is no archive to add
+  if (result.error && result.error.message?.includes('tasks_all')) {
+    queryParams = new URLSearchParams(queryParams)
+    queryParams.set('archive', 'skip')
+    result = await timed('db', () => buildQuery(queryParams, columns, after, firstPageSize))
+  }
 
-  const { data, error } = await query
+  // category_path / search_vector not migrated yet — match on the plain text columns instead
+  for (const [param, column, match] of TEXT_FALLBACKS) {
+    if (result.error && queryParams.get(param) && result.error.message?.includes(column)) {
+      queryParams = new URLSearchParams(queryParams)
+      queryParams.set(match, 'text')
+      result = await timed('db', () => buildQuery(queryParams, columns, after, firstPageSize))
+    }
+  }
+  let data = result.data as unknown[] | null
+  let error = result.error
+
+  // Generated ranking columns not migrated yet — rank in memory instead
+  if (byPriority && error && /urgency_rank|priority_score/.test(error.message || '')) {
+    const fallbackParams = new URLSearchParams(queryParams)
+    fallbackParams.delete('order')
+    // category_path and search_vector come later in the same migration, so they are missing too
+    for (const [param, , match] of TEXT_FALLBACKS) {
+      if (fallbackParams.get(param)) fallbackParams.set(match, 'text')
+    }
+    const rankColumns = columns === '*' ? '*' : [...new Set([...columns.split(','), 'urgency', 'leverage', 'effort'])].join(',')
+    const all = await timed('db', () => buildQuery(fallbackParams, rankColumns, null, null))
+    data = all.data && ([...all.data] as unknown as Task[]).sort(prioritySort).slice(0, firstPageSize ?? undefined)
+    error = all.error
+  }
 
   if (error) {
-    // Fall back to localStorage mode if Supabase isn't configured or table doesn't exist yet
+    // Fall back to localStorage mode if Supabase isn't configured or the table doesn't exist yet
     if (
       error.message?.includes('Supabase env vars not configured') ||
-      error.message?.includes('relation') ||
-      error.message?.includes('does not exist') ||
-      error.code === '42P01'
+      error.code === '42P01' ||
+      error.code === 'PGRST205' ||
+      (error.message?.includes('relation') && error.message.includes('does not exist'))
     ) {
       return NextResponse.json({ supabaseNotConfigured: true, tasks: [] })
     }
+    // A requested column (e.g. a generated one) that this database doesn't have yet
+    if (error.code === '42703' || error.code === 'PGRST204') {
+      return NextResponse.json({ error: error.message }, { status: 400 })
+    }
     return NextResponse.json({ error: error.message }, { status: 500 })
   }
-  return NextResponse.json(data)
+
+  let rows = (data || []) as PageRow[]
+  const headers: Record<string, string> = {}
+  if (byPriority && !limit && rows.length > MAX_PAGE_SIZE) {
+    rows = rows.slice(0, MAX_PAGE_SIZE)
+    headers['X-Truncated'] = 'true'
+  }
+
+  if (ndjson) {
+    return new Response(streamRows(queryParams, columns, rows, firstPageSize ?? STREAM_PAGE_SIZE, limit, !byPriority), {
+      headers: { ...headers, 'Content-Type': 'application/x-ndjson' },
+    })
+  }
+
+  if (limit && rows.length === limit && !byPriority) {
+    const last = rows[rows.length - 1]
+    headers['X-Next-Cursor'] = encodeCursor(last.created_at, last.id)
+  }
+  return NextResponse.json(rows, { headers })
+})
+
+// Emits one JSON row per line, fetching further pages only as the client reads
+function streamRows(
+  searchParams: URLSearchParams,
+  columns: string,
+  firstPage: PageRow[],
+  pageSize: number,
+  limit: number | null,
+  paginate: boolean
+): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder()
+  let page = firstPage
+  let sent = 0
+
+  return new ReadableStream({
+    async pull(controller) {
+      if (page.length === 0) {
+        controller.close()
+        return
+      }
+      const take = limit === null ? page : page.slice(0, limit - sent)
+      controller.enqueue(encoder.encode(take.map((row) => JSON.stringify(row) + '\n').join('')))
+      sent += take.length
+
+      const last = page[page.length - 1]
+      if (!paginate || page.length < pageSize || (limit !== null && sent >= limit)) {
+        page = []
+        return
+      }
+      const next = await buildQuery(searchParams, columns, { ts: last.created_at, id: last.id }, pageSize)
+      if (next.error) {
+        controller.error(new Error(next.error.message))
+        return
+      }
+      page = (next.data || []) as unknown as PageRow[]
+    },
+  })
 }
 
-export async function POST(request: NextRequest) {
+export const POST = withTiming('tasks.create', async (request: NextRequest) => {
   const body = await request.json()
 
-  // Core columns that always exist
-  const coreRow = {
+  // Columns this database doesn't have yet (urgency, category, metadata before their
+  // migrations) are left out up front, so creating a task is always one insert
+  const [row] = await fitTaskRows([{
     title: body.title,
     description: body.description || null,
     source: body.source || 'manual',
     source_id: body.source_id || null,
     leverage: body.leverage ?? 5,
     effort: body.effort ?? 5,
-    status: 'active',
+    status: body.status || 'active',
     context_url: body.context_url || null,
     tags: body.tags || [],
-  }
-
-  const baseRow = {
-    ...coreRow,
     urgency: body.urgency || 'whenever',
     category: body.category || null,
-  }
-
-  let { data, error } = await supabase
-    .from('tasks')
-    .insert({ ...baseRow, metadata: body.metadata || null })
-    .select()
-    .single()
-
-  // If metadata column doesn't exist yet, retry without it
-  if (error && error.message?.includes('metadata')) {
-    const r = await supabase.from('tasks').insert(baseRow).select().single()
-    data = r.data; error = r.error
-  }
+    metadata: body.metadata || null,
+  }])
 
-  // If urgency/category columns don't exist yet, retry with core columns only
-  if (error && (error.message?.includes('urgency') || error.message?.includes('category') || error.message?.includes('schema cache'))) {
-    const r = await supabase.from('tasks').insert(coreRow).select().single()
-    data = r.data; error = r.error
-  }
+  const { data, error } = await timed('db', () => supabase.from('tasks').insert(row).select().single())
 
   if (error) return NextResponse.json({ error: error.message }, { status: 500 })
   return NextResponse.json(data, { status: 201 })
-}
+})
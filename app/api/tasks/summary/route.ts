@@ -0,0 +1,33 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { supabase } from '@/lib/supabase'
+import { TaskSummary, emptySummary, summarizeTasks } from '@/lib/summary'
+import { timed, withTiming } from '@/lib/timing'
+
+export const dynamic = 'force-dynamic'
+
+// Counts per quadrant, urgency, source and category plus total/average priority score,
+// aggregated by task_summary() in the database. ?status= defaults to active; 'all' covers every status.
+export const GET = withTiming('tasks.summary', async (request: NextRequest) => {
+  const status = new URL(request.url).searchParams.get('status') || 'active'
+
+  const { data, error } = await timed('db', () => supabase.rpc('task_summary', { task_status: status }))
+  if (!error) return NextResponse.json({ ...emptySummary(), ...(data as TaskSummary) })
+
+  // Function not created yet — aggregate the few columns it needs in memory
+  if (error.code === 'PGRST202' || error.message?.includes('task_summary')) {
+    const query = supabase.from('tasks').select('leverage, effort, urgency, source, category')
+    if (status !== 'all') query.eq('status', status)
+    const rows = await timed('db', () => query)
+    if (rows.error) return NextResponse.json({ error: rows.error.message }, { status: 500 })
+    return NextResponse.json(await timed('summarize', () => summarizeTasks(rows.data || [])))
+  }
+
+  if (
+    error.message?.includes('Supabase env vars not configured') ||
+    error.message?.includes('does not exist') ||
+    error.code === '42P01'
+  ) {
+    return NextResponse.json({ supabaseNotConfigured: true, ...emptySummary() })
+  }
+  return NextResponse.json({ error: error.message }, { status: 500 })
+})
@@ -1,13 +1,18 @@
 'use client'
 
-import { useState, useEffect, useCallback, useMemo } from 'react'
+import { useState, useEffect, useCallback, useMemo, useRef } from 'react'
 import { TaskMatrix } from '@/components/TaskMatrix'
 import { TaskList } from '@/components/TaskList'
 import { AddTaskPanel } from '@/components/AddTaskPanel'
-import { Task, Urgency } from '@/lib/supabase'
+import { supabase, Task, Urgency } from '@/lib/supabase'
+import { applyTaskChanges, latestUpdate, removeTask } from '@/lib/changes'
+import { createWriteQueue, WriteQueue } from '@/lib/write-queue'
+import type { ImportJobProgress } from '@/lib/import-jobs'
+import { TaskSummary, categoryCount, summarizeTasks } from '@/lib/summary'
+import { inCategory } from '@/lib/categories'
 import {
   LayoutGrid, List, Plus, RefreshCw, Download, Check, X, Zap, Database,
-  Flame, Calendar,
+  Flame, Calendar, TriangleAlert,
 } from 'lucide-react'
 
 type View = 'today' | 'this_week' | 'all' | 'matrix' | 'list' | 'quick-wins' | 'big-bets'
@@ -16,6 +21,10 @@ type StorageMode = 'supabase' | 'local' | 'detecting'
 type ImportStatus = { loading: boolean; message: string; type: 'idle' | 'success' | 'error' }
 
 const LOCAL_STORAGE_KEY = 'task-matrix-tasks'
+const SYNC_INTERVAL_MS = 30_000
+const IMPORT_POLL_MS = 1500
+// Longer than the write queue's debounce, so the refreshed counts include the last edit
+const SUMMARY_DEBOUNCE_MS = 2000
 
 function localLoad(): Task[] {
   try {
@@ -49,8 +58,15 @@ export default function Home() {
   const [showAddPanel, setShowAddPanel] = useState(false)
   const [loading, setLoading] = useState(true)
   const [storageMode, setStorageMode] = useState<StorageMode>('detecting')
+  const [summary, setSummary] = useState<TaskSummary | null>(null)
   const [slackStatus, setSlackStatus] = useState<ImportStatus>({ loading: false, message: '', type: 'idle' })
   const [airtableStatus, setAirtableStatus] = useState<ImportStatus>({ loading: false, message: '', type: 'idle' })
+  const [writeError, setWriteError] = useState<string | null>(null)
+
+  // Delta sync watermark for /api/tasks/changes, and the batched writer for edits
+  const syncCursor = useRef<string | null>(null)
+  const syncing = useRef(false)
+  const writeQueue = useRef<WriteQueue | null>(null)
 
   const fetchTasks = useCallback(async () => {
     setLoading(true)
@@ -61,8 +77,14 @@ export default function Home() {
         setStorageMode('local')
         setTasks(localLoad().filter(t => t.status === 'active'))
       } else {
+        const loaded: Task[] = Array.isArray(data) ? data : []
+        syncCursor.current = latestUpdate(loaded)
+        if (!syncCursor.current) {
+          // Empty board: start watching from the server's "now"
+          syncCursor.current = (await (await fetch('/api/tasks/changes')).json()).cursor ?? null
+        }
         setStorageMode('supabase')
-        setTasks(Array.isArray(data) ? data : [])
+        setTasks(writeQueue.current ? loaded.map(writeQueue.current.overlay) : loaded)
       }
     } catch {
       setStorageMode('local')
@@ -72,41 +94,119 @@ export default function Home() {
     }
   }, [])
 
+  // Pulls only the rows changed or deleted since the last sync and patches them into the board,
+  // paging until the server says there's no more. A poll that fires meanwhile is skipped.
+  const syncChanges = useCallback(async () => {
+    if (syncing.current) return
+    syncing.current = true
+    try {
+      for (let page = 0; ; page++) {
+        // The first page re-reads a few seconds before the watermark for late-committing writes
+        const since = syncCursor.current
+          ? `?since=${encodeURIComponent(syncCursor.current)}${page === 0 ? '&overlap=1' : ''}`
+          : ''
+        const res = await fetch(`/api/tasks/changes${since}`)
+        const data = await res.json()
+        if (!res.ok) return
+        setTasks(prev => applyTaskChanges(prev, data.tasks, writeQueue.current?.busyIds(), data.deleted))
+        syncCursor.current = data.cursor
+        if (!data.more) return
+      }
+    } catch {
+      // Next poll or realtime event catches up
+    } finally {
+      syncing.current = false
+    }
+  }, [])
+
   useEffect(() => { fetchTasks() }, [fetchTasks])
 
-  const updateTask = async (id: string, updates: Partial<Task>) => {
-    const updated = tasks.map(t => t.id === id ? { ...t, ...updates } : t)
-    setTasks(updated)
+  useEffect(() => {
+    if (storageMode !== 'supabase') return
+
+    const interval = setInterval(() => {
+      if (document.visibilityState === 'visible') syncChanges()
+    }, SYNC_INTERVAL_MS)
+
+    // Realtime pushes individual row changes as they happen; polling covers gaps
+    let channel: ReturnType<typeof supabase.channel> | null = null
+    try {
+      channel = supabase
+        .channel('tasks-board')
+        .on('postgres_changes', { event: '*', schema: 'public', table: 'tasks' }, (payload) => {
+          if (payload.eventType === 'DELETE') {
+            const id = (payload.old as Partial<Task>).id
+            if (id) setTasks(prev => removeTask(prev, id))
+          } else {
+            setTasks(prev => applyTaskChanges(prev, [payload.new as Task], writeQueue.current?.busyIds()))
+          }
+        })
+        .subscribe()
+    } catch {
+      channel = null
+    }
+
+    return () => {
+      clearInterval(interval)
+      if (channel) supabase.removeChannel(channel)
+    }
+  }, [storageMode, syncChanges])
+
+  // Header and sidebar counts come from GET /api/tasks/summary, refreshed once the board settles
+  useEffect(() => {
+    if (storageMode !== 'supabase') return
+    const timer = setTimeout(async () => {
+      try {
+        const res = await fetch('/api/tasks/summary')
+        const data = await res.json()
+        if (res.ok && !data.supabaseNotConfigured) setSummary(data)
+      } catch {
+        // Keep the last counts; the next change retries
+      }
+    }, SUMMARY_DEBOUNCE_MS)
+    return () => clearTimeout(timer)
+  }, [tasks, storageMode])
+
+  useEffect(() => {
+    if (storageMode !== 'supabase') return
+    const queue = createWriteQueue({ onError: setWriteError })
+    writeQueue.current = queue
+    // Re-apply edits that were still queued when the page was last closed
+    setTasks(prev => prev.map(queue.overlay))
+    return () => {
+      queue.dispose()
+      void queue.flush()
+      writeQueue.current = null
+    }
+  }, [storageMode])
+
+  // Handlers are stable across renders so the memoised list rows only re-render when their task changes
+  const updateTask = useCallback((id: string, updates: Partial<Task>) => {
+    setTasks(prev => prev.map(t => t.id === id ? { ...t, ...updates } : t))
 
     if (storageMode === 'local') {
       const allTasks = localLoad()
       localSave(allTasks.map(t => t.id === id ? { ...t, ...updates } : t))
     } else {
-      await fetch(`/api/tasks/${id}`, {
-        method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(updates),
-      })
+      // Slider drags fire on every step; the queue coalesces them into one batched write
+      writeQueue.current?.enqueue(id, updates)
     }
-  }
+  }, [storageMode])
 
-  const removeFromView = async (id: string, status: 'completed' | 'killed') => {
+  const removeFromView = useCallback(async (id: string, status: 'completed' | 'killed') => {
     setTasks(prev => prev.filter(t => t.id !== id))
 
     if (storageMode === 'local') {
       const allTasks = localLoad()
       localSave(allTasks.map(t => t.id === id ? { ...t, status } : t))
     } else {
-      await fetch(`/api/tasks/${id}`, {
-        method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ status }),
-      })
+      writeQueue.current?.enqueue(id, { status })
+      await writeQueue.current?.flush()
     }
-  }
+  }, [storageMode])
 
-  const markDone = (id: string) => removeFromView(id, 'completed')
-  const killTask = (id: string) => removeFromView(id, 'killed')
+  const markDone = useCallback((id: string) => removeFromView(id, 'completed'), [removeFromView])
+  const killTask = useCallback((id: string) => removeFromView(id, 'killed'), [removeFromView])
 
   const addTask = async (taskInput: {
     title: string
@@ -156,17 +256,41 @@ export default function Home() {
     const setStatus = source === 'slack' ? setSlackStatus : setAirtableStatus
     setStatus({ loading: true, message: 'Importing...', type: 'idle' })
     try {
+      // The import runs as a background job; poll it for progress until it finishes
       const res = await fetch(`/api/import/${source}`, { method: 'POST' })
-      const data = await res.json()
-      if (data.error) {
-        setStatus({ loading: false, message: data.error, type: 'error' })
+      let data = await res.json()
+      let job: ImportJobProgress = data.job
+      let stored = 0
+      while (!data.error && (job.status === 'queued' || job.status === 'running')) {
+        const unit = source === 'slack' ? 'channels' : 'records'
+        setStatus({
+          loading: true,
+          message: job.total ? `Importing... ${job.processed}/${job.total} ${unit}` : `Importing... ${job.processed} ${unit}`,
+          type: 'idle',
+        })
+        // Show rows on the board as each chunk lands rather than all at the end
+        if (job.imported + job.updated > stored) {
+          stored = job.imported + job.updated
+          syncChanges()
+        }
+        await new Promise(r => setTimeout(r, IMPORT_POLL_MS))
+        data = await (await fetch(`/api/import/jobs/${job.id}`)).json()
+        job = data.job
+      }
+
+      if (data.error || job.status === 'failed') {
+        setStatus({ loading: false, message: data.error || job.error || 'Import failed', type: 'error' })
       } else {
         setStatus({
           loading: false,
-          message: `${data.imported} imported, ${data.skipped} already exist`,
+          message: `${job.imported} imported${job.updated ? `, ${job.updated} updated` : ''}, ${job.skipped} already exist`,
           type: 'success',
         })
-        if (data.imported > 0) await fetchTasks()
+        if (job.imported > 0 || job.updated > 0) await syncChanges()
+        // Overviews that missed the import's time budget are filled in afterwards
+        if (job.overviews_pending > 0) {
+          fetch('/api/import/slack/backfill', { method: 'POST' }).then(syncChanges).catch(() => {})
+        }
       }
     } catch (err) {
       setStatus({ loading: false, message: String(err), type: 'error' })
@@ -174,43 +298,48 @@ export default function Home() {
     setTimeout(() => setStatus({ loading: false, message: '', type: 'idle' }), 5000)
   }
 
-  // Source counts (always from full task list, not filtered)
+  // Board-wide counts (never filtered): the server summary, or computed here in local mode
+  // and until the first summary arrives
+  const counts = useMemo(() =>
+    storageMode === 'supabase' && summary ? summary : summarizeTasks(tasks),
+  [storageMode, summary, tasks])
+
+  // Source counts
   const sourceCounts = {
-    all: tasks.length,
-    slack: tasks.filter(t => t.source === 'slack').length,
-    airtable: tasks.filter(t => t.source === 'airtable').length,
-    manual: tasks.filter(t => t.source === 'manual').length,
+    all: counts.total,
+    slack: counts.sources.slack || 0,
+    airtable: counts.sources.airtable || 0,
+    manual: counts.sources.manual || 0,
   }
 
   // Urgency counts
   const urgencyCounts = {
-    today: tasks.filter(t => t.urgency === 'today').length,
-    this_week: tasks.filter(t => t.urgency === 'today' || t.urgency === 'this_week').length,
+    today: counts.urgency.today || 0,
+    this_week: (counts.urgency.today || 0) + (counts.urgency.this_week || 0),
   }
 
-  // Get unique categories
-  const categories = useMemo(() =>
-    [...new Set(tasks.map(t => t.category).filter(Boolean))] as string[],
-  [tasks])
-
-  // Apply source filter first
-  const sourceFiltered = sourceFilter === 'all' ? tasks : tasks.filter(t => t.source === sourceFilter)
-
-  // Apply category filter
-  const categoryFiltered = categoryFilter
-    ? sourceFiltered.filter(t => t.category === categoryFilter || t.category?.startsWith(categoryFilter + ' >'))
-    : sourceFiltered
-
-  // Then apply view filter
-  const visibleTasks = view === 'today'
-    ? categoryFiltered.filter(t => t.urgency === 'today')
-    : view === 'this_week'
-    ? categoryFiltered.filter(t => t.urgency === 'today' || t.urgency === 'this_week')
-    : view === 'quick-wins'
-    ? categoryFiltered.filter(isQuickWin)
-    : view === 'big-bets'
-    ? categoryFiltered.filter(isBigBet)
-    : categoryFiltered
+  const categories = useMemo(() => Object.keys(counts.categories).sort(), [counts])
+
+  const visibleTasks = useMemo(() => {
+    // Apply source filter first
+    const sourceFiltered = sourceFilter === 'all' ? tasks : tasks.filter(t => t.source === sourceFilter)
+
+    // Apply category filter
+    const categoryFiltered = categoryFilter
+      ? sourceFiltered.filter(t => inCategory(t.category, categoryFilter))
+      : sourceFiltered
+
+    // Then apply view filter
+    return view === 'today'
+      ? categoryFiltered.filter(t => t.urgency === 'today')
+      : view === 'this_week'
+      ? categoryFiltered.filter(t => t.urgency === 'today' || t.urgency === 'this_week')
+      : view === 'quick-wins'
+      ? categoryFiltered.filter(isQuickWin)
+      : view === 'big-bets'
+      ? categoryFiltered.filter(isBigBet)
+      : categoryFiltered
+  }, [tasks, sourceFilter, categoryFilter, view])
 
   const viewLabels: Record<View, string> = {
     today: 'Today',
@@ -234,6 +363,15 @@ export default function Home() {
         </div>
       )}
 
+      {writeError && (
+        <div className="bg-red-900/40 border-b border-red-800/50 px-6 py-2 text-center">
+          <p className="text-xs text-red-300 flex items-center justify-center gap-1.5">
+            <TriangleAlert size={12} />
+            {writeError}
+          </p>
+        </div>
+      )}
+
       <div className="flex flex-1 overflow-hidden" style={{ minHeight: 'calc(100vh - 0px)' }}>
         {/* Sidebar */}
         <aside className="w-52 flex-shrink-0 border-r border-gray-800 bg-gray-950 flex flex-col">
@@ -323,8 +461,8 @@ export default function Home() {
                 >
                   All Categories
                 </button>
-                {categories.sort().map(c => {
-                  const count = tasks.filter(t => t.category === c || t.category?.startsWith(c + ' >')).length
+                {categories.map(c => {
+                  const count = categoryCount(counts, c)
                   return (
                     <button
                       key={c}
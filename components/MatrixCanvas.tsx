@@ -0,0 +1,226 @@
+'use client'
+
+import { useEffect, useRef, useState } from 'react'
+import { MatrixCell, MatrixGrid, SCORE_MAX, SCORE_MIN, cellAt, dotRadius } from '@/lib/matrix-grid'
+
+type Props = {
+  grid: MatrixGrid
+  selectedId: string | null
+  height: number
+  colorOf: (leverage: number, effort: number) => string
+  onSelect: (cell: MatrixCell | null) => void
+  renderTooltip: (cell: MatrixCell) => React.ReactNode
+}
+
+// Plot area inside the canvas; the axis domain is 0–11 so edge dots aren't clipped
+export const PLOT_MARGIN = { top: 16, right: 24, bottom: 50, left: 60 }
+const DOMAIN = SCORE_MAX + 1
+const TICKS = Array.from({ length: SCORE_MAX - SCORE_MIN + 1 }, (_, i) => i + SCORE_MIN)
+
+type Scale = { x: (effort: number) => number; y: (leverage: number) => number }
+
+function scaleFor(width: number, height: number): Scale & { invert: (px: number, py: number) => [number, number] } {
+  const w = width - PLOT_MARGIN.left - PLOT_MARGIN.right
+  const h = height - PLOT_MARGIN.top - PLOT_MARGIN.bottom
+  return {
+    x: (effort) => PLOT_MARGIN.left + (effort / DOMAIN) * w,
+    y: (leverage) => PLOT_MARGIN.top + (1 - leverage / DOMAIN) * h,
+    invert: (px, py) => [((px - PLOT_MARGIN.left) / w) * DOMAIN, (1 - (py - PLOT_MARGIN.top) / h) * DOMAIN],
+  }
+}
+
+function drawAxes(ctx: CanvasRenderingContext2D, width: number, height: number, s: Scale) {
+  const left = PLOT_MARGIN.left
+  const right = width - PLOT_MARGIN.right
+  const top = PLOT_MARGIN.top
+  const bottom = height - PLOT_MARGIN.bottom
+
+  ctx.lineWidth = 1
+  ctx.strokeStyle = '#1f2937'
+  ctx.setLineDash([3, 3])
+  ctx.beginPath()
+  for (const t of TICKS) {
+    ctx.moveTo(s.x(t), top)
+    ctx.lineTo(s.x(t), bottom)
+    ctx.moveTo(left, s.y(t))
+    ctx.lineTo(right, s.y(t))
+  }
+  ctx.stroke()
+
+  // Quadrant dividers
+  ctx.strokeStyle = '#374151'
+  ctx.lineWidth = 1.5
+  ctx.setLineDash([4, 4])
+  ctx.beginPath()
+  ctx.moveTo(s.x(5.5), top)
+  ctx.lineTo(s.x(5.5), bottom)
+  ctx.moveTo(left, s.y(5.5))
+  ctx.lineTo(right, s.y(5.5))
+  ctx.stroke()
+
+  ctx.lineWidth = 1
+  ctx.setLineDash([])
+  ctx.beginPath()
+  ctx.moveTo(left, top)
+  ctx.lineTo(left, bottom)
+  ctx.lineTo(right, bottom)
+  ctx.stroke()
+
+  ctx.fillStyle = '#6b7280'
+  ctx.font = '11px system-ui, sans-serif'
+  ctx.textAlign = 'center'
+  ctx.textBaseline = 'top'
+  for (const t of TICKS) ctx.fillText(String(t), s.x(t), bottom + 6)
+  ctx.textAlign = 'right'
+  ctx.textBaseline = 'middle'
+  for (const t of TICKS) ctx.fillText(String(t), left - 8, s.y(t))
+
+  ctx.font = '12px system-ui, sans-serif'
+  ctx.textAlign = 'center'
+  ctx.textBaseline = 'bottom'
+  ctx.fillText('Effort →', (left + right) / 2, height - 4)
+  ctx.save()
+  ctx.translate(16, (top + bottom) / 2)
+  ctx.rotate(-Math.PI / 2)
+  ctx.textBaseline = 'middle'
+  ctx.fillText('Leverage ↑', 0, 0)
+  ctx.restore()
+}
+
+function drawCell(
+  ctx: CanvasRenderingContext2D,
+  cell: MatrixCell,
+  s: Scale,
+  color: string,
+  selected: boolean,
+  hovered: boolean
+) {
+  const cx = s.x(cell.effort)
+  const cy = s.y(cell.leverage)
+  const r = dotRadius(cell) + (selected || hovered ? 1 : 0)
+  const count = cell.tasks.length
+
+  if (cell.urgent) {
+    ctx.globalAlpha = 0.6
+    ctx.strokeStyle = '#ef4444'
+    ctx.lineWidth = 1.5
+    ctx.setLineDash([3, 2])
+    ctx.beginPath()
+    ctx.arc(cx, cy, r + 4, 0, Math.PI * 2)
+    ctx.stroke()
+    ctx.setLineDash([])
+    ctx.globalAlpha = 1
+  }
+
+  ctx.fillStyle = color
+  ctx.beginPath()
+  ctx.arc(cx, cy, r, 0, Math.PI * 2)
+  ctx.fill()
+  if (selected) {
+    ctx.strokeStyle = '#fff'
+    ctx.lineWidth = 2
+    ctx.stroke()
+  }
+
+  if (count > 1) {
+    ctx.fillStyle = '#fff'
+    ctx.font = 'bold 10px system-ui, sans-serif'
+    ctx.textAlign = 'center'
+    ctx.textBaseline = 'middle'
+    ctx.fillText(count > 999 ? '999+' : String(count), cx, cy + 0.5)
+  }
+
+  const title = (cell.tasks[0].title || '').slice(0, 18)
+  ctx.fillStyle = 'rgba(255,255,255,0.8)'
+  ctx.font = '9px system-ui, sans-serif'
+  ctx.textAlign = 'center'
+  ctx.textBaseline = 'alphabetic'
+  ctx.fillText(count > 1 ? `${title} +${count - 1}` : title, cx, cy - r - (cell.urgent ? 6 : 4))
+}
+
+// Scatter plot drawn on a single canvas: one dot per occupied cell, however many tasks
+// there are, so redraws cost the same for 10 tasks or 10,000
+export function MatrixCanvas({ grid, selectedId, height, colorOf, onSelect, renderTooltip }: Props) {
+  const wrapperRef = useRef<HTMLDivElement>(null)
+  const canvasRef = useRef<HTMLCanvasElement>(null)
+  const [width, setWidth] = useState(0)
+  const [hoverKey, setHoverKey] = useState<number | null>(null)
+
+  useEffect(() => {
+    const el = wrapperRef.current
+    if (!el) return
+    const observer = new ResizeObserver(([entry]) => setWidth(Math.floor(entry.contentRect.width)))
+    observer.observe(el)
+    return () => observer.disconnect()
+  }, [])
+
+  // Repaint at most once per frame, whatever mix of drags and hovers triggered it
+  useEffect(() => {
+    const canvas = canvasRef.current
+    if (!canvas || width === 0) return
+    const frame = requestAnimationFrame(() => {
+      const dpr = window.devicePixelRatio || 1
+      if (canvas.width !== Math.round(width * dpr) || canvas.height !== Math.round(height * dpr)) {
+        canvas.width = Math.round(width * dpr)
+        canvas.height = Math.round(height * dpr)
+      }
+      const ctx = canvas.getContext('2d')
+      if (!ctx) return
+      ctx.setTransform(dpr, 0, 0, dpr, 0, 0)
+      ctx.clearRect(0, 0, width, height)
+
+      const s = scaleFor(width, height)
+      drawAxes(ctx, width, height, s)
+      const selectedCell = selectedId ? grid.cellOf.get(selectedId) : undefined
+      for (const cell of grid.cells) {
+        if (cell === selectedCell) continue
+        drawCell(ctx, cell, s, colorOf(cell.leverage, cell.effort), false, cell.key === hoverKey)
+      }
+      // Selected cell last so its outline is never covered
+      if (selectedCell) {
+        drawCell(ctx, selectedCell, s, colorOf(selectedCell.leverage, selectedCell.effort), true, false)
+      }
+    })
+    return () => cancelAnimationFrame(frame)
+  }, [grid, selectedId, hoverKey, width, height, colorOf])
+
+  const hitTest = (e: React.MouseEvent<HTMLCanvasElement>): MatrixCell | null => {
+    const rect = e.currentTarget.getBoundingClientRect()
+    const px = e.clientX - rect.left
+    const py = e.clientY - rect.top
+    const s = scaleFor(width, height)
+    const [effort, leverage] = s.invert(px, py)
+    const cell = cellAt(grid, effort, leverage)
+    if (!cell) return null
+    const r = dotRadius(cell) + 3
+    return Math.hypot(px - s.x(cell.effort), py - s.y(cell.leverage)) <= r ? cell : null
+  }
+
+  const hovered = hoverKey !== null ? grid.byKey.get(hoverKey) : undefined
+  const s = width ? scaleFor(width, height) : null
+
+  return (
+    <div ref={wrapperRef} className="relative" style={{ height }}>
+      <canvas
+        ref={canvasRef}
+        role="img"
+        aria-label={`Leverage/effort matrix with ${grid.cellOf.size} tasks`}
+        style={{ width: '100%', height, cursor: hovered ? 'pointer' : 'default' }}
+        onMouseMove={(e) => setHoverKey(hitTest(e)?.key ?? null)}
+        onMouseLeave={() => setHoverKey(null)}
+        onClick={(e) => onSelect(hitTest(e))}
+      />
+      {hovered && s && (
+        <div
+          className="absolute z-20 pointer-events-none"
+          style={{
+            left: Math.min(s.x(hovered.effort) + 14, width - 300),
+            top: Math.max(0, s.y(hovered.leverage) - 12),
+          }}
+        >
+          {renderTooltip(hovered)}
+        </div>
+      )}
+    </div>
+  )
+}
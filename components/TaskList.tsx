@@ -1,6 +1,6 @@
 'use client'
 
-import { useState } from 'react'
+import { memo, useCallback, useEffect, useLayoutEffect, useMemo, useRef, useState } from 'react'
 import { Task } from '@/lib/supabase'
 import { prioritySort } from '@/lib/priority'
 import { Check, X, ExternalLink, ChevronUp, ChevronDown } from 'lucide-react'
@@ -32,10 +32,274 @@ function getUrgencyStyle(urgency: string) {
   return { label: 'Whenever', bg: 'bg-gray-800 text-gray-500 border-gray-700' }
 }
 
+// Past this many rows only those in (or near) the viewport are mounted
+const VIRTUALIZE_THRESHOLD = 100
+// Height of a collapsed row including the gap below it, used until the row is measured
+const ESTIMATED_ROW_HEIGHT = 56
+const OVERSCAN = 10
+
+type RowProps = {
+  task: Task
+  index: number
+  expanded: boolean
+  showUrgency: boolean
+  onToggle: (id: string) => void
+  onUpdate: Props['onUpdate']
+  onDone: Props['onDone']
+  onKill: Props['onKill']
+}
+
+// Memoised so a slider drag re-renders the dragged row, not every row on the board
+const TaskRow = memo(function TaskRow({ task, index: i, expanded, showUrgency, onToggle, onUpdate, onDone, onKill }: RowProps) {
+  const q = getQuadrantStyle(task.leverage, task.effort)
+  const score = task.leverage / task.effort
+  const urg = getUrgencyStyle(task.urgency)
+
+  return (
+    <div className="rounded-lg bg-gray-900 border border-gray-800 hover:border-gray-700 transition-colors">
+      <div
+        className="grid grid-cols-12 gap-3 px-4 py-3 items-center cursor-pointer"
+        onClick={() => onToggle(task.id)}
+      >
+        {/* Task title + urgency badge */}
+        <div className="col-span-5 flex items-center gap-2 min-w-0">
+          <span className="text-xs text-gray-600 w-4 text-right flex-shrink-0">{i + 1}</span>
+          <span className={`w-2 h-2 rounded-full flex-shrink-0 ${q.dot}`} />
+          {showUrgency && task.urgency !== 'whenever' && (
+            <button
+              onClick={e => {
+                e.stopPropagation()
+                const next = task.urgency === 'today' ? 'this_week' : task.urgency === 'this_week' ? 'whenever' : 'today'
+                onUpdate(task.id, { urgency: next })
+              }}
+              className={`text-[10px] px-1.5 py-0.5 rounded border flex-shrink-0 ${urg.bg}`}
+            >
+              {urg.label}
+            </button>
+          )}
+          <span className="text-sm text-gray-200 leading-snug line-clamp-1 min-w-0">{task.title}</span>
+          {expanded ? <ChevronUp size={12} className="text-gray-500 flex-shrink-0" /> : <ChevronDown size={12} className="text-gray-500 flex-shrink-0" />}
+        </div>
+
+        {/* Priority score */}
+        <div className="col-span-1 text-center">
+          <span className={`text-sm font-semibold ${q.text}`}>{score.toFixed(1)}</span>
+        </div>
+
+        {/* Leverage */}
+        <div className="col-span-2 flex items-center gap-1.5">
+          <input
+            type="range" min={1} max={10} value={task.leverage}
+            onChange={e => { e.stopPropagation(); onUpdate(task.id, { leverage: Number(e.target.value) }) }}
+            onClick={e => e.stopPropagation()}
+            className="w-full accent-emerald-500 cursor-pointer"
+          />
+          <span className="text-xs text-gray-400 w-4 text-right">{task.leverage}</span>
+        </div>
+
+        {/* Effort */}
+        <div className="col-span-2 flex items-center gap-1.5">
+          <input
+            type="range" min={1} max={10} value={task.effort}
+            onChange={e => { e.stopPropagation(); onUpdate(task.id, { effort: Number(e.target.value) }) }}
+            onClick={e => e.stopPropagation()}
+            className="w-full accent-red-500 cursor-pointer"
+          />
+          <span className="text-xs text-gray-400 w-4 text-right">{task.effort}</span>
+        </div>
+
+        {/* Source */}
+        <div className="col-span-1 text-center text-sm">
+          {getSourceEmoji(task.source)}
+        </div>
+
+        {/* Actions */}
+        <div className="col-span-1 flex items-center justify-center gap-1">
+          <button
+            onClick={e => { e.stopPropagation(); onDone(task.id) }}
+            className="p-1 rounded hover:bg-emerald-900/50 text-gray-500 hover:text-emerald-400 transition-colors"
+            title="Mark done"
+          >
+            <Check size={13} />
+          </button>
+          <button
+            onClick={e => { e.stopPropagation(); onKill(task.id) }}
+            className="p-1 rounded hover:bg-red-900/50 text-gray-500 hover:text-red-400 transition-colors"
+            title="Kill task"
+          >
+            <X size={13} />
+          </button>
+        </div>
+      </div>
+
+      {/* Expanded detail */}
+      {expanded && (
+        <div className="px-4 pb-3 pt-0 border-t border-gray-800">
+          <div className="flex items-start gap-4 pt-3">
+            <div className="flex-1 space-y-2">
+              {/* AI overview for Slack tasks */}
+              {task.source === 'slack' && task.metadata?.ai_overview && (
+                <div className="rounded-md bg-blue-950/40 border border-blue-800/40 px-3 py-2">
+                  <p className="text-xs text-blue-300 leading-relaxed">{task.metadata.ai_overview}</p>
+                </div>
+              )}
+
+              {/* Sender/channel badge for Slack tasks */}
+              {task.source === 'slack' && (task.metadata?.sender_name || task.metadata?.channel_name) && (
+                <p className="text-xs text-gray-500">
+                  {task.metadata.sender_name && <span>From <span className="text-gray-400">@{task.metadata.sender_name}</span></span>}
+                  {task.metadata.sender_name && task.metadata.channel_name && <span> in </span>}
+                  {task.metadata.channel_name && <span className="text-gray-400">#{task.metadata.channel_name}</span>}
+                </p>
+              )}
+
+              {task.description && (
+                <p className="text-xs text-gray-400 leading-relaxed">{task.description}</p>
+              )}
+
+              <div className="flex items-center gap-3 flex-wrap">
+                <span className={`text-xs font-medium ${q.text}`}>{q.label}</span>
+                {/* Urgency toggle */}
+                <button
+                  onClick={e => {
+                    e.stopPropagation()
+                    const next = task.urgency === 'today' ? 'this_week' : task.urgency === 'this_week' ? 'whenever' : 'today'
+                    onUpdate(task.id, { urgency: next })
+                  }}
+                  className={`text-[10px] px-1.5 py-0.5 rounded border ${urg.bg}`}
+                >
+                  {urg.label}
+                </button>
+                {task.category && (
+                  <span className="text-xs text-indigo-400 bg-indigo-900/30 px-1.5 py-0.5 rounded">
+                    {task.category}
+                  </span>
+                )}
+                <span className="text-xs text-gray-600">
+                  Added {new Date(task.created_at).toLocaleDateString()}
+                </span>
+                {task.context_url && (
+                  <a
+                    href={task.context_url}
+                    target="_blank"
+                    rel="noopener noreferrer"
+                    onClick={e => e.stopPropagation()}
+                    className="flex items-center gap-1 text-xs text-indigo-400 hover:text-indigo-300"
+                  >
+                    <ExternalLink size={11} /> View source
+                  </a>
+                )}
+              </div>
+            </div>
+          </div>
+        </div>
+      )}
+    </div>
+  )
+})
+
+// Nearest ancestor that scrolls vertically — the rows are windowed against its viewport
+function scrollParent(el: HTMLElement): HTMLElement | Window {
+  for (let node = el.parentElement; node; node = node.parentElement) {
+    const { overflowY } = getComputedStyle(node)
+    if (overflowY === 'auto' || overflowY === 'scroll') return node
+  }
+  return window
+}
+
+// Index of the last offset <= y (offsets is ascending, offsets[0] = 0)
+function rowAt(offsets: Float64Array, y: number): number {
+  let lo = 0
+  let hi = offsets.length - 1
+  while (lo < hi) {
+    const mid = (lo + hi + 1) >> 1
+    if (offsets[mid] <= y) lo = mid
+    else hi = mid - 1
+  }
+  return lo
+}
+
+// Keeps a row's measured height (gap included) up to date while it is mounted
+function MeasuredRow({ id, observer, children }: { id: string; observer: ResizeObserver | null; children: React.ReactNode }) {
+  const ref = useRef<HTMLDivElement>(null)
+  useLayoutEffect(() => {
+    const el = ref.current
+    if (!el || !observer) return
+    observer.observe(el)
+    return () => observer.unobserve(el)
+  }, [observer])
+  return <div ref={ref} data-id={id} className="pb-1.5">{children}</div>
+}
+
 export function TaskList({ tasks, onUpdate, onDone, onKill, showUrgency = true }: Props) {
   const [expandedId, setExpandedId] = useState<string | null>(null)
+  const onToggle = useCallback((id: string) => setExpandedId(prev => prev === id ? null : id), [])
+
+  const sorted = useMemo(() => [...tasks].sort(prioritySort), [tasks])
+  const virtual = sorted.length > VIRTUALIZE_THRESHOLD
+
+  // Measured row heights by task id; rows not yet measured use the estimate
+  const [heights, setHeights] = useState<Map<string, number>>(() => new Map())
+  const [observer, setObserver] = useState<ResizeObserver | null>(null)
+  useEffect(() => {
+    if (!virtual) return
+    const ro = new ResizeObserver((entries) => {
+      const sizes = entries.map((e) => [(e.target as HTMLElement).dataset.id, (e.target as HTMLElement).offsetHeight] as const)
+      setHeights((prev) => {
+        let next: Map<string, number> | null = null
+        for (const [id, height] of sizes) {
+          if (!id || !height || prev.get(id) === height) continue
+          next ??= new Map(prev)
+          next.set(id, height)
+        }
+        return next ?? prev
+      })
+    })
+    setObserver(ro)
+    return () => {
+      ro.disconnect()
+      setObserver(null)
+    }
+  }, [virtual])
 
-  const sorted = [...tasks].sort(prioritySort)
+  const offsets = useMemo(() => {
+    const offsets = new Float64Array(sorted.length + 1)
+    if (!virtual) return offsets
+    for (let i = 0; i < sorted.length; i++) {
+      offsets[i + 1] = offsets[i] + (heights.get(sorted[i].id) ?? ESTIMATED_ROW_HEIGHT)
+    }
+    return offsets
+  }, [sorted, virtual, heights])
+
+  const containerRef = useRef<HTMLDivElement>(null)
+  const [range, setRange] = useState({ start: 0, end: VIRTUALIZE_THRESHOLD })
+  useEffect(() => {
+    const el = containerRef.current
+    if (!virtual || !el) return
+    const scroller = scrollParent(el)
+    let frame = 0
+    const update = () => {
+      frame = 0
+      const viewTop = scroller === window ? 0 : (scroller as HTMLElement).getBoundingClientRect().top
+      const viewHeight = scroller === window ? window.innerHeight : (scroller as HTMLElement).clientHeight
+      const top = viewTop - el.getBoundingClientRect().top
+      const start = Math.max(0, rowAt(offsets, top) - OVERSCAN)
+      const end = Math.min(sorted.length, rowAt(offsets, top + viewHeight) + 1 + OVERSCAN)
+      setRange(prev => prev.start === start && prev.end === end ? prev : { start, end })
+    }
+    const schedule = () => { if (!frame) frame = requestAnimationFrame(update) }
+    update()
+    scroller.addEventListener('scroll', schedule, { passive: true })
+    window.addEventListener('resize', schedule)
+    return () => {
+      if (frame) cancelAnimationFrame(frame)
+      scroller.removeEventListener('scroll', schedule)
+      window.removeEventListener('resize', schedule)
+    }
+  }, [virtual, offsets, sorted.length])
+
+  const start = virtual ? Math.min(range.start, sorted.length) : 0
+  const end = virtual ? Math.min(range.end, sorted.length) : sorted.length
 
   return (
     <div className="space-y-1.5">
@@ -49,154 +313,24 @@ export function TaskList({ tasks, onUpdate, onDone, onKill, showUrgency = true }
         <div className="col-span-1 text-center">Actions</div>
       </div>
 
-      {sorted.map((task, i) => {
-        const q = getQuadrantStyle(task.leverage, task.effort)
-        const score = task.leverage / task.effort
-        const expanded = expandedId === task.id
-        const urg = getUrgencyStyle(task.urgency)
-
-        return (
-          <div key={task.id} className="rounded-lg bg-gray-900 border border-gray-800 hover:border-gray-700 transition-colors">
-            <div
-              className="grid grid-cols-12 gap-3 px-4 py-3 items-center cursor-pointer"
-              onClick={() => setExpandedId(expanded ? null : task.id)}
-            >
-              {/* Task title + urgency badge */}
-              <div className="col-span-5 flex items-center gap-2 min-w-0">
-                <span className="text-xs text-gray-600 w-4 text-right flex-shrink-0">{i + 1}</span>
-                <span className={`w-2 h-2 rounded-full flex-shrink-0 ${q.dot}`} />
-                {showUrgency && task.urgency !== 'whenever' && (
-                  <button
-                    onClick={e => {
-                      e.stopPropagation()
-                      const next = task.urgency === 'today' ? 'this_week' : task.urgency === 'this_week' ? 'whenever' : 'today'
-                      onUpdate(task.id, { urgency: next })
-                    }}
-                    className={`text-[10px] px-1.5 py-0.5 rounded border flex-shrink-0 ${urg.bg}`}
-                  >
-                    {urg.label}
-                  </button>
-                )}
-                <span className="text-sm text-gray-200 leading-snug line-clamp-1 min-w-0">{task.title}</span>
-                {expanded ? <ChevronUp size={12} className="text-gray-500 flex-shrink-0" /> : <ChevronDown size={12} className="text-gray-500 flex-shrink-0" />}
-              </div>
-
-              {/* Priority score */}
-              <div className="col-span-1 text-center">
-                <span className={`text-sm font-semibold ${q.text}`}>{score.toFixed(1)}</span>
-              </div>
-
-              {/* Leverage */}
-              <div className="col-span-2 flex items-center gap-1.5">
-                <input
-                  type="range" min={1} max={10} value={task.leverage}
-                  onChange={e => { e.stopPropagation(); onUpdate(task.id, { leverage: Number(e.target.value) }) }}
-                  onClick={e => e.stopPropagation()}
-                  className="w-full accent-emerald-500 cursor-pointer"
-                />
-                <span className="text-xs text-gray-400 w-4 text-right">{task.leverage}</span>
-              </div>
-
-              {/* Effort */}
-              <div className="col-span-2 flex items-center gap-1.5">
-                <input
-                  type="range" min={1} max={10} value={task.effort}
-                  onChange={e => { e.stopPropagation(); onUpdate(task.id, { effort: Number(e.target.value) }) }}
-                  onClick={e => e.stopPropagation()}
-                  className="w-full accent-red-500 cursor-pointer"
-                />
-                <span className="text-xs text-gray-400 w-4 text-right">{task.effort}</span>
-              </div>
-
-              {/* Source */}
-              <div className="col-span-1 text-center text-sm">
-                {getSourceEmoji(task.source)}
-              </div>
-
-              {/* Actions */}
-              <div className="col-span-1 flex items-center justify-center gap-1">
-                <button
-                  onClick={e => { e.stopPropagation(); onDone(task.id) }}
-                  className="p-1 rounded hover:bg-emerald-900/50 text-gray-500 hover:text-emerald-400 transition-colors"
-                  title="Mark done"
-                >
-                  <Check size={13} />
-                </button>
-                <button
-                  onClick={e => { e.stopPropagation(); onKill(task.id) }}
-                  className="p-1 rounded hover:bg-red-900/50 text-gray-500 hover:text-red-400 transition-colors"
-                  title="Kill task"
-                >
-                  <X size={13} />
-                </button>
-              </div>
-            </div>
-
-            {/* Expanded detail */}
-            {expanded && (
-              <div className="px-4 pb-3 pt-0 border-t border-gray-800">
-                <div className="flex items-start gap-4 pt-3">
-                  <div className="flex-1 space-y-2">
-                    {/* AI overview for Slack tasks */}
-                    {task.source === 'slack' && task.metadata?.ai_overview && (
-                      <div className="rounded-md bg-blue-950/40 border border-blue-800/40 px-3 py-2">
-                        <p className="text-xs text-blue-300 leading-relaxed">{task.metadata.ai_overview}</p>
-                      </div>
-                    )}
-
-                    {/* Sender/channel badge for Slack tasks */}
-                    {task.source === 'slack' && (task.metadata?.sender_name || task.metadata?.channel_name) && (
-                      <p className="text-xs text-gray-500">
-                        {task.metadata.sender_name && <span>From <span className="text-gray-400">@{task.metadata.sender_name}</span></span>}
-                        {task.metadata.sender_name && task.metadata.channel_name && <span> in </span>}
-                        {task.metadata.channel_name && <span className="text-gray-400">#{task.metadata.channel_name}</span>}
-                      </p>
-                    )}
-
-                    {task.description && (
-                      <p className="text-xs text-gray-400 leading-relaxed">{task.description}</p>
-                    )}
-
-                    <div className="flex items-center gap-3 flex-wrap">
-                      <span className={`text-xs font-medium ${q.text}`}>{q.label}</span>
-                      {/* Urgency toggle */}
-                      <button
-                        onClick={e => {
-                          e.stopPropagation()
-                          const next = task.urgency === 'today' ? 'this_week' : task.urgency === 'this_week' ? 'whenever' : 'today'
-                          onUpdate(task.id, { urgency: next })
-                        }}
-                        className={`text-[10px] px-1.5 py-0.5 rounded border ${urg.bg}`}
-                      >
-                        {urg.label}
-                      </button>
-                      {task.category && (
-                        <span className="text-xs text-indigo-400 bg-indigo-900/30 px-1.5 py-0.5 rounded">
-                          {task.category}
-                        </span>
-                      )}
-                      <span className="text-xs text-gray-600">
-                        Added {new Date(task.created_at).toLocaleDateString()}
-                      </span>
-                      {task.context_url && (
-                        <a
-                          href={task.context_url}
-                          target="_blank"
-                          rel="noopener noreferrer"
-                          onClick={e => e.stopPropagation()}
-                          className="flex items-center gap-1 text-xs text-indigo-400 hover:text-indigo-300"
-                        >
-                          <ExternalLink size={11} /> View source
-                        </a>
-                      )}
-                    </div>
-                  </div>
-                </div>
-              </div>
-            )}
-          </div>
-        )
-      })}
+      <div ref={containerRef} style={virtual ? { height: offsets[sorted.length], position: 'relative' } : undefined}>
+        <div style={virtual ? { transform: `translateY(${offsets[start]}px)` } : undefined}>
+          {sorted.slice(start, end).map((task, i) => (
+            <MeasuredRow key={task.id} id={task.id} observer={virtual ? observer : null}>
+              <TaskRow
+                task={task}
+                index={start + i}
+                expanded={expandedId === task.id}
+                showUrgency={showUrgency}
+                onToggle={onToggle}
+                onUpdate={onUpdate}
+                onDone={onDone}
+                onKill={onKill}
+              />
+            </MeasuredRow>
+          ))}
+        </div>
+      </div>
     </div>
   )
 }
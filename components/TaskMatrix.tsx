@@ -1,11 +1,13 @@
 'use client'
 
-import { useState } from 'react'
+import { useMemo, useState } from 'react'
 import {
   ScatterChart, Scatter, XAxis, YAxis, CartesianGrid, Tooltip,
   ReferenceLine, ResponsiveContainer, Cell
 } from 'recharts'
 import { Task, Urgency } from '@/lib/supabase'
+import { buildMatrixGrid, MatrixCell } from '@/lib/matrix-grid'
+import { MatrixCanvas, PLOT_MARGIN } from './MatrixCanvas'
 import { ExternalLink, Check, X, Slack } from 'lucide-react'
 
 type Props = {
@@ -22,6 +24,14 @@ function getQuadrant(leverage: number, effort: number) {
   return { label: 'Eliminate', color: '#ef4444', bg: 'bg-red-900/30 border-red-700' }
 }
 
+const quadrantColor = (leverage: number, effort: number) => getQuadrant(leverage, effort).color
+
+// Past this many tasks the matrix is drawn on a canvas instead of one SVG element per dot
+const CANVAS_THRESHOLD = 200
+const CHART_HEIGHT = 520
+// Other tasks on the same spot listed in the side panel
+const SAME_SPOT_LIMIT = 8
+
 function getSourceIcon(source: string) {
   if (source === 'slack') return '💬'
   if (source === 'airtable') return '📋'
@@ -66,9 +76,7 @@ const CustomDot = (props: {
   )
 }
 
-const CustomTooltip = ({ active, payload }: { active?: boolean; payload?: { payload: Task }[] }) => {
-  if (!active || !payload?.length) return null
-  const task = payload[0].payload
+const TaskTooltip = ({ task, more = 0 }: { task: Task; more?: number }) => {
   const { label } = getQuadrant(task.leverage, task.effort)
   return (
     <div className="bg-gray-900 border border-gray-700 rounded-lg p-3 shadow-xl max-w-xs">
@@ -84,60 +92,92 @@ const CustomTooltip = ({ active, payload }: { active?: boolean; payload?: { payl
         )}
         {task.category && <span className="text-indigo-400">{task.category}</span>}
       </div>
+      {more > 0 && <p className="text-xs text-gray-500 mt-1.5">+{more} more on this spot — click to list them</p>}
     </div>
   )
 }
 
+const CustomTooltip = ({ active, payload }: { active?: boolean; payload?: { payload: Task }[] }) => {
+  if (!active || !payload?.length) return null
+  return <TaskTooltip task={payload[0].payload} />
+}
+
+const renderCellTooltip = (cell: MatrixCell) => <TaskTooltip task={cell.tasks[0]} more={cell.tasks.length - 1} />
+
 export function TaskMatrix({ tasks, onUpdate, onDone, onKill }: Props) {
-  const [selected, setSelected] = useState<Task | null>(null)
+  const [selectedId, setSelectedId] = useState<string | null>(null)
 
-  const chartData = tasks.map(t => ({ ...t, x: t.effort, y: t.leverage }))
+  // Read the selection from the live tasks so slider drags show up straight away
+  const grid = useMemo(() => buildMatrixGrid(tasks), [tasks])
+  const selectedCell = selectedId ? grid.cellOf.get(selectedId) : undefined
+  const selected = selectedCell?.tasks.find(t => t.id === selectedId) ?? null
+  const sameSpot = selectedCell ? selectedCell.tasks.filter(t => t.id !== selectedId) : []
+
+  const canvasMode = tasks.length > CANVAS_THRESHOLD
+  const chartData = useMemo(
+    () => canvasMode ? [] : tasks.map(t => ({ ...t, x: t.effort, y: t.leverage })),
+    [tasks, canvasMode]
+  )
+  const labelInset = canvasMode
+    ? { left: PLOT_MARGIN.left, right: PLOT_MARGIN.right, top: PLOT_MARGIN.top - 8, bottom: PLOT_MARGIN.bottom }
+    : { left: 60, right: 20, top: 8, bottom: 50 }
 
   return (
     <div className="flex gap-6 h-full" style={{ minHeight: 520 }}>
       {/* Matrix chart */}
       <div className="flex-1 relative">
         {/* Quadrant labels */}
-        <div className="absolute inset-0 pointer-events-none z-10" style={{ left: 60, right: 20, top: 8, bottom: 50 }}>
+        <div className="absolute inset-0 pointer-events-none z-10" style={labelInset}>
           <div className="absolute top-2 left-2 text-xs text-emerald-500/60 font-medium">Quick Wins ↗</div>
           <div className="absolute top-2 right-2 text-xs text-blue-500/60 font-medium">Big Bets ↗</div>
           <div className="absolute bottom-2 left-2 text-xs text-yellow-500/60 font-medium">Fill-ins</div>
           <div className="absolute bottom-2 right-2 text-xs text-red-500/60 font-medium">Eliminate ✕</div>
         </div>
 
-        <ResponsiveContainer width="100%" height={520}>
-          <ScatterChart margin={{ top: 16, right: 24, bottom: 40, left: 40 }}>
-            <CartesianGrid strokeDasharray="3 3" stroke="#1f2937" />
-            <XAxis
-              type="number" dataKey="x" domain={[0, 11]} name="Effort"
-              label={{ value: 'Effort →', position: 'bottom', fill: '#6b7280', fontSize: 12 }}
-              ticks={[1,2,3,4,5,6,7,8,9,10]}
-              tick={{ fill: '#6b7280', fontSize: 11 }}
-              stroke="#374151"
-            />
-            <YAxis
-              type="number" dataKey="y" domain={[0, 11]} name="Leverage"
-              label={{ value: 'Leverage ↑', angle: -90, position: 'left', fill: '#6b7280', fontSize: 12, dx: -12 }}
-              ticks={[1,2,3,4,5,6,7,8,9,10]}
-              tick={{ fill: '#6b7280', fontSize: 11 }}
-              stroke="#374151"
-            />
-            <Tooltip content={<CustomTooltip />} />
-            <ReferenceLine x={5.5} stroke="#374151" strokeDasharray="4 4" strokeWidth={1.5} />
-            <ReferenceLine y={5.5} stroke="#374151" strokeDasharray="4 4" strokeWidth={1.5} />
-            <Scatter data={chartData} shape={(props) => (
-              <CustomDot
-                {...props}
-                onClick={(task) => setSelected(selected?.id === task.id ? null : task)}
-                selected={selected?.id === props.payload?.id}
+        {canvasMode ? (
+          <MatrixCanvas
+            grid={grid}
+            selectedId={selectedId}
+            height={CHART_HEIGHT}
+            colorOf={quadrantColor}
+            onSelect={(cell) => setSelectedId(cell && cell.key !== selectedCell?.key ? cell.tasks[0].id : null)}
+            renderTooltip={renderCellTooltip}
+          />
+        ) : (
+          <ResponsiveContainer width="100%" height={CHART_HEIGHT}>
+            <ScatterChart margin={{ top: 16, right: 24, bottom: 40, left: 40 }}>
+              <CartesianGrid strokeDasharray="3 3" stroke="#1f2937" />
+              <XAxis
+                type="number" dataKey="x" domain={[0, 11]} name="Effort"
+                label={{ value: 'Effort →', position: 'bottom', fill: '#6b7280', fontSize: 12 }}
+                ticks={[1,2,3,4,5,6,7,8,9,10]}
+                tick={{ fill: '#6b7280', fontSize: 11 }}
+                stroke="#374151"
+              />
+              <YAxis
+                type="number" dataKey="y" domain={[0, 11]} name="Leverage"
+                label={{ value: 'Leverage ↑', angle: -90, position: 'left', fill: '#6b7280', fontSize: 12, dx: -12 }}
+                ticks={[1,2,3,4,5,6,7,8,9,10]}
+                tick={{ fill: '#6b7280', fontSize: 11 }}
+                stroke="#374151"
               />
-            )}>
-              {chartData.map((entry) => (
-                <Cell key={entry.id} fill={getQuadrant(entry.leverage, entry.effort).color} />
-              ))}
-            </Scatter>
-          </ScatterChart>
-        </ResponsiveContainer>
+              <Tooltip content={<CustomTooltip />} />
+              <ReferenceLine x={5.5} stroke="#374151" strokeDasharray="4 4" strokeWidth={1.5} />
+              <ReferenceLine y={5.5} stroke="#374151" strokeDasharray="4 4" strokeWidth={1.5} />
+              <Scatter data={chartData} shape={(props) => (
+                <CustomDot
+                  {...props}
+                  onClick={(task) => setSelectedId(selectedId === task.id ? null : task.id)}
+                  selected={selectedId === props.payload?.id}
+                />
+              )}>
+                {chartData.map((entry) => (
+                  <Cell key={entry.id} fill={getQuadrant(entry.leverage, entry.effort).color} />
+                ))}
+              </Scatter>
+            </ScatterChart>
+          </ResponsiveContainer>
+        )}
 
         <p className="text-xs text-gray-600 text-center -mt-2">Click a dot to inspect and score</p>
       </div>
@@ -156,11 +196,32 @@ export function TaskMatrix({ tasks, onUpdate, onDone, onKill }: Props) {
                   <p className="text-xs text-gray-400 mt-1 leading-relaxed">{selected.description}</p>
                 )}
               </div>
-              <button onClick={() => setSelected(null)} className="text-gray-500 hover:text-gray-300 flex-shrink-0">
+              <button onClick={() => setSelectedId(null)} className="text-gray-500 hover:text-gray-300 flex-shrink-0">
                 <X size={14} />
               </button>
             </div>
 
+            {/* Other tasks at the same leverage/effort — they share one dot on the matrix */}
+            {sameSpot.length > 0 && (
+              <div>
+                <p className="text-xs text-gray-500 mb-1">{sameSpot.length} more on this spot</p>
+                <div className="flex flex-col gap-0.5">
+                  {sameSpot.slice(0, SAME_SPOT_LIMIT).map(t => (
+                    <button
+                      key={t.id}
+                      onClick={() => setSelectedId(t.id)}
+                      className="text-left text-xs text-gray-400 hover:text-gray-200 truncate"
+                    >
+                      {t.urgency === 'today' && <span className="text-red-400">● </span>}{t.title}
+                    </button>
+                  ))}
+                  {sameSpot.length > SAME_SPOT_LIMIT && (
+                    <span className="text-xs text-gray-600">and {sameSpot.length - SAME_SPOT_LIMIT} more — see the list view</span>
+                  )}
+                </div>
+              </div>
+            )}
+
             <div>
               <p className="text-xs text-gray-500 mb-1">Quadrant</p>
               <span className="text-sm font-semibold" style={{ color: getQuadrant(selected.leverage, selected.effort).color }}>
@@ -175,10 +236,7 @@ export function TaskMatrix({ tasks, onUpdate, onDone, onKill }: Props) {
                 {(['today', 'this_week', 'whenever'] as Urgency[]).map(u => (
                   <button
                     key={u}
-                    onClick={() => {
-                      onUpdate(selected.id, { urgency: u })
-                      setSelected({ ...selected, urgency: u })
-                    }}
+                    onClick={() => onUpdate(selected.id, { urgency: u })}
                     className={`text-xs px-2 py-1 rounded border transition-colors ${
                       selected.urgency === u
                         ? u === 'today' ? 'bg-red-900/50 text-red-300 border-red-700'
@@ -249,13 +307,13 @@ export function TaskMatrix({ tasks, onUpdate, onDone, onKill }: Props) {
               )}
               <div className="flex gap-2">
                 <button
-                  onClick={() => { onDone(selected.id); setSelected(null) }}
+                  onClick={() => { onDone(selected.id); setSelectedId(null) }}
                   className="flex-1 flex items-center justify-center gap-1.5 py-2 rounded-lg text-xs bg-emerald-700 hover:bg-emerald-600 text-white transition-colors"
                 >
                   <Check size={12} /> Done
                 </button>
                 <button
-                  onClick={() => { onKill(selected.id); setSelected(null) }}
+                  onClick={() => { onKill(selected.id); setSelectedId(null) }}
                   className="flex-1 flex items-center justify-center gap-1.5 py-2 rounded-lg text-xs bg-gray-700 hover:bg-red-900 text-gray-300 hover:text-red-300 transition-colors"
                 >
                   <X size={12} /> Kill
@@ -1,3 +1,5 @@
+import { timed } from './timing'
+
 export type AirtableTask = {
   title: string
   description: string
@@ -5,31 +7,55 @@ export type AirtableTask = {
   context_url: string
 }
 
-export async function fetchAirtableTasks(): Promise<AirtableTask[]> {
+// Only the fields the importer reads — Airtable otherwise returns every column
+const FIELDS = ['Task', 'Deliverable Title', 'Notes', 'Due Date']
+
+function airtableTable() {
+  return {
+    baseId: process.env.AIRTABLE_BASE_ID || 'appyNh9YMfuKcudXq',
+    tableName: process.env.AIRTABLE_TABLE_NAME || 'Task Hub',
+  }
+}
+
+// Identifies the synced table, so switching base/table starts a fresh full sync
+export function airtableTableKey(): string {
+  const { baseId, tableName } = airtableTable()
+  return `${baseId}/${tableName}`
+}
+
+// Fetches one page (up to 100 records) of matching records, starting at Airtable's `offset`
+// token from the previous page. With `since` (an ISO timestamp from a previous sync) only
+// records modified after it are returned. `offset` is null on the last page.
+export async function fetchAirtablePage(
+  since?: string | null,
+  offset?: string | null
+): Promise<{ tasks: AirtableTask[]; offset: string | null }> {
   const apiKey = process.env.AIRTABLE_API_KEY
-  const baseId = process.env.AIRTABLE_BASE_ID || 'appyNh9YMfuKcudXq'
-  const tableName = process.env.AIRTABLE_TABLE_NAME || 'Task Hub'
+  const { baseId, tableName } = airtableTable()
 
   if (!apiKey) throw new Error('AIRTABLE_API_KEY not set')
 
   // Filter: incomplete tasks where Deliverable Title contains "Roshan"
   // (Roshan Prakash is the assignee — Task Hub uses "Owner Name" in the title)
-  const filterFormula = encodeURIComponent(
-    `AND({Complete?} = FALSE(), SEARCH("Roshan", {Deliverable Title}) > 0)`
-  )
+  const conditions = ['{Complete?} = FALSE()', 'SEARCH("Roshan", {Deliverable Title}) > 0']
+  if (since) conditions.push(`IS_AFTER(LAST_MODIFIED_TIME(), '${since}')`)
+
+  const params = new URLSearchParams({ filterByFormula: `AND(${conditions.join(', ')})`, pageSize: '100' })
+  for (const field of FIELDS) params.append('fields[]', field)
+  if (offset) params.set('offset', offset)
 
-  const url = `https://api.airtable.com/v0/${baseId}/${encodeURIComponent(tableName)}?filterByFormula=${filterFormula}&maxRecords=100`
+  const url = `https://api.airtable.com/v0/${baseId}/${encodeURIComponent(tableName)}?${params}`
 
-  const res = await fetch(url, {
+  const res = await timed('airtable_list', () => fetch(url, {
     headers: { Authorization: `Bearer ${apiKey}` },
-  })
+  }))
 
   if (!res.ok) {
     const err = await res.text()
     throw new Error(`Airtable fetch failed (${res.status}): ${err}`)
   }
 
-  const data = await res.json()
+  const data = await timed('airtable_list', () => res.json())
   const tasks: AirtableTask[] = []
 
   for (const record of data.records || []) {
@@ -58,5 +84,5 @@ export async function fetchAirtableTasks(): Promise<AirtableTask[]> {
     })
   }
 
-  return tasks
+  return { tasks, offset: data.offset || null }
 }
@@ -0,0 +1,28 @@
+// Categories are paths like "Client Work > ListKit". The database keeps every ancestor of a
+// task's category in the generated category_path column ({"Client Work", "Client Work > ListKit"}),
+// so "everything under Client Work" is one GIN-indexed containment test.
+
+export const CATEGORY_SEPARATOR = ' > '
+
+// Same normalisation as category_ancestors() in supabase-schema.sql
+export function normalizeCategory(category: string): string {
+  return category.split('>').map((part) => part.trim()).filter(Boolean).join(CATEGORY_SEPARATOR)
+}
+
+export function inCategory(category: string | null | undefined, prefix: string): boolean {
+  if (!category) return false
+  const c = normalizeCategory(category)
+  const p = normalizeCategory(prefix)
+  return c === p || c.startsWith(p + CATEGORY_SEPARATOR)
+}
+
+// Postgres array literal for a category_path containment filter (cs.{...})
+export function categoryPathLiteral(prefix: string): string {
+  return `{"${normalizeCategory(prefix).replace(/["\\]/g, '\\$&')}"}`
+}
+
+// Equivalent text filter for databases without category_path (not index-assisted)
+export function categoryTextFilter(prefix: string): string {
+  const p = normalizeCategory(prefix).replace(/["\\]/g, '\\$&')
+  return `category.eq."${p}",category.like."${p}${CATEGORY_SEPARATOR}*"`
+}
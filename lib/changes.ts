@@ -0,0 +1,44 @@
+import { Task } from './supabase'
+
+// Applies rows from /api/tasks/changes (or a realtime event) to the active board list without
+// a refetch: edited rows are replaced where they sit, new active rows go on top and rows that
+// left 'active' are dropped. Ids in `skip` have local writes in flight, so the server copy is
+// older than what's on screen. Ids in `deleted` were removed from the table (deleted or
+// archived) and are dropped. Applying the same row twice is a no-op.
+export function applyTaskChanges(tasks: Task[], changes: Task[], skip?: Set<string>, deleted: string[] = []): Task[] {
+  const changed = new Map<string, Task>()
+  for (const t of changes) {
+    if (!skip?.has(t.id)) changed.set(t.id, t)
+  }
+  const gone = new Set(deleted)
+  if (changed.size === 0 && !tasks.some((t) => gone.has(t.id))) return tasks
+
+  const next: Task[] = []
+  for (const t of tasks) {
+    if (gone.has(t.id)) continue
+    const c = changed.get(t.id)
+    if (!c) {
+      next.push(t)
+      continue
+    }
+    changed.delete(t.id)
+    // Rows the changes feed serves again (its overlap window) keep their identity
+    if (c.status === 'active') next.push(c.updated_at === t.updated_at ? t : c)
+  }
+
+  const added = [...changed.values()].filter((t) => t.status === 'active').reverse()
+  return added.length > 0 ? [...added, ...next] : next
+}
+
+export function removeTask(tasks: Task[], id: string): Task[] {
+  return tasks.some((t) => t.id === id) ? tasks.filter((t) => t.id !== id) : tasks
+}
+
+// Watermark for a freshly loaded board: the newest updated_at in it
+export function latestUpdate(tasks: Task[]): string | null {
+  let latest: string | null = null
+  for (const t of tasks) {
+    if (t.updated_at && (!latest || Date.parse(t.updated_at) > Date.parse(latest))) latest = t.updated_at
+  }
+  return latest
+}
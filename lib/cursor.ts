@@ -0,0 +1,36 @@
+// Opaque keyset cursors: a timestamp column value plus the row id as a tie-breaker
+export type Cursor = { ts: string; id: string }
+
+// Both parts end up inside PostgREST filter strings, so anything else is rejected outright.
+// Timestamps keep Postgres's microseconds — rounding them would re-serve or skip rows.
+const TIMESTAMP = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}(:?\d{2})?)$/
+const UUID = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i
+
+export function isUuid(id: string): boolean {
+  return UUID.test(id)
+}
+
+function isTimestamp(ts: string): boolean {
+  return TIMESTAMP.test(ts) && !Number.isNaN(Date.parse(ts))
+}
+
+export function encodeCursor(ts: string, id: string): string {
+  return Buffer.from(`${ts}|${id}`).toString('base64url')
+}
+
+export function decodeCursor(cursor: string): Cursor | null {
+  const [ts, id, ...rest] = Buffer.from(cursor, 'base64url').toString().split('|')
+  if (rest.length > 0 || !ts || !id || !isTimestamp(ts) || !isUuid(id)) return null
+  return { ts, id }
+}
+
+// Microseconds since the epoch; Date.parse alone drops the last three digits
+function micros(ts: string): number {
+  const fraction = /\.(\d+)/.exec(ts)?.[1] ?? ''
+  return Date.parse(ts) * 1000 + Number(fraction.padEnd(6, '0').slice(3, 6))
+}
+
+// Keyset order: timestamp, then id
+export function compareCursors(a: Cursor, b: Cursor): number {
+  return micros(a.ts) - micros(b.ts) || (a.id < b.id ? -1 : a.id > b.id ? 1 : 0)
+}
@@ -0,0 +1,380 @@
+import { after, NextResponse } from 'next/server'
+import { supabase } from './supabase'
+import { upsertTasks } from './tasks'
+import { airtableTableKey, fetchAirtablePage } from './airtable'
+import {
+  SlackChannel,
+  SlackSession,
+  SlackWatermarks,
+  connectSlack,
+  defaultSlackCutoff,
+  fetchSlackTasks,
+  listSlackChannels,
+} from './slack'
+import { OVERVIEW_BUDGET_MS, fillPendingOverviews, overviewsEnabled } from './overview'
+import { timed, withTimingScope } from './timing'
+
+export type ImportKind = 'slack' | 'airtable'
+export type ImportJobStatus = 'queued' | 'running' | 'completed' | 'failed'
+
+type Checkpoint = Record<string, unknown>
+
+export type ImportJob = {
+  id: string
+  kind: ImportKind
+  status: ImportJobStatus
+  checkpoint: Checkpoint
+  processed: number
+  total: number | null
+  imported: number
+  updated: number
+  skipped: number
+  overviews_pending: number
+  error: string | null
+  locked_until: string | null
+  created_at: string
+  updated_at: string
+  finished_at: string | null
+}
+
+// What clients see of a job: everything but the checkpoint, which is worker state
+// (channel lists, Airtable offsets)
+export type ImportJobProgress = Omit<ImportJob, 'checkpoint'>
+const PROGRESS_COLUMNS =
+  'id, kind, status, processed, total, imported, updated, skipped, overviews_pending, error, locked_until, created_at, updated_at, finished_at'
+
+// How long one worker invocation keeps going before handing the job back; must stay
+// under the route's maxDuration so the last checkpoint is always written
+const SLICE_MS = Number(process.env.IMPORT_SLICE_MS) || 40_000
+// A crashed worker's lock lapses after this, letting the next poll resume the job
+const LOCK_MS = SLICE_MS + 20_000
+// Slack steps start no channel crawls this close to the slice deadline, and stop generating
+// overviews this close to it, so the overview writes and the checkpoint land in time
+const CRAWL_RESERVE_MS = 15_000
+const STORE_RESERVE_MS = 5_000
+
+// One chunk of work: reads the checkpoint, stores its rows, and returns the next checkpoint
+// plus the counts to add to the job
+type StepResult = {
+  checkpoint: Checkpoint
+  done: boolean
+  processed?: number
+  total?: number | null
+  imported?: number
+  updated?: number
+  skipped?: number
+  overviews_pending?: number
+}
+// deadline (epoch ms) is when the slice ends; a step should have stored its rows by then
+type Step = (checkpoint: Checkpoint, deadline: number) => Promise<StepResult>
+
+// ─── Slack ───────────────────────────────────────────────────────────────────
+
+// Per-channel high-water marks live in slack_sync_state; without that table every import rescans 7 days
+async function loadWatermarks(): Promise<SlackWatermarks> {
+  const { data, error } = await timed('sync_state', () => supabase.from('slack_sync_state').select('channel_id, last_ts'))
+  if (error) return {}
+  return Object.fromEntries((data || []).map((r) => [r.channel_id, r.last_ts]))
+}
+
+async function saveWatermarks(previous: SlackWatermarks, current: SlackWatermarks) {
+  const changed = Object.entries(current)
+    .filter(([channelId, ts]) => previous[channelId] !== ts)
+    .map(([channel_id, last_ts]) => ({ channel_id, last_ts, updated_at: new Date().toISOString() }))
+  if (changed.length === 0) return
+  await timed('sync_state', () => supabase.from('slack_sync_state').upsert(changed, { onConflict: 'channel_id' }))
+}
+
+// Checkpoint: { channels, next, since, cutoff } — one step crawls every remaining channel at
+// once (SLACK_CONCURRENCY in flight), stopping early if the slice runs short of time
+function slackSteps(): Step {
+  let session: SlackSession | null = null
+
+  return async (checkpoint, deadline) => {
+    session = session || await connectSlack()
+
+    if (!checkpoint.channels) {
+      const channels = await listSlackChannels(session)
+      return {
+        checkpoint: { channels, next: 0, since: await loadWatermarks(), cutoff: defaultSlackCutoff() },
+        done: channels.length === 0,
+        total: channels.length,
+      }
+    }
+
+    const channels = checkpoint.channels as SlackChannel[]
+    const next = checkpoint.next as number
+    const since = checkpoint.since as SlackWatermarks
+    const { tasks: slackTasks, watermarks, fetched } = await fetchSlackTasks(
+      session, channels.slice(next), since, checkpoint.cutoff as string, deadline - CRAWL_RESERVE_MS
+    )
+    const advanced = { ...checkpoint, next: next + fetched }
+    const done = next + fetched >= channels.length
+    if (slackTasks.length === 0) {
+      await saveWatermarks(since, watermarks)
+      return { checkpoint: advanced, done, processed: fetched }
+    }
+
+    // Overview text is generated after the upsert, for the rows it actually inserted:
+    // messages already on the board (or archived) are skipped there and cost no OpenAI calls
+    const pendingOverview = overviewsEnabled()
+    const rows = slackTasks.map((t) => ({
+      title: t.title,
+      description: t.description || null,
+      source: 'slack',
+      source_id: t.source_id,
+      leverage: 5,
+      effort: 5,
+      status: 'active',
+      context_url: t.context_url,
+      tags: [],
+      metadata: {
+        sender_name: t.sender_name,
+        channel_name: t.channel_name,
+        ai_overview: null,
+        workspace: 'Airr Digital',
+        ...(pendingOverview ? { overview_pending: true, context_text: t.context_text } : {}),
+      },
+    }))
+
+    // Messages imported before (or by a parallel run) are skipped by the upsert itself,
+    // which also leaves metadata out if that column doesn't exist yet
+    const result = await upsertTasks(rows)
+    if (result.error) throw new Error(result.error.message)
+
+    // Only advance the high-water marks once the rows are safely stored
+    await saveWatermarks(since, watermarks)
+
+    // Already-seen context is served from cache; rows past the time budget (or the slice's)
+    // stay pending for the backfill route
+    const pending = pendingOverview ? result.inserted.filter((t) => t.metadata?.overview_pending) : []
+    const budget = Math.min(OVERVIEW_BUDGET_MS, Math.max(0, deadline - Date.now() - STORE_RESERVE_MS))
+    const filled = pending.length > 0 ? await fillPendingOverviews(pending, budget) : 0
+
+    return {
+      checkpoint: advanced,
+      done,
+      processed: fetched,
+      imported: result.inserted.length,
+      skipped: result.skipped,
+      overviews_pending: pending.length - filled,
+    }
+  }
+}
+
+// ─── Airtable ────────────────────────────────────────────────────────────────
+
+// Last successful sync per Airtable table lives in airtable_sync_state; without it every import is a full sync
+async function loadSyncedAt(tableKey: string): Promise<string | null> {
+  const { data, error } = await timed('sync_state', () => supabase
+    .from('airtable_sync_state')
+    .select('synced_at')
+    .eq('table_key', tableKey)
+    .maybeSingle())
+  if (error || !data) return null
+  return data.synced_at
+}
+
+async function saveSyncedAt(tableKey: string, syncedAt: string) {
+  await timed('sync_state', () => supabase
+    .from('airtable_sync_state')
+    .upsert({ table_key: tableKey, synced_at: syncedAt }, { onConflict: 'table_key' }))
+}
+
+// Checkpoint: { tableKey, since, syncedAt, offset } — one step imports one page of records
+function airtableSteps(): Step {
+  return async (checkpoint) => {
+    if (!checkpoint.tableKey) {
+      const tableKey = airtableTableKey()
+      // Taken before the first request so edits made mid-sync are picked up next time
+      const syncedAt = new Date().toISOString()
+      return { checkpoint: { tableKey, since: await loadSyncedAt(tableKey), syncedAt, offset: null }, done: false }
+    }
+
+    const { tableKey, since, syncedAt } = checkpoint as { tableKey: string; since: string | null; syncedAt: string }
+    let page: Awaited<ReturnType<typeof fetchAirtablePage>>
+    try {
+      page = await fetchAirtablePage(since, checkpoint.offset as string | null)
+    } catch (err) {
+      // Airtable offsets expire after a few minutes; a resumed job starts the listing over,
+      // which is safe because the upsert skips rows that are already stored
+      if (checkpoint.offset && String(err).includes('LIST_RECORDS_ITERATOR_NOT_AVAILABLE')) {
+        return { checkpoint: { ...checkpoint, offset: null }, done: false }
+      }
+      throw err
+    }
+
+    // New records are inserted; known ones get their title/notes refreshed if they changed,
+    // leaving leverage/effort/status set on the board alone — all in one statement
+    const { inserted, updated, skipped, error } = page.tasks.length === 0
+      ? { inserted: [], updated: [], skipped: 0, error: null }
+      : await upsertTasks(
+          page.tasks.map((t) => ({
+            title: t.title,
+            description: t.description || null,
+            source: 'airtable',
+            source_id: t.source_id,
+            leverage: 5,
+            effort: 5,
+            status: 'active',
+            context_url: t.context_url,
+            tags: [],
+          })),
+          { refresh: true }
+        )
+    if (error) throw new Error(error.message)
+
+    // Only move the sync point forward once every page is stored
+    if (!page.offset) await saveSyncedAt(tableKey, syncedAt)
+
+    return {
+      checkpoint: { ...checkpoint, offset: page.offset },
+      done: !page.offset,
+      processed: page.tasks.length,
+      imported: inserted.length,
+      updated: updated.length,
+      skipped,
+    }
+  }
+}
+
+const STEPS: Record<ImportKind, () => Step> = { slack: slackSteps, airtable: airtableSteps }
+
+// ─── Jobs ────────────────────────────────────────────────────────────────────
+
+function isMissingTable(error: { code?: string; message?: string } | null): boolean {
+  return !!error && (error.code === '42P01' || !!error.message?.includes('schema cache') || !!error.message?.includes('does not exist'))
+}
+
+function addCounts(job: ImportJobProgress, step: StepResult): Partial<ImportJobProgress> {
+  return {
+    processed: job.processed + (step.processed || 0),
+    total: step.total === undefined ? job.total : step.total,
+    imported: job.imported + (step.imported || 0),
+    updated: job.updated + (step.updated || 0),
+    skipped: job.skipped + (step.skipped || 0),
+    overviews_pending: job.overviews_pending + (step.overviews_pending || 0),
+  }
+}
+
+// Queues an import, or returns the one already queued/running for this source. Without
+// the import_jobs table the import runs inline and the finished job is returned.
+export async function enqueueImport(kind: ImportKind): Promise<{ job: ImportJobProgress | null; error: string | null }> {
+  const { data, error } = await supabase.from('import_jobs').insert({ kind }).select(PROGRESS_COLUMNS).single()
+  if (!error) return { job: data as ImportJobProgress, error: null }
+
+  // Unique violation on import_jobs_active_idx — a job for this source is already underway
+  if (error.code === '23505') {
+    const existing = await supabase
+      .from('import_jobs')
+      .select(PROGRESS_COLUMNS)
+      .eq('kind', kind)
+      .in('status', ['queued', 'running'])
+      .maybeSingle()
+    if (existing.data) return { job: existing.data as ImportJobProgress, error: null }
+  }
+
+  if (isMissingTable(error)) return runInline(kind)
+  return { job: null, error: error.message }
+}
+
+// POST /api/import/<kind>: queues the import and returns 202 at once. The work runs after the
+// response, in checkpointed slices, and GET /api/import/jobs/[id] reports progress.
+export async function startImport(kind: ImportKind): Promise<NextResponse> {
+  const { job, error } = await enqueueImport(kind)
+  if (error || !job) {
+    const status = error?.startsWith('Database not set up') ? 503 : 500
+    return NextResponse.json({ error }, { status })
+  }
+
+  if (job.status === 'queued' || job.status === 'running') {
+    after(() => runImportJob(job.id))
+  }
+  return NextResponse.json({ job }, { status: 202 })
+}
+
+export async function getImportJob(id: string): Promise<{ job: ImportJobProgress | null; error: string | null }> {
+  const { data, error } = await supabase.from('import_jobs').select(PROGRESS_COLUMNS).eq('id', id).maybeSingle()
+  return { job: data as ImportJobProgress | null, error: error?.message || null }
+}
+
+// True when nobody is working on an unfinished job — a fresh worker should pick it up
+export function needsWorker(job: ImportJobProgress): boolean {
+  if (job.status !== 'queued' && job.status !== 'running') return false
+  return !job.locked_until || new Date(job.locked_until).getTime() < Date.now()
+}
+
+// Runs steps for up to SLICE_MS, writing the checkpoint after each one. The job is claimed
+// with a lease so concurrent triggers don't double-process it; if the slice ends first the
+// lease is dropped and the next status poll resumes from the last checkpoint. Each slice
+// logs its own stage timings, since it runs after the triggering response has gone out.
+export function runImportJob(id: string): Promise<void> {
+  return withTimingScope('import.worker', () => runSlice(id), { job: id })
+}
+
+async function runSlice(id: string): Promise<void> {
+  const deadline = Date.now() + SLICE_MS
+  const now = new Date().toISOString()
+
+  const { data: claimed } = await timed('job_update', () => supabase
+    .from('import_jobs')
+    .update({ status: 'running', locked_until: new Date(Date.now() + LOCK_MS).toISOString() })
+    .eq('id', id)
+    .in('status', ['queued', 'running'])
+    .or(`locked_until.is.null,locked_until.lt.${now}`)
+    .select()
+    .maybeSingle())
+  if (!claimed) return
+
+  let job = claimed as ImportJob
+  const step = STEPS[job.kind]()
+
+  try {
+    while (Date.now() < deadline) {
+      const result = await step(job.checkpoint, deadline)
+      const changes: Partial<ImportJob> = {
+        checkpoint: result.checkpoint,
+        ...addCounts(job, result),
+        ...(result.done ? { status: 'completed', finished_at: new Date().toISOString(), locked_until: null } : {}),
+      }
+      const { data, error } = await timed('job_update', () => supabase.from('import_jobs').update(changes).eq('id', id).select().single())
+      if (error) throw new Error(error.message)
+      job = data as ImportJob
+      if (result.done) return
+    }
+    await timed('job_update', () => supabase.from('import_jobs').update({ locked_until: null }).eq('id', id))
+  } catch (err) {
+    await timed('job_update', () => supabase
+      .from('import_jobs')
+      .update({ status: 'failed', error: err instanceof Error ? err.message : String(err), locked_until: null, finished_at: new Date().toISOString() })
+      .eq('id', id))
+  }
+}
+
+// Pre-migration fallback: run every step in this request and report the result as a
+// completed (or failed) job
+async function runInline(kind: ImportKind): Promise<{ job: ImportJobProgress | null; error: string | null }> {
+  const now = new Date().toISOString()
+  let checkpoint: Checkpoint = {}
+  let job: ImportJobProgress = {
+    id: '', kind, status: 'running', processed: 0, total: null, imported: 0, updated: 0,
+    skipped: 0, overviews_pending: 0, error: null, locked_until: null, created_at: now, updated_at: now, finished_at: null,
+  }
+  const step = STEPS[kind]()
+
+  try {
+    for (;;) {
+      const result = await step(checkpoint, Infinity)
+      checkpoint = result.checkpoint
+      job = { ...job, ...addCounts(job, result) }
+      if (result.done) break
+    }
+  } catch (err) {
+    const message = err instanceof Error ? err.message : String(err)
+    if (isMissingTable({ message })) {
+      return { job: null, error: 'Database not set up yet. Run the SQL schema in your Supabase SQL Editor first.' }
+    }
+    return { job: null, error: message }
+  }
+  return { job: { ...job, status: 'completed', finished_at: new Date().toISOString() }, error: null }
+}
@@ -0,0 +1,66 @@
+import { Task } from './supabase'
+import { prioritySort } from './priority'
+
+// Leverage and effort are whole scores from 1 to 10, so the matrix is a 10×10 grid and
+// every task in a cell sits on the same point. The cell is both the spatial-index bucket
+// used for hit-testing and the cluster drawn as a single dot.
+export const SCORE_MIN = 1
+export const SCORE_MAX = 10
+
+export type MatrixCell = {
+  key: number
+  effort: number
+  leverage: number
+  // Priority order: tasks[0] is the one labelled on the matrix
+  tasks: Task[]
+  urgent: boolean
+}
+
+export type MatrixGrid = {
+  cells: MatrixCell[]
+  byKey: Map<number, MatrixCell>
+  cellOf: Map<string, MatrixCell>
+}
+
+function clampScore(score: number): number {
+  return Math.min(SCORE_MAX, Math.max(SCORE_MIN, Math.round(score)))
+}
+
+export function cellKey(effort: number, leverage: number): number {
+  return (clampScore(leverage) - SCORE_MIN) * SCORE_MAX + (clampScore(effort) - SCORE_MIN)
+}
+
+// One pass to bucket, then a sort per cell — O(n log n) in the largest cell, not the board
+export function buildMatrixGrid(tasks: Task[]): MatrixGrid {
+  const byKey = new Map<number, MatrixCell>()
+  const cellOf = new Map<string, MatrixCell>()
+  for (const task of tasks) {
+    const key = cellKey(task.effort, task.leverage)
+    let cell = byKey.get(key)
+    if (!cell) {
+      cell = { key, effort: clampScore(task.effort), leverage: clampScore(task.leverage), tasks: [], urgent: false }
+      byKey.set(key, cell)
+    }
+    cell.tasks.push(task)
+    if (task.urgency === 'today') cell.urgent = true
+    cellOf.set(task.id, cell)
+  }
+  for (const cell of byKey.values()) {
+    if (cell.tasks.length > 1) cell.tasks.sort(prioritySort)
+  }
+  return { cells: [...byKey.values()], byKey, cellOf }
+}
+
+// Dot radius in px: clusters grow with the log of their size so a 500-task cell stays legible
+export function dotRadius(cell: MatrixCell): number {
+  const base = cell.urgent ? 9 : 7
+  return cell.tasks.length > 1 ? Math.min(18, base + 2 * Math.log2(cell.tasks.length)) : base
+}
+
+// The cell nearest a point in score space (fractional effort/leverage), if it holds any tasks.
+// Cells are at least a score apart, so only the nearest one can contain the point.
+export function cellAt(grid: MatrixGrid, effort: number, leverage: number): MatrixCell | null {
+  if (effort < SCORE_MIN - 0.5 || effort > SCORE_MAX + 0.5) return null
+  if (leverage < SCORE_MIN - 0.5 || leverage > SCORE_MAX + 0.5) return null
+  return grid.byKey.get(cellKey(effort, leverage)) ?? null
+}
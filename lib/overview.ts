@@ -0,0 +1,125 @@
+import { createHash } from 'crypto'
+import OpenAI from 'openai'
+import { supabase, TaskMetadata } from './supabase'
+import { mapPool } from './pool'
+import { timed } from './timing'
+
+const MODEL = 'gpt-4o-mini'
+const CONCURRENCY = Number(process.env.OPENAI_CONCURRENCY) || 5
+export const OVERVIEW_BUDGET_MS = Number(process.env.OVERVIEW_BUDGET_MS) || 20_000
+const MEMORY_CACHE_LIMIT = 5000
+
+let _client: OpenAI | null = null
+
+function getClient(): OpenAI | null {
+  if (_client) return _client
+  const apiKey = process.env.OPENAI_API_KEY
+  if (!apiKey) return null
+  // OPENAI_BASE_URL lets tests point this at a local stub (see scripts/openai-stub.mjs)
+  _client = new OpenAI({ apiKey, baseURL: process.env.OPENAI_BASE_URL || undefined, maxRetries: 1 })
+  return _client
+}
+
+export function overviewsEnabled(): boolean {
+  return Boolean(process.env.OPENAI_API_KEY)
+}
+
+// Warm-instance cache in front of the ai_overview_cache table
+const memoryCache = new Map<string, string>()
+
+function remember(hash: string, overview: string) {
+  if (memoryCache.size >= MEMORY_CACHE_LIMIT) {
+    memoryCache.delete(memoryCache.keys().next().value as string)
+  }
+  memoryCache.set(hash, overview)
+}
+
+export function overviewHash(contextText: string): string {
+  return createHash('sha256').update(`${MODEL}\n${contextText}`).digest('hex')
+}
+
+async function generateOverview(client: OpenAI, contextText: string, timeout: number): Promise<string | null> {
+  try {
+    const response = await client.chat.completions.create(
+      {
+        model: MODEL,
+        messages: [
+          {
+            role: 'user',
+            content: `In 1-2 sentences, explain what task or action is being requested in this Slack message. Be specific and concrete.\n\nMessage:\n${contextText}`,
+          },
+        ],
+        max_tokens: 100,
+        temperature: 0.3,
+      },
+      { timeout }
+    )
+    return response.choices[0]?.message?.content?.trim() || null
+  } catch {
+    return null
+  }
+}
+
+// One overview (or null) per input text, in order. Texts seen before — in this instance or in
+// ai_overview_cache — cost nothing; the rest are generated CONCURRENCY at a time over one shared
+// client until budgetMs runs out, after which they come back null for a later backfill.
+export async function generateOverviews(
+  contextTexts: string[],
+  budgetMs: number = OVERVIEW_BUDGET_MS
+): Promise<(string | null)[]> {
+  const client = getClient()
+  if (!client || contextTexts.length === 0) return contextTexts.map(() => null)
+
+  const deadline = Date.now() + budgetMs
+  const hashes = contextTexts.map(overviewHash)
+  const textByHash = new Map(hashes.map((h, i) => [h, contextTexts[i]] as const))
+
+  const uncached = [...textByHash.keys()].filter((h) => !memoryCache.has(h))
+  if (uncached.length > 0) {
+    // Missing table just means no shared cache yet
+    const { data } = await timed('overview_cache', () => supabase.from('ai_overview_cache').select('hash, overview').in('hash', uncached))
+    for (const row of data || []) remember(row.hash, row.overview)
+  }
+
+  const missing = uncached.filter((h) => !memoryCache.has(h))
+  const fresh: { hash: string; overview: string }[] = []
+
+  await mapPool(missing, CONCURRENCY, async (hash) => {
+    const remaining = deadline - Date.now()
+    if (remaining <= 0) return
+    const overview = await timed('openai', () => generateOverview(client, textByHash.get(hash) as string, remaining))
+    if (overview) {
+      remember(hash, overview)
+      fresh.push({ hash, overview })
+    }
+  })
+
+  if (fresh.length > 0) {
+    await timed('overview_cache', () => supabase.from('ai_overview_cache').upsert(fresh, { onConflict: 'hash' }))
+  }
+
+  return hashes.map((h) => memoryCache.get(h) ?? null)
+}
+
+export type PendingOverviewRow = { id: string; metadata: TaskMetadata }
+
+// Generates the overviews waiting on Slack rows (metadata.overview_pending, with the message
+// in context_text) and stores each on its row. Returns how many were filled; rows past the
+// budget stay pending for /api/import/slack/backfill.
+export async function fillPendingOverviews(
+  rows: PendingOverviewRow[],
+  budgetMs: number = OVERVIEW_BUDGET_MS
+): Promise<number> {
+  const pending = rows.filter((r) => r.metadata?.overview_pending)
+  const overviews = await generateOverviews(pending.map((r) => r.metadata?.context_text || ''), budgetMs)
+
+  const filled = await mapPool(pending, 10, async (row, i) => {
+    if (!overviews[i]) return false
+    const metadata = { ...row.metadata, ai_overview: overviews[i] as string }
+    delete metadata.overview_pending
+    delete metadata.context_text
+    const { error } = await timed('db_update', () => supabase.from('tasks').update({ metadata }).eq('id', row.id))
+    return !error
+  })
+  return filled.filter(Boolean).length
+}
@@ -1,5 +1,6 @@
 import { Task } from './supabase'
 
+// Keep in sync with the urgency_rank / priority_score generated columns in supabase-schema.sql
 const URGENCY_RANK: Record<string, number> = {
   today: 0,
   this_week: 1,
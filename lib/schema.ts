@@ -0,0 +1,65 @@
+import { supabase } from './supabase'
+import { timed } from './timing'
+
+// Columns of tasks added by later migrations in supabase-schema.sql. A database that hasn't
+// run them yet still takes writes: rows are shaped to the columns it has before they are
+// sent, so every write is one round trip instead of insert, fail, strip, retry.
+const OPTIONAL_COLUMNS = ['urgency', 'category', 'metadata'] as const
+
+// Long enough that the probe is noise, short enough that a migration is picked up without a redeploy
+const TTL_MS = Number(process.env.SCHEMA_PROBE_TTL_MS) || 5 * 60_000
+
+let cached: { missing: ReadonlySet<string>; expires: number } | null = null
+let probing: Promise<ReadonlySet<string>> | null = null
+
+function isMissingColumn(error: { code?: string; message?: string }, column: string): boolean {
+  return error.code === '42703' || error.code === 'PGRST204' || !!error.message?.includes(column)
+}
+
+// One zero-row select per optional column, in parallel. PostgREST rejects unknown columns,
+// so the error tells which are missing. Any other failure (no table, no env) isn't cached:
+// callers then send full rows and report the database's own error.
+async function probe(): Promise<ReadonlySet<string> | null> {
+  try {
+    const results = await timed('schema_probe', () => Promise.all(
+      OPTIONAL_COLUMNS.map(async (column) => ({ column, ...(await supabase.from('tasks').select(column).limit(0)) }))
+    ))
+    const missing = new Set<string>()
+    for (const { column, error } of results) {
+      if (!error) continue
+      if (!isMissingColumn(error, column)) return null
+      missing.add(column)
+    }
+    return missing
+  } catch {
+    return null
+  }
+}
+
+// Optional columns this database doesn't have yet, probed at most once per TTL per process
+export async function missingTaskColumns(): Promise<ReadonlySet<string>> {
+  if (cached && cached.expires > Date.now()) return cached.missing
+  if (!probing) {
+    probing = probe()
+      .then((missing) => {
+        if (!missing) return new Set<string>()
+        cached = { missing, expires: Date.now() + TTL_MS }
+        return missing
+      })
+      .finally(() => {
+        probing = null
+      })
+  }
+  return probing
+}
+
+// Drops the columns this database doesn't have from rows bound for tasks
+export async function fitTaskRows<T extends Record<string, unknown>>(rows: T[]): Promise<T[]> {
+  const missing = await missingTaskColumns()
+  if (missing.size === 0) return rows
+  return rows.map((row) => {
+    const fitted: Record<string, unknown> = { ...row }
+    for (const column of missing) delete fitted[column]
+    return fitted as T
+  })
+}
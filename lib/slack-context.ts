@@ -0,0 +1,42 @@
+export type SlackMessage = { ts: string; text: string; user?: string; bot_id?: string; subtype?: string }
+
+export type ContextWindow = {
+  before: number       // seconds of conversation before the message
+  after: number        // seconds after it
+  maxMessages: number  // how many messages to keep from the window
+}
+
+export const DEFAULT_CONTEXT_WINDOW: ContextWindow = { before: 120, after: 30, maxMessages: 4 }
+
+type Timed = { t: number; m: SlackMessage }
+
+function byTime(messages: SlackMessage[]): Timed[] {
+  return messages.map((m) => ({ t: parseFloat(m.ts), m })).sort((a, b) => a.t - b.t)
+}
+
+// For each target, the newest `maxMessages` human messages within [ts - before, ts + after], newest first.
+// Timestamps are parsed once and both window edges only ever move forward over the time-ordered
+// messages, so a channel costs one sort plus O(n · maxMessages) instead of a full rescan per target.
+export function gatherContext(
+  messages: SlackMessage[],
+  targets: SlackMessage[],
+  window: ContextWindow = DEFAULT_CONTEXT_WINDOW
+): Map<SlackMessage, SlackMessage[]> {
+  const candidates = byTime(messages.filter((m) => !m.bot_id && m.text))
+  const contexts = new Map<SlackMessage, SlackMessage[]>()
+
+  let lo = 0
+  let hi = 0
+  for (const { t, m } of byTime(targets)) {
+    while (hi < candidates.length && candidates[hi].t <= t + window.after) hi++
+    while (lo < hi && candidates[lo].t < t - window.before) lo++
+
+    const context: SlackMessage[] = []
+    for (let i = hi - 1; i >= lo && context.length < window.maxMessages; i--) {
+      context.push(candidates[i].m)
+    }
+    contexts.set(m, context)
+  }
+
+  return contexts
+}
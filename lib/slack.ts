@@ -1,3 +1,7 @@
+import { mapPool } from './pool'
+import { ContextWindow, DEFAULT_CONTEXT_WINDOW, SlackMessage, gatherContext } from './slack-context'
+import { timed } from './timing'
+
 export type SlackTask = {
   title: string
   description: string
@@ -8,15 +12,60 @@ export type SlackTask = {
   context_text: string
 }
 
-export async function fetchSlackTasks(): Promise<SlackTask[]> {
+// channel id → newest message ts already imported
+export type SlackWatermarks = Record<string, string>
+
+const HISTORY_CONCURRENCY = Number(process.env.SLACK_CONCURRENCY) || 8
+const MAX_RATE_LIMIT_RETRIES = 3
+
+async function slackGet(method: string, params: Record<string, string>, token: string) {
+  const url = `https://slack.com/api/${method}?${new URLSearchParams(params)}`
+  // One stage per API method (slack_conversations_history, ...) so a slow import shows which call dominated
+  const stage = `slack_${method.replace('.', '_')}`
+  for (let attempt = 0; ; attempt++) {
+    const res = await timed(stage, () => fetch(url, { headers: { Authorization: `Bearer ${token}` } }))
+    // Tier limits: wait as long as Slack asks instead of failing the channel
+    if (res.status === 429 && attempt < MAX_RATE_LIMIT_RETRIES) {
+      const wait = Number(res.headers.get('retry-after')) || 1
+      await new Promise((r) => setTimeout(r, wait * 1000))
+      continue
+    }
+    return timed(stage, () => res.json())
+  }
+}
+
+// Follows response_metadata.next_cursor until exhausted, collecting `key` from every page
+async function slackPaginate<T>(
+  method: string,
+  params: Record<string, string>,
+  key: string,
+  token: string
+): Promise<{ ok: boolean; error?: string; items: T[] }> {
+  const items: T[] = []
+  let cursor = ''
+  do {
+    const data = await slackGet(method, cursor ? { ...params, cursor } : params, token)
+    if (!data.ok) return { ok: false, error: data.error, items }
+    items.push(...(data[key] || []))
+    cursor = data.response_metadata?.next_cursor || ''
+  } while (cursor)
+  return { ok: true, items }
+}
+
+export type SlackChannel = { id: string; name?: string }
+
+export type SlackSession = {
+  token: string
+  userMap: Record<string, string>
+}
+
+// Authenticates and loads the user directory; reused for every channel of an import slice
+export async function connectSlack(): Promise<SlackSession> {
   const token = process.env.SLACK_BOT_TOKEN || process.env.SLACK_USER_TOKEN
   if (!token) throw new Error('SLACK_BOT_TOKEN or SLACK_USER_TOKEN not set')
 
   // Verify workspace is Airr Digital
-  const authRes = await fetch('https://slack.com/api/auth.test', {
-    headers: { Authorization: `Bearer ${token}` },
-  })
-  const authData = await authRes.json()
+  const authData = await slackGet('auth.test', {}, token)
   if (!authData.ok) throw new Error(`Slack auth failed: ${authData.error}`)
 
   const workspaceName: string = authData.team || ''
@@ -25,84 +74,113 @@ export async function fetchSlackTasks(): Promise<SlackTask[]> {
   }
 
   // Build user ID → display name map
-  const usersRes = await fetch('https://slack.com/api/users.list?limit=200', {
-    headers: { Authorization: `Bearer ${token}` },
-  })
-  const usersData = await usersRes.json()
+  const users = await slackPaginate<{ id: string; name?: string; real_name?: string; profile?: { display_name?: string } }>(
+    'users.list', { limit: '200' }, 'members', token
+  )
   const userMap: Record<string, string> = {}
-  if (usersData.ok) {
-    for (const member of usersData.members || []) {
-      userMap[member.id] = member.profile?.display_name || member.real_name || member.name || member.id
-    }
+  for (const member of users.items) {
+    userMap[member.id] = member.profile?.display_name || member.real_name || member.name || member.id
   }
 
-  // Fetch channels the user is in
-  const channelsRes = await fetch(
-    'https://slack.com/api/conversations.list?types=public_channel,private_channel&limit=100',
-    { headers: { Authorization: `Bearer ${token}` } }
-  )
-  const channelsData = await channelsRes.json()
-  if (!channelsData.ok) throw new Error(`Slack channels error: ${channelsData.error}`)
-
-  const tasks: SlackTask[] = []
-  const cutoff = Date.now() / 1000 - 7 * 24 * 60 * 60 // 7 days ago
+  return { token, userMap }
+}
 
-  for (const channel of channelsData.channels || []) {
-    if (!channel.is_member) continue
+// Channels the token can read history from
+export async function listSlackChannels(session: SlackSession): Promise<SlackChannel[]> {
+  const channels = await slackPaginate<{ id: string; name?: string; is_member?: boolean }>(
+    'conversations.list',
+    { types: 'public_channel,private_channel', exclude_archived: 'true', limit: '200' },
+    'channels',
+    session.token
+  )
+  if (!channels.ok) throw new Error(`Slack channels error: ${channels.error}`)
+  return channels.items.filter((c) => c.is_member).map((c) => ({ id: c.id, name: c.name }))
+}
 
-    const channelName: string = channel.name || channel.id
+// Oldest history fetched for a channel that has never been imported
+export function defaultSlackCutoff(): string {
+  return String(Date.now() / 1000 - 7 * 24 * 60 * 60) // 7 days ago
+}
 
-    // Fetch recent messages
-    const historyRes = await fetch(
-      `https://slack.com/api/conversations.history?channel=${channel.id}&oldest=${cutoff}&limit=50`,
-      { headers: { Authorization: `Bearer ${token}` } }
+// Fetches new messages for channels with bounded concurrency. `since` holds each channel's
+// high-water mark (falling back to `cutoff`). No channel is started after `deadline` (epoch ms)
+// except the first, so every call makes progress: `fetched` channels from the front of the
+// list were crawled, and the returned watermarks cover only those.
+export async function fetchSlackTasks(
+  session: SlackSession,
+  channels: SlackChannel[],
+  since: SlackWatermarks = {},
+  cutoff: string = defaultSlackCutoff(),
+  deadline: number = Infinity,
+  contextWindow: ContextWindow = DEFAULT_CONTEXT_WINDOW
+): Promise<{ tasks: SlackTask[]; watermarks: SlackWatermarks; fetched: number }> {
+  const watermarks: SlackWatermarks = {}
+  let fetched = 0
+
+  // Workers take channels in list order, so once one is skipped every later one is too
+  const perChannel = await mapPool(channels, HISTORY_CONCURRENCY, async (channel, i) => {
+    if (i > 0 && Date.now() >= deadline) return []
+    fetched++
+    // Only messages newer than the last import (oldest is exclusive)
+    const oldest = since[channel.id] || cutoff
+    const history = await slackPaginate<SlackMessage>(
+      'conversations.history',
+      { channel: channel.id, oldest, limit: '200' },
+      'messages',
+      session.token
     )
-    const historyData = await historyRes.json()
-    if (!historyData.ok) continue
-
-    const messages: { ts: string; text: string; user?: string; bot_id?: string; subtype?: string }[] =
-      historyData.messages || []
-
-    for (const msg of messages) {
-      // Skip bot messages and empty messages
-      if (msg.bot_id || !msg.text || msg.subtype) continue
-
-      // Only actionable messages
-      const text = msg.text.toLowerCase()
-      const isActionable = ['?', 'can you', 'please', 'could you', 'need', 'asap', 'urgent', 'todo', 'follow up'].some(
-        (word) => text.includes(word)
-      )
-      if (!isActionable) continue
-
-      const senderName = msg.user ? (userMap[msg.user] || msg.user) : 'Unknown'
-
-      // Gather 3 surrounding messages for context (before + the message itself)
-      const msgTs = parseFloat(msg.ts)
-      const contextMsgs = messages
-        .filter((m) => {
-          const t = parseFloat(m.ts)
-          return t >= msgTs - 120 && t <= msgTs + 30 && !m.bot_id && m.text
-        })
-        .slice(0, 4)
-        .map((m) => {
-          const name = m.user ? (userMap[m.user] || m.user) : 'Unknown'
-          return `${name}: ${m.text}`
-        })
-        .join('\n')
-
-      const msgUrl = `https://slack.com/archives/${channel.id}/p${msg.ts.replace('.', '')}`
-
-      tasks.push({
-        title: msg.text.slice(0, 120).replace(/\n/g, ' '),
-        description: msg.text.length > 120 ? msg.text : '',
-        source_id: `slack_${msg.ts}`,
-        context_url: msgUrl,
-        sender_name: senderName,
-        channel_name: channelName,
-        context_text: contextMsgs || msg.text,
-      })
+    if (!history.ok) return []
+
+    for (const m of history.items) {
+      if (!watermarks[channel.id] || parseFloat(m.ts) > parseFloat(watermarks[channel.id])) {
+        watermarks[channel.id] = m.ts
+      }
     }
-  }
 
-  return tasks
+    return extractChannelTasks(channel, history.items, session.userMap, contextWindow)
+  })
+
+  return { tasks: perChannel.flat(), watermarks, fetched }
+}
+
+function isActionable(msg: SlackMessage): boolean {
+  // Skip bot messages and empty messages
+  if (msg.bot_id || !msg.text || msg.subtype) return false
+
+  const text = msg.text.toLowerCase()
+  return ['?', 'can you', 'please', 'could you', 'need', 'asap', 'urgent', 'todo', 'follow up'].some(
+    (word) => text.includes(word)
+  )
+}
+
+function extractChannelTasks(
+  channel: SlackChannel,
+  messages: SlackMessage[],
+  userMap: Record<string, string>,
+  contextWindow: ContextWindow
+): SlackTask[] {
+  const channelName: string = channel.name || channel.id
+  const nameOf = (m: SlackMessage) => (m.user ? (userMap[m.user] || m.user) : 'Unknown')
+
+  // Only actionable messages
+  const actionable = messages.filter(isActionable)
+  const contexts = gatherContext(messages, actionable, contextWindow)
+
+  return actionable.map((msg) => {
+    const contextMsgs = (contexts.get(msg) || [])
+      .map((m) => `${nameOf(m)}: ${m.text}`)
+      .join('\n')
+
+    const msgUrl = `https://slack.com/archives/${channel.id}/p${msg.ts.replace('.', '')}`
+
+    return {
+      title: msg.text.slice(0, 120).replace(/\n/g, ' '),
+      description: msg.text.length > 120 ? msg.text : '',
+      source_id: `slack_${msg.ts}`,
+      context_url: msgUrl,
+      sender_name: nameOf(msg),
+      channel_name: channelName,
+      context_text: contextMsgs || msg.text,
+    }
+  })
 }
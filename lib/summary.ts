@@ -0,0 +1,59 @@
+import { Task } from './supabase'
+import { priorityScore } from './priority'
+import { inCategory } from './categories'
+
+export type Quadrant = 'quick_win' | 'big_bet' | 'fill_in' | 'eliminate'
+
+// Board-wide counts for the header and sidebar. Category counts are per exact category;
+// use categoryCount for a category including its subcategories.
+export type TaskSummary = {
+  total: number
+  score_sum: number
+  score_avg: number | null
+  quadrants: Record<Quadrant, number>
+  urgency: Record<string, number>
+  sources: Record<string, number>
+  categories: Record<string, number>
+}
+
+// Keep in sync with the quadrant thresholds in task_summary() (supabase-schema.sql)
+export function quadrantOf(leverage: number, effort: number): Quadrant {
+  if (leverage >= 6) return effort <= 5 ? 'quick_win' : 'big_bet'
+  return effort <= 5 ? 'fill_in' : 'eliminate'
+}
+
+export function emptySummary(): TaskSummary {
+  return {
+    total: 0,
+    score_sum: 0,
+    score_avg: null,
+    quadrants: { quick_win: 0, big_bet: 0, fill_in: 0, eliminate: 0 },
+    urgency: {},
+    sources: {},
+    categories: {},
+  }
+}
+
+// Same numbers as task_summary(), for local mode and databases without the function
+export function summarizeTasks(tasks: Pick<Task, 'leverage' | 'effort' | 'urgency' | 'source' | 'category'>[]): TaskSummary {
+  const summary = emptySummary()
+  for (const t of tasks) {
+    summary.total++
+    summary.score_sum += priorityScore(t as Task)
+    summary.quadrants[quadrantOf(t.leverage, t.effort)]++
+    summary.urgency[t.urgency] = (summary.urgency[t.urgency] || 0) + 1
+    summary.sources[t.source] = (summary.sources[t.source] || 0) + 1
+    if (t.category) summary.categories[t.category] = (summary.categories[t.category] || 0) + 1
+  }
+  summary.score_avg = summary.total ? summary.score_sum / summary.total : null
+  return summary
+}
+
+// Tasks in category or any of its subcategories
+export function categoryCount(summary: TaskSummary, category: string): number {
+  let count = 0
+  for (const [c, n] of Object.entries(summary.categories)) {
+    if (inCategory(c, category)) count += n
+  }
+  return count
+}
@@ -24,6 +24,9 @@ export type TaskMetadata = {
   channel_name?: string
   ai_overview?: string
   workspace?: string
+  // Set while ai_overview is waiting for /api/import/slack/backfill
+  overview_pending?: boolean
+  context_text?: string
 } | null
 
 export const URGENCY_LEVELS = ['today', 'this_week', 'whenever'] as const
@@ -55,6 +58,10 @@ export type Task = {
   context_url: string | null
   tags: string[]
   metadata: TaskMetadata
+  // Generated columns; absent until the schema migration has run
+  urgency_rank?: number
+  priority_score?: number
+  category_path?: string[] | null
 }
 
-export type NewTask = Omit<Task, 'id' | 'created_at' | 'updated_at'>
+export type NewTask = Omit<Task, 'id' | 'created_at' | 'updated_at' | 'urgency_rank' | 'priority_score' | 'category_path'>
@@ -0,0 +1,136 @@
+import { PostgrestError } from '@supabase/supabase-js'
+import { supabase, Task, URGENCY_LEVELS } from './supabase'
+import { isUuid } from './cursor'
+import { mapPool } from './pool'
+import { fitTaskRows, missingTaskColumns } from './schema'
+import { timed } from './timing'
+
+// Fields a client may change on an existing task via PUT /api/tasks/[id] or PATCH /api/tasks/bulk
+export const UPDATABLE_FIELDS = [
+  'leverage',
+  'effort',
+  'status',
+  'title',
+  'description',
+  'tags',
+  'urgency',
+  'category',
+] as const
+
+export function buildTaskUpdates(body: Record<string, unknown>): Record<string, unknown> {
+  const updates: Record<string, unknown> = {
+    updated_at: new Date().toISOString(),
+  }
+
+  for (const field of UPDATABLE_FIELDS) {
+    if (body[field] !== undefined) updates[field] = body[field]
+  }
+  if (body.status === 'completed') {
+    updates.completed_at = new Date().toISOString()
+  }
+
+  return updates
+}
+
+export type TaskPatch = Record<string, unknown> & { id: string }
+
+const STATUSES: readonly unknown[] = ['active', 'completed', 'killed', 'archived']
+const URGENCIES: readonly unknown[] = URGENCY_LEVELS
+
+// Why a patch would break the tasks table's constraints, or null if it won't. bulk_update_tasks
+// is a single statement, so one bad row would otherwise fail the whole batch with a 500.
+export function invalidPatch(t: Record<string, unknown>): string | null {
+  if (typeof t.id !== 'string' || !isUuid(t.id)) return 'id must be a task uuid'
+  for (const field of ['leverage', 'effort']) {
+    const value = t[field]
+    if (value !== undefined && !(Number.isInteger(value) && (value as number) >= 1 && (value as number) <= 10)) {
+      return `${field} must be an integer from 1 to 10`
+    }
+  }
+  if (t.status !== undefined && !STATUSES.includes(t.status)) return `status must be one of ${STATUSES.join(', ')}`
+  if (t.urgency !== undefined && !URGENCIES.includes(t.urgency)) return `urgency must be one of ${URGENCIES.join(', ')}`
+  if (t.title !== undefined && (typeof t.title !== 'string' || !t.title.trim())) return 'title must be a non-empty string'
+  for (const field of ['description', 'category']) {
+    if (t[field] !== undefined && t[field] !== null && typeof t[field] !== 'string') return `${field} must be a string`
+  }
+  if (t.tags != null && !(Array.isArray(t.tags) && t.tags.every((tag) => typeof tag === 'string'))) {
+    return 'tags must be a list of strings'
+  }
+  return null
+}
+
+// Applies many partial updates in one statement (bulk_update_tasks in supabase-schema.sql).
+// If that function hasn't been created yet, falls back to per-row updates a few at a time.
+// It can't exist while urgency/category are missing, so then the fallback goes first.
+export async function bulkUpdateTasks(patches: TaskPatch[]) {
+  if (patches.length === 0) return { data: [] as Task[], error: null }
+
+  const missing = await missingTaskColumns()
+  if (!missing.has('urgency') && !missing.has('category')) {
+    const { data, error } = await timed('db_bulk_update', () => supabase.rpc('bulk_update_tasks', { patches }))
+    if (!error || !(error.code === 'PGRST202' || error.message?.includes('bulk_update_tasks'))) {
+      return { data: (data || []) as Task[], error }
+    }
+  }
+
+  const updates = await fitTaskRows(patches.map(({ id, ...fields }) => ({ id, ...buildTaskUpdates(fields) })))
+  const results = await mapPool(updates, 10, async ({ id, ...fields }) =>
+    timed('db_update', () => supabase.from('tasks').update(fields).eq('id', id).select().single())
+  )
+  const failed = results.find((r) => r.error)
+  return {
+    data: results.map((r) => r.data).filter(Boolean) as Task[],
+    error: failed ? failed.error : null,
+  }
+}
+
+export type UpsertResult = {
+  inserted: Task[]
+  updated: Task[]
+  skipped: number
+  error: PostgrestError | null
+}
+
+// Inserts rows and resolves source_id conflicts in the same statement (upsert_tasks in
+// supabase-schema.sql). Existing rows are left alone, or with `refresh` get their title and
+// description updated when those changed. Parallel imports can't trip the unique constraint:
+// a row another run got to first is just counted as skipped.
+export async function upsertTasks(
+  rows: Record<string, unknown>[],
+  { refresh = false }: { refresh?: boolean } = {}
+): Promise<UpsertResult> {
+  // One statement may touch each source_id only once — keep the last occurrence
+  const bySourceId = new Map<unknown, Record<string, unknown>>()
+  const unkeyed: Record<string, unknown>[] = []
+  for (const row of rows) {
+    if (row.source_id) bySourceId.set(row.source_id, row)
+    else unkeyed.push(row)
+  }
+  const unique = [...unkeyed, ...bySourceId.values()]
+  if (unique.length === 0) return { inserted: [], updated: [], skipped: rows.length, error: null }
+
+  // upsert_tasks writes urgency, category and metadata, so it can't exist while they're missing
+  const missing = await missingTaskColumns()
+  if (missing.size === 0) {
+    const { data, error } = await timed('db_upsert', () => supabase.rpc('upsert_tasks', { rows: unique, refresh }))
+    if (!error) {
+      const results = (data || []) as { task: Task; inserted: boolean }[]
+      const inserted = results.filter((r) => r.inserted).map((r) => r.task)
+      const updated = results.filter((r) => !r.inserted).map((r) => r.task)
+      return { inserted, updated, skipped: rows.length - results.length, error: null }
+    }
+    if (!(error.code === 'PGRST202' || error.message?.includes('upsert_tasks'))) {
+      return { inserted: [], updated: [], skipped: 0, error }
+    }
+  }
+
+  // Function not created yet — plain ON CONFLICT DO NOTHING, without refresh, and only
+  // the columns this database has
+  const fitted = await fitTaskRows(unique)
+  const fallback = await timed('db_upsert', () => supabase
+    .from('tasks')
+    .upsert(fitted, { onConflict: 'source_id', ignoreDuplicates: true })
+    .select())
+  const inserted = (fallback.data || []) as Task[]
+  return { inserted, updated: [], skipped: rows.length - inserted.length, error: fallback.error }
+}
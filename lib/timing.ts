@@ -0,0 +1,99 @@
+import { AsyncLocalStorage } from 'node:async_hooks'
+import { NextRequest } from 'next/server'
+
+// Per-request stage timers. Route handlers wrapped in withTiming() report every stage
+// as a Server-Timing header plus one JSON log line; code anywhere underneath (Slack,
+// OpenAI, Supabase helpers) records stages with timed() without having the timer passed
+// down. Outside a timed request timed() just runs the function.
+
+type Stage = { ms: number; count: number }
+
+export class Timing {
+  readonly started = performance.now()
+  readonly stages = new Map<string, Stage>()
+
+  constructor(readonly name: string) {}
+
+  add(stage: string, ms: number) {
+    const s = this.stages.get(stage)
+    if (s) {
+      s.ms += ms
+      s.count++
+    } else {
+      this.stages.set(stage, { ms, count: 1 })
+    }
+  }
+
+  async time<T>(stage: string, fn: () => PromiseLike<T> | T): Promise<T> {
+    const start = performance.now()
+    try {
+      return await fn()
+    } finally {
+      this.add(stage, performance.now() - start)
+    }
+  }
+
+  totalMs(): number {
+    return performance.now() - this.started
+  }
+
+  // Stages that ran concurrently (Slack history pages, OpenAI calls) add up, so a stage
+  // can exceed total; desc carries the call count
+  header(): string {
+    const parts = [...this.stages].map(([stage, { ms, count }]) =>
+      `${stage};dur=${ms.toFixed(1)}${count > 1 ? `;desc="${count} calls"` : ''}`
+    )
+    parts.push(`total;dur=${this.totalMs().toFixed(1)}`)
+    return parts.join(', ')
+  }
+
+  log(fields: Record<string, unknown> = {}) {
+    const stages: Record<string, { ms: number; count: number }> = {}
+    for (const [stage, { ms, count }] of this.stages) stages[stage] = { ms: Math.round(ms * 10) / 10, count }
+    console.log(JSON.stringify({
+      event: 'timing',
+      name: this.name,
+      ...fields,
+      total_ms: Math.round(this.totalMs() * 10) / 10,
+      stages,
+    }))
+  }
+}
+
+const storage = new AsyncLocalStorage<Timing>()
+
+export function timed<T>(stage: string, fn: () => PromiseLike<T> | T): Promise<T> {
+  const timing = storage.getStore()
+  return timing ? timing.time(stage, fn) : Promise.resolve(fn())
+}
+
+// Work with no response of its own (background import slices): stages are logged when fn settles
+export async function withTimingScope<T>(name: string, fn: () => Promise<T>, fields: Record<string, unknown> = {}): Promise<T> {
+  const timing = new Timing(name)
+  let ok = false
+  try {
+    const result = await storage.run(timing, fn)
+    ok = true
+    return result
+  } finally {
+    timing.log({ ...fields, ok })
+  }
+}
+
+export function withTiming<C>(name: string, handler: (request: NextRequest, context: C) => Promise<Response>) {
+  return async (request: NextRequest, context: C): Promise<Response> => {
+    const timing = new Timing(name)
+    const fields = { method: request.method, path: request.nextUrl.pathname }
+    let response: Response
+    try {
+      response = await storage.run(timing, () => handler(request, context))
+    } catch (err) {
+      timing.log({ ...fields, status: 500, error: err instanceof Error ? err.message : String(err) })
+      throw err
+    }
+    // Streamed bodies (NDJSON) keep going after this point, so for them it's time to first byte
+    response.headers.set('Server-Timing', timing.header())
+    timing.log({ ...fields, status: response.status })
+    return response
+  }
+}
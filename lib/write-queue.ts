@@ -0,0 +1,171 @@
+import { Task } from './supabase'
+
+type Updates = Partial<Task>
+
+const STORAGE_KEY = 'task-matrix-pending-writes'
+const RETRY_BASE_MS = 1000
+const RETRY_MAX_MS = 60_000
+// Consecutive failed batches before the queue stops retrying on its own (about two minutes
+// of backoff). The edits stay queued and stored; the next edit, reconnect or reload retries.
+const MAX_RETRIES = 8
+// Slider drags enqueue on every step; the localStorage mirror is rewritten at most this often
+const PERSIST_MS = 250
+
+export type WriteQueue = {
+  enqueue: (id: string, updates: Updates) => void
+  flush: (options?: { keepalive?: boolean }) => Promise<void>
+  overlay: (task: Task) => Task
+  busyIds: () => Set<string>
+  dispose: () => void
+}
+
+function loadStored(): Record<string, Updates> {
+  try {
+    const raw = localStorage.getItem(STORAGE_KEY)
+    return raw ? JSON.parse(raw) : {}
+  } catch {
+    return {}
+  }
+}
+
+// Write-behind queue for board edits. Repeated edits to a task are merged, held for
+// debounceMs after the last one (but never longer than maxWaitMs during a long drag) and
+// sent together as one PATCH /api/tasks/bulk. Failed batches are retried with backoff, and
+// everything not yet acknowledged is mirrored to localStorage so it survives a reload or
+// going offline. onError reports writes that were dropped or have stopped retrying, and is
+// called with null once a batch goes through again.
+export function createWriteQueue({
+  endpoint = '/api/tasks/bulk',
+  debounceMs = 800,
+  maxWaitMs = 5000,
+  onError,
+}: {
+  endpoint?: string
+  debounceMs?: number
+  maxWaitMs?: number
+  onError?: (message: string | null) => void
+} = {}): WriteQueue {
+  const pending = new Map<string, Updates>(Object.entries(loadStored()))
+  const inflight = new Map<string, Updates>()
+  let timer: ReturnType<typeof setTimeout> | null = null
+  let persistTimer: ReturnType<typeof setTimeout> | null = null
+  let firstQueuedAt = 0
+  let failures = 0
+
+  const persist = () => {
+    if (persistTimer) clearTimeout(persistTimer)
+    persistTimer = null
+    try {
+      const all: Record<string, Updates> = Object.fromEntries(inflight)
+      for (const [id, u] of pending) all[id] = { ...all[id], ...u }
+      if (Object.keys(all).length === 0) localStorage.removeItem(STORAGE_KEY)
+      else localStorage.setItem(STORAGE_KEY, JSON.stringify(all))
+    } catch {
+      console.error('Failed to save pending writes to localStorage')
+    }
+  }
+
+  const persistSoon = () => {
+    if (!persistTimer) persistTimer = setTimeout(persist, PERSIST_MS)
+  }
+
+  const schedule = (delay: number) => {
+    if (timer) clearTimeout(timer)
+    timer = setTimeout(() => {
+      timer = null
+      void flush()
+    }, delay)
+  }
+
+  const flush = async ({ keepalive = false }: { keepalive?: boolean } = {}) => {
+    if (pending.size === 0) return
+    // One batch at a time; whatever queues up meanwhile goes in the next one
+    if (inflight.size > 0 || !navigator.onLine) return
+
+    if (timer) clearTimeout(timer)
+    timer = null
+    firstQueuedAt = 0
+    for (const [id, u] of pending) inflight.set(id, u)
+    pending.clear()
+
+    let done = false
+    try {
+      const res = await fetch(endpoint, {
+        method: 'PATCH',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ tasks: [...inflight].map(([id, u]) => ({ id, ...u })) }),
+        keepalive,
+      })
+      // A 4xx won't succeed on retry either — drop it rather than loop
+      done = res.ok || (res.status >= 400 && res.status < 500)
+      if (res.ok) {
+        onError?.(null)
+      } else if (done) {
+        console.error(`Dropped ${inflight.size} task updates (${res.status})`)
+        onError?.(`${inflight.size} task ${inflight.size === 1 ? 'change was' : 'changes were'} rejected by the server (${res.status})`)
+      }
+    } catch {
+      done = false
+    }
+
+    if (done) {
+      failures = 0
+    } else {
+      // Put the batch back underneath any edits made since
+      for (const [id, u] of inflight) pending.set(id, { ...u, ...pending.get(id) })
+      failures++
+    }
+    inflight.clear()
+    persist()
+
+    if (pending.size === 0) return
+    if (done) {
+      schedule(debounceMs)
+    } else if (failures < MAX_RETRIES) {
+      schedule(Math.min(RETRY_BASE_MS * 2 ** (failures - 1), RETRY_MAX_MS))
+    } else {
+      onError?.(`Couldn't save ${pending.size} task ${pending.size === 1 ? 'change' : 'changes'} — kept in this browser and retried on your next edit`)
+    }
+  }
+
+  const enqueue = (id: string, updates: Updates) => {
+    pending.set(id, { ...pending.get(id), ...updates })
+    persistSoon()
+    // Past the retry cap a new edit starts a fresh round; below it a retry is already scheduled
+    if (failures >= MAX_RETRIES) failures = 0
+    if (failures > 0) return
+
+    const now = Date.now()
+    if (!firstQueuedAt) firstQueuedAt = now
+    schedule(Math.min(debounceMs, Math.max(0, firstQueuedAt + maxWaitMs - now)))
+  }
+
+  const onOnline = () => { void flush() }
+  const onHide = () => {
+    if (document.visibilityState !== 'hidden') return
+    persist() // the page may not come back
+    void flush({ keepalive: true })
+  }
+  window.addEventListener('online', onOnline)
+  document.addEventListener('visibilitychange', onHide)
+
+  // Edits left over from an earlier session or an offline spell
+  if (pending.size > 0) schedule(0)
+
+  return {
+    enqueue,
+    flush,
+    overlay: (task) => {
+      const queued = { ...inflight.get(task.id), ...pending.get(task.id) }
+      return Object.keys(queued).length > 0 ? { ...task, ...queued } : task
+    },
+    busyIds: () => new Set([...pending.keys(), ...inflight.keys()]),
+    dispose: () => {
+      if (timer) clearTimeout(timer)
+      timer = null
+      persist()
+      window.removeEventListener('online', onOnline)
+      document.removeEventListener('visibilitychange', onHide)
+    },
+  }
+}
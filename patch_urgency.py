@@ -3,121 +3,133 @@
 After running the Supabase SQL migration, run this script to set
 the correct urgency and category on every task.
 
-Usage: python3 patch_urgency.py
+The ground truth is the seed file add_tasks.py loads (JSONL or CSV, streamed).
+Titles are matched case- and whitespace-insensitively (see taskmatrix/sync.py);
+titles that were edited on the board since are found by trigram similarity in
+the database (--exact turns that off). Only the rows that differ from the seed
+are sent, batched through PATCH /api/tasks/bulk. Set API_BASE to target
+another deployment (default: https://agency-task-matrix.vercel.app);
+--profile reports request latency and server stage timings at the end.
+
+Usage: python3 patch_urgency.py [FILE | -] [--format jsonl|csv] [--category PREFIX]
+                                [--batch-size 500] [--min-similarity 0.6] [--exact] [--profile]
 """
 
-import json
-import urllib.request
-import time
-
-API_BASE = "https://agency-task-matrix.vercel.app/api/tasks"
-
-# Ground truth: title → (urgency, category)
-TASK_META = {
-    "Remove Andre from ListKit flows → switch to support.listkit.io": ("today", "Client Work > ListKit"),
-    "Send ListKit KPI report (this week + next week agenda)": ("today", "Client Work > ListKit"),
-    "Resume ListKit daily email broadcasts": ("today", "Client Work > ListKit"),
-    "Send ListKit free trial flow weekly analytics": ("today", "Client Work > ListKit"),
-    "Remove false social proof claims from Atlas emails": ("today", "Client Work > Atlas"),
-    "Send Atlas weekly report + revised campaigns": ("today", "Client Work > Atlas"),
-    "Fix first two Atlas email flows (copy + flow logic)": ("today", "Client Work > Atlas"),
-    "Follow up with all past sales calls (last month)": ("today", "Sales"),
-    "Set up hiring meetings with Shimon and Mojo (Editor roles)": ("today", "Hiring"),
-    "Respond to all past cold email replies": ("today", "Marketing > Cold Email"),
-    "Scrub email lists for ListKit": ("this_week", "Client Work > ListKit"),
-    "Write ListKit 30-email broadcast": ("this_week", "Client Work > ListKit"),
-    "Launch ListKit win-back campaign with A/B test": ("this_week", "Client Work > ListKit"),
-    "Reschedule ListKit recurring call to Tuesdays 4pm UK": ("this_week", "Client Work > ListKit"),
-    "Book onboarding call with Mohammed at Tunzilla": ("this_week", "Client Work > Tunzilla"),
-    "Go through Tunzilla onboarding form": ("this_week", "Client Work > Tunzilla"),
-    "Put together timeline and delivery plan for Tunzilla": ("this_week", "Client Work > Tunzilla"),
-    "Create new third email flow for Atlas": ("this_week", "Client Work > Atlas"),
-    "Improve design across all Atlas email flows": ("this_week", "Client Work > Atlas"),
-    "Fix dead links in Atlas emails (Discord links)": ("this_week", "Client Work > Atlas"),
-    "Update CRM pipeline for all active leads": ("this_week", "Sales"),
-    "Send meeting follow-up emails to all prospects": ("this_week", "Sales"),
-    "Review Contra applications for landing page designer": ("this_week", "Hiring"),
-    "Send copywriter test tasks to two candidates": ("this_week", "Hiring"),
-    "Plan ListKit email engine launch campaign": ("whenever", "Client Work > ListKit"),
-    "Script confirmation page videos for ads funnel": ("whenever", "Marketing > Funnel"),
-    "Script VSL for the funnel": ("whenever", "Marketing > Funnel"),
-    "Build confirmation page in ClickFunnels": ("whenever", "Marketing > Funnel"),
-    "Set up Facebook pixel standard event code in ClickFunnels": ("whenever", "Marketing > Funnel"),
-    "Scrape and set up cold email campaign for Airr Digital agency prospects": ("whenever", "Marketing > Cold Email"),
-    "Scrape and set up cold email campaign for Airr Digital SaaS prospects": ("whenever", "Marketing > Cold Email"),
-    "Buy inboxes from Scaled Mail and set up Haven.io outreach": ("whenever", "Marketing > Cold Email"),
-    "Vibe-code a landing page/website for Haven.io": ("whenever", "Marketing > Cold Email"),
-    "Map out full client delivery process for paid ads offer": ("whenever", "Systems"),
-    "Set up onboarding system for agency paid ads clients": ("whenever", "Systems"),
-    "Update Airtable to support paid ads client tracking": ("whenever", "Systems"),
-    "Map out weekly marketing metrics dashboard": ("whenever", "Systems"),
-    "Create sales process + pitch deck for agency clients": ("whenever", "Sales"),
-    "Create sales process + pitch deck for SaaS clients": ("whenever", "Sales"),
-    "Set up daily Twitter posting system": ("whenever", "Content"),
-    "Book call with Starborn.ai about LinkedIn content management": ("whenever", "Content"),
-    "Book calls with other LinkedIn content agencies": ("whenever", "Content"),
-    "Launch YouTube channel (3 videos/week — SaaS GTM content)": ("whenever", "Content"),
-    "Film new video for STR application (LinkedIn recruitment)": ("whenever", "Hiring"),
-    "Update Gamma doc with LinkedIn applicant tracking": ("whenever", "Hiring"),
-}
-
-
-def fetch_tasks():
-    req = urllib.request.Request(f"{API_BASE}?status=active")
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        return json.loads(resp.read())
-
-
-def patch_task(task_id: str, urgency: str, category: str):
-    payload = json.dumps({"urgency": urgency, "category": category}).encode()
-    req = urllib.request.Request(
-        f"{API_BASE}/{task_id}",
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="PUT",
-    )
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        return json.loads(resp.read())
+import argparse
+import os
+
+from taskmatrix import APIError, Profile, TaskIndex, TaskMatrixClient, in_category
+from taskmatrix.seed import batched, read_seed
+from taskmatrix.sync import INSERT, UNCHANGED, UPDATE, iter_fuzzy, iter_sync
+
+API_BASE = os.environ.get("API_BASE", "https://agency-task-matrix.vercel.app").rstrip("/")
+API_URL = f"{API_BASE}/api/tasks"
+SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed", "agency-tasks.jsonl")
+FIELDS = ("urgency", "category")
+
+
+def fetch_tasks(api: TaskMatrixClient, category_prefix=None) -> TaskIndex:
+    filters = {"category_prefix": category_prefix} if category_prefix else {}
+    return TaskIndex(api.iter_tasks(fields=("id", "title", "urgency", "category"), **filters))
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Set urgency and category on every known task.")
+    parser.add_argument("seed", nargs="?", default=SEED_FILE,
+                        help='JSONL or CSV file, or "-" for stdin (default: seed/agency-tasks.jsonl)')
+    parser.add_argument("--format", choices=("jsonl", "csv"),
+                        help="seed format (default: from the file extension; stdin is JSONL)")
+    parser.add_argument("--category", metavar="PREFIX",
+                        help='only patch tasks filed under this category subtree, e.g. "Client Work"')
+    parser.add_argument("--batch-size", type=int, default=500, help="rows per PATCH request (default: 500)")
+    parser.add_argument("--min-similarity", type=float, default=0.6,
+                        help="trigram similarity a renamed title needs to count as a match (default: 0.6)")
+    parser.add_argument("--exact", action="store_true", help="match titles exactly; no fuzzy lookup")
+    parser.add_argument("--profile", action="store_true",
+                        help="report request latency per endpoint and server stage timings")
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    profile = Profile() if args.profile else None
+    api = TaskMatrixClient(API_URL, timeout=60, profile=profile)
     print("Fetching tasks from API...")
-    tasks = fetch_tasks()
+    tasks = fetch_tasks(api, args.category)
     print(f"Found {len(tasks)} active tasks\n")
 
+    def specs():
+        for line, task, error in read_seed(args.seed, args.format):
+            if error is not None:
+                print(f"  ❌ Line {line} invalid: {error}")
+                continue
+            if args.category and not in_category(task.get("category"), args.category):
+                continue
+            yield {k: task[k] for k in ("title", "urgency", "category") if k in task}
+
     matched = 0
-    skipped = 0
+    unchanged = 0
     failed = []
 
-    for task in tasks:
-        title = task.get("title", "")
-        if title not in TASK_META:
-            skipped += 1
-            continue
-
-        urgency, category = TASK_META[title]
-        current_urgency = task.get("urgency", "whenever")
-        current_category = task.get("category")
-
-        if current_urgency == urgency and current_category == category:
-            print(f"  ✓ Already correct: {title[:55]}")
-            matched += 1
+    def fuzzy_lookup(titles):
+        try:
+            return api.match_titles(titles, args.min_similarity, status="active")
+        except APIError as e:
+            if e.status != 501:
+                raise
+            print("  ⚠️  Fuzzy matching isn't set up on the server — exact titles only")
+            return [{"task": None} for _ in titles]
+
+    def updates():
+        nonlocal unchanged
+        claimed = set()
+        unmatched = []
+        for kind, spec, detail in iter_sync(specs(), tasks, fields=FIELDS):
+            if kind == UPDATE:
+                claimed.add(detail["id"])
+                yield spec, detail
+            elif kind == UNCHANGED:
+                claimed.add(detail["id"])
+                print(f"  ✓ Already correct: {spec['title'][:55]}")
+                unchanged += 1
+            elif kind == INSERT and not args.exact:
+                unmatched.append(spec)
+
+        # Titles edited on the board since the seed was written: look them up by trigram
+        # similarity in the database instead of letting them drop out
+        for kind, spec, detail, match in iter_fuzzy(unmatched, fuzzy_lookup, FIELDS, claimed):
+            if kind == INSERT:
+                continue
+            remote = match["task"]
+            if args.category and not in_category(remote.get("category"), args.category):
+                continue
+            print(f"  ≈ {spec['title'][:50]} → \"{remote['title'][:50]}\" ({match['similarity']:.2f})")
+            if kind == UPDATE:
+                yield spec, detail
+            else:
+                unchanged += 1
+
+    for chunk in batched(updates(), args.batch_size):
+        try:
+            api.bulk_update([patch for _, patch in chunk])
+        except (APIError, OSError) as e:
+            for spec, _ in chunk:
+                print(f"  ❌ FAILED: {spec['title'][:50]} — {e}")
+                failed.append(spec["title"])
             continue
 
-        try:
-            patch_task(task["id"], urgency, category)
+        for spec, _ in chunk:
+            urgency = spec.get("urgency", "")
             icon = {"today": "🔴", "this_week": "🟡", "whenever": "⚪"}.get(urgency, "⚪")
-            print(f"  {icon} Patched [{urgency:9}] {title[:50]}")
+            print(f"  {icon} Patched [{urgency:9}] {spec['title'][:50]}")
             matched += 1
-            time.sleep(0.2)
-        except Exception as e:
-            print(f"  ❌ FAILED: {title[:50]} — {e}")
-            failed.append(title)
 
-    print(f"\n✅ {matched} patched | {skipped} skipped (not our tasks) | {len(failed)} failed")
+    skipped = len(tasks) - matched - unchanged - len(failed)
+    print(f"\n✅ {matched + unchanged} patched | {skipped} skipped (not our tasks) | {len(failed)} failed")
     if failed:
         print("\nFailed:")
         for t in failed: print(f"  - {t}")
+    if profile:
+        print(f"\n{profile.report()}")
 
 
 if __name__ == "__main__":
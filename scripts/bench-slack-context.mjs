@@ -0,0 +1,85 @@
+// Micro-benchmark for the Slack context builder in lib/slack-context.ts.
+// Run: npm run bench:slack-context
+//
+// Times gatherContext() on synthetic channels of growing size next to the old
+// per-message filter, and checks both pick the same context. Cost per message
+// should stay flat for gatherContext while the old approach grows with n.
+
+import { readFile } from 'node:fs/promises'
+import ts from 'typescript'
+
+const source = await readFile(new URL('../lib/slack-context.ts', import.meta.url), 'utf8')
+const { outputText } = ts.transpileModule(source, {
+  compilerOptions: { module: ts.ModuleKind.ESNext, target: ts.ScriptTarget.ES2020 },
+})
+const { gatherContext, DEFAULT_CONTEXT_WINDOW } = await import(
+  `data:text/javascript,${encodeURIComponent(outputText)}`
+)
+
+// The previous implementation: rescan the whole channel for every target
+function legacyContext(messages, targets) {
+  const contexts = new Map()
+  for (const msg of targets) {
+    const msgTs = parseFloat(msg.ts)
+    contexts.set(
+      msg,
+      messages
+        .filter((m) => {
+          const t = parseFloat(m.ts)
+          return t >= msgTs - 120 && t <= msgTs + 30 && !m.bot_id && m.text
+        })
+        .slice(0, 4)
+    )
+  }
+  return contexts
+}
+
+// Newest-first like conversations.history; ~20s between messages, 1 in 3 actionable
+function syntheticChannel(n) {
+  const messages = []
+  let ts = 1_700_000_000
+  for (let i = 0; i < n; i++) {
+    ts += 1 + Math.floor(Math.random() * 40)
+    messages.push({
+      ts: `${ts}.${String(i % 1_000_000).padStart(6, '0')}`,
+      text: i % 3 === 0 ? `can you look at item ${i}?` : `update ${i}`,
+      user: `U${i % 25}`,
+      ...(i % 17 === 0 ? { bot_id: 'B1' } : {}),
+    })
+  }
+  return messages.reverse()
+}
+
+function time(fn) {
+  const start = process.hrtime.bigint()
+  const result = fn()
+  return { result, ms: Number(process.hrtime.bigint() - start) / 1e6 }
+}
+
+const LEGACY_LIMIT = 8_000
+
+console.log('messages   gatherContext      ns/msg   legacy filter      ns/msg')
+for (const n of [1_000, 2_000, 4_000, 8_000, 32_000, 128_000, 512_000]) {
+  const messages = syntheticChannel(n)
+  const targets = messages.filter((m) => !m.bot_id && m.text.includes('?'))
+
+  const fast = time(() => gatherContext(messages, targets, DEFAULT_CONTEXT_WINDOW))
+  let legacy = null
+  if (n <= LEGACY_LIMIT) {
+    legacy = time(() => legacyContext(messages, targets))
+    for (const t of targets) {
+      const a = fast.result.get(t).map((m) => m.ts).join()
+      const b = legacy.result.get(t).map((m) => m.ts).join()
+      if (a !== b) throw new Error(`Context mismatch for ${t.ts}: ${a} vs ${b}`)
+    }
+  }
+
+  const row = [
+    String(n).padStart(8),
+    `${fast.ms.toFixed(1)} ms`.padStart(16),
+    ((fast.ms * 1e6) / n).toFixed(0).padStart(11),
+    legacy ? `${legacy.ms.toFixed(1)} ms`.padStart(16) : '—'.padStart(16),
+    legacy ? ((legacy.ms * 1e6) / n).toFixed(0).padStart(11) : '—'.padStart(11),
+  ]
+  console.log(row.join(' '))
+}
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Load test for add_tasks.py and patch_urgency.py against the local API stub.
+Run: python3 scripts/bench_tasks.py [--sizes 10,1000,100000] [--workloads seed,patch]
+                                    [--latency-ms 20] [--jitter-ms 0]
+                                    [--failure-rate 0] [--throttle-rate 0]
+                                    [--record | --baseline FILE]
+
+For every size a synthetic seed file is generated, the stub in
+scripts/task_api_stub.py is emptied, and the real scripts run against it as
+subprocesses:
+
+  seed   add_tasks.py --bulk on an empty board
+  patch  patch_urgency.py on a copy of the seed with half the urgencies changed
+         and one title in a thousand reworded (so fuzzy matching runs too)
+
+Each run reports rows/s, p50/p99 request latency as the client saw it
+(retries and backoff included) and the script's peak RSS. --record saves the
+results as the baseline (scripts/bench_tasks_baseline.json); later runs with
+the same settings print the change against it.
+
+--api-base runs against another deployment instead of the stub. That writes
+real rows and can't empty the board between sizes, so point it at a scratch
+database.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import runpy
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB = os.path.join(ROOT, "scripts", "task_api_stub.py")
+BASELINE = os.path.join(ROOT, "scripts", "bench_tasks_baseline.json")
+WORKLOADS = ("seed", "patch")
+
+VERBS = ("Review", "Draft", "Send", "Fix", "Schedule", "Update", "Audit", "Migrate", "Plan", "Ship",
+         "Follow up on", "Clean up", "Document", "Test", "Set up")
+OBJECTS = ("KPI report", "onboarding flow", "email broadcast", "landing page", "invoice", "contract",
+           "ad creatives", "CRM pipeline", "lead list", "weekly agenda", "Slack digest", "retention cohort",
+           "pricing page", "case study", "webhook integration")
+CLIENTS = ("ListKit", "Acme", "Northwind", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne",
+           "Wonka", "Tyrell", "Cyberdyne", "Soylent", "Vandelay", "Pied Piper")
+AREAS = ("Client Work", "Growth", "Ops")
+URGENCIES = ("today", "this_week", "whenever")
+
+sys.path.insert(0, ROOT)
+from taskmatrix.profile import percentile  # noqa: E402  (same nearest-rank as --profile)
+
+
+# ─── Workload data ───────────────────────────────────────────────────────────
+
+def write_seeds(n: int, directory: str) -> tuple:
+    """Write seed-<n>.jsonl and patch-<n>.jsonl; returns their paths."""
+    rng = random.Random(n)
+    seed_path = os.path.join(directory, f"seed-{n}.jsonl")
+    patch_path = os.path.join(directory, f"patch-{n}.jsonl")
+    with open(seed_path, "w", encoding="utf-8") as seed, open(patch_path, "w", encoding="utf-8") as patch:
+        for i in range(n):
+            client = rng.choice(CLIENTS)
+            task = {
+                "title": f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} for {client} #{i + 1}",
+                "description": f"Synthetic benchmark task {i + 1}.",
+                "urgency": rng.choice(URGENCIES),
+                "category": f"{rng.choice(AREAS)} > {client}",
+                "leverage": rng.randint(1, 10),
+                "effort": rng.randint(1, 10),
+            }
+            seed.write(json.dumps(task) + "\n")
+            if i % 2 == 0:
+                task["urgency"] = URGENCIES[(URGENCIES.index(task["urgency"]) + 1) % len(URGENCIES)]
+            if i % 1000 == 999:
+                task["title"] += " (follow-up)"
+            patch.write(json.dumps(task) + "\n")
+    return seed_path, patch_path
+
+
+# ─── Stub ────────────────────────────────────────────────────────────────────
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub(args) -> tuple:
+    """Start task_api_stub.py on a free port; returns (process, api_base)."""
+    port = _free_port()
+    env = dict(os.environ,
+               STUB_PORT=str(port),
+               STUB_LATENCY_MS=str(args.latency_ms),
+               STUB_JITTER_MS=str(args.jitter_ms),
+               STUB_FAILURE_RATE=str(args.failure_rate),
+               STUB_THROTTLE_RATE=str(args.throttle_rate))
+    proc = subprocess.Popen([sys.executable, STUB], env=env, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            if proc.poll() is not None or time.monotonic() > deadline:
+                proc.kill()
+                raise SystemExit("❌ The API stub didn't start")
+            time.sleep(0.05)
+
+
+def reset_stub(api_base: str):
+    host = api_base.split("://", 1)[1]
+    conn = http.client.HTTPConnection(host, timeout=30)
+    try:
+        conn.request("POST", "/__bench/reset")
+        conn.getresponse().read()
+    finally:
+        conn.close()
+
+
+# ─── Measuring ───────────────────────────────────────────────────────────────
+
+def run_traced(trace_path: str, script: str, argv: list):
+    """Child side: run script as __main__, timing every API request it makes."""
+    from taskmatrix.client import TaskMatrixClient
+
+    samples = []
+    send = TaskMatrixClient._open
+
+    def timed(self, method, path, body=None, headers=None):
+        started = time.perf_counter()
+        try:
+            return send(self, method, path, body, headers)
+        finally:
+            samples.append((method, path.split("?")[0], time.perf_counter() - started))
+
+    TaskMatrixClient._open = timed
+    sys.argv = [script, *argv]
+    try:
+        runpy.run_path(script, run_name="__main__")
+    finally:
+        with open(trace_path, "w") as f:
+            json.dump(samples, f)
+
+
+def measure(script: str, argv: list, api_base: str, rows: int, log_path: str) -> dict:
+    """Run one workload in a subprocess and collect its throughput, latency and peak memory."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as trace:
+        trace_path = trace.name
+    env = dict(os.environ, API_BASE=api_base, PYTHONUNBUFFERED="1")
+    try:
+        with open(log_path, "w", encoding="utf-8") as log:
+            started = time.perf_counter()
+            proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--trace", trace_path,
+                                     os.path.join(ROOT, script), *argv],
+                                    cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+            # wait4 returns this child's own rusage, so ru_maxrss is its peak RSS alone
+            _, status, usage = os.wait4(proc.pid, 0)
+            elapsed = time.perf_counter() - started
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        try:
+            with open(trace_path) as f:
+                samples = json.load(f)
+        except (OSError, ValueError):
+            samples = []
+    finally:
+        os.unlink(trace_path)
+
+    latencies = [s[2] * 1000 for s in samples]
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(rows / elapsed, 1) if elapsed else None,
+        "requests": len(samples),
+        "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 1) if latencies else None,
+        "peak_mb": round(peak_mb, 1),
+        "exit": proc.returncode,
+    }
+
+
+# ─── Report ──────────────────────────────────────────────────────────────────
+
+def _delta(now, then, higher_is_better: bool) -> str:
+    if not now or not then:
+        return ""
+    change = (now - then) / then * 100
+    better = change > 0 if higher_is_better else change < 0
+    return f" ({'+' if change >= 0 else ''}{change:.0f}%{' ✓' if better and abs(change) >= 5 else ''})"
+
+
+def print_row(name: str, result: dict, previous: dict = None):
+    previous = previous or {}
+    fmt = lambda v, spec: "—" if v is None else format(v, spec)  # noqa: E731
+    print(f"  {name:<14}{result['rows']:>8}  {result['seconds']:>8.2f}s  "
+          f"{fmt(result['rows_per_s'], '>9.1f')}{_delta(result['rows_per_s'], previous.get('rows_per_s'), True):<9}"
+          f"{result['requests']:>7}  {fmt(result['p50_ms'], '>7.1f')}  "
+          f"{fmt(result['p99_ms'], '>7.1f')}{_delta(result['p99_ms'], previous.get('p99_ms'), False):<9}"
+          f"{result['peak_mb']:>7.1f}{_delta(result['peak_mb'], previous.get('peak_mb'), False)}"
+          + ("" if result["exit"] == 0 else f"  ❌ exit {result['exit']}"))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--trace":
+        run_traced(sys.argv[2], sys.argv[3], sys.argv[4:])
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark the seed and patch scripts against a local API stub.")
+    parser.add_argument("--sizes", default="10,1000,100000", help="comma-separated task counts (default: 10,1000,100000)")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="seed, patch or both (default: seed,patch)")
+    parser.add_argument("--latency-ms", type=float, default=20, help="stub latency per request (default: 20)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="extra random latency, up to this much (default: 0)")
+    parser.add_argument("--failure-rate", type=float, default=0, help="share of requests answered 500 (default: 0)")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="share of requests answered 429 (default: 0)")
+    parser.add_argument("--api-base", help="benchmark this deployment instead of the stub (writes real rows)")
+    parser.add_argument("--record", action="store_true", help="save the results as the baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file to compare against / record to")
+    parser.add_argument("--keep", action="store_true", help="keep the generated seeds and script output")
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    except ValueError:
+        parser.error("--sizes must be comma-separated integers")
+    workloads = [w.strip() for w in args.workloads.split(",") if w.strip()]
+    if not sizes or any(n < 1 for n in sizes):
+        parser.error("--sizes must be positive")
+    if not workloads or any(w not in WORKLOADS for w in workloads):
+        parser.error(f"--workloads must be drawn from {', '.join(WORKLOADS)}")
+
+    config = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "failure_rate": args.failure_rate,
+              "throttle_rate": args.throttle_rate, "api": "remote" if args.api_base else "stub"}
+    baseline = {}
+    if not args.record and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            recorded = json.load(f)
+        if recorded.get("config") == config:
+            baseline = recorded.get("results", {})
+        else:
+            print(f"⚠️  {os.path.relpath(args.baseline)} was recorded with different settings — not comparing\n")
+
+    stub = None
+    api_base = args.api_base.rstrip("/") if args.api_base else None
+    if api_base is None:
+        stub, api_base = start_stub(args)
+    workdir = tempfile.mkdtemp(prefix="taskmatrix-bench-")
+    results = {}
+    try:
+        print(f"API {api_base} — latency {args.latency_ms:g}ms (+{args.jitter_ms:g}), "
+              f"failure rate {args.failure_rate}, throttle rate {args.throttle_rate}\n")
+        print(f"  {'workload':<14}{'rows':>8}  {'time':>9}  {'rows/s':>9}{'':<9}{'reqs':>7}  "
+              f"{'p50 ms':>7}  {'p99 ms':>7}{'':<9}{'peak MB':>7}")
+        for n in sizes:
+            seed_path, patch_path = write_seeds(n, workdir)
+            if stub:
+                reset_stub(api_base)
+            runs = [("seed", "add_tasks.py", [seed_path, "--bulk"]),
+                    ("patch", "patch_urgency.py", [patch_path])]
+            # patch needs the seeded board, so seed always runs; it's only reported when asked for
+            for name, script, argv in runs:
+                if name not in workloads and name != "seed":
+                    continue
+                result = measure(script, argv, api_base, n, os.path.join(workdir, f"{name}-{n}.log"))
+                key = f"{name}/{n}"
+                if name in workloads:
+                    results[key] = result
+                    print_row(key, result, baseline.get(key))
+                if result["exit"] != 0:
+                    print(f"     see {os.path.join(workdir, f'{name}-{n}.log')}")
+                    args.keep = True
+    finally:
+        if stub:
+            stub.terminate()
+            stub.wait()
+        if not args.keep:
+            for name in os.listdir(workdir):
+                os.unlink(os.path.join(workdir, name))
+            os.rmdir(workdir)
+
+    if args.record:
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "python": sys.version.split()[0], "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline saved to {os.path.relpath(args.baseline)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+// Minimal stand-in for the OpenAI chat completions API, for exercising the Slack
+// import's overview generation without network access or API spend.
+//
+// Run:  node scripts/openai-stub.mjs
+// Then: OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8787/v1 npm run dev
+//
+// STUB_PORT (default 8787), STUB_LATENCY_MS (default 800) and STUB_FAILURE_RATE
+// (0–1, default 0) shape the responses. Every completed request is logged so
+// concurrency and cache hits can be checked from the output.
+
+import { createServer } from 'node:http'
+
+const port = Number(process.env.STUB_PORT) || 8787
+const latency = Number(process.env.STUB_LATENCY_MS ?? 800)
+const failureRate = Number(process.env.STUB_FAILURE_RATE) || 0
+
+let inFlight = 0
+let served = 0
+
+createServer((req, res) => {
+  if (req.method !== 'POST' || !req.url?.endsWith('/chat/completions')) {
+    res.writeHead(404).end()
+    return
+  }
+
+  let body = ''
+  req.on('data', (chunk) => { body += chunk })
+  req.on('end', () => {
+    inFlight++
+    setTimeout(() => {
+      inFlight--
+      served++
+      if (Math.random() < failureRate) {
+        res.writeHead(500, { 'Content-Type': 'application/json' })
+        res.end(JSON.stringify({ error: { message: 'stub failure' } }))
+        return
+      }
+      const prompt = JSON.parse(body).messages?.at(-1)?.content || ''
+      const message = prompt.split('Message:\n')[1]?.split('\n')[0] || ''
+      console.log(`#${served} (${inFlight} in flight) ${message.slice(0, 60)}`)
+      res.writeHead(200, { 'Content-Type': 'application/json' })
+      res.end(JSON.stringify({
+        id: `chatcmpl-stub-${served}`,
+        object: 'chat.completion',
+        created: Math.floor(Date.now() / 1000),
+        model: 'gpt-4o-mini',
+        choices: [{
+          index: 0,
+          finish_reason: 'stop',
+          message: { role: 'assistant', content: `Stub overview: ${message.slice(0, 80)}` },
+        }],
+      }))
+    }, latency)
+  })
+}).listen(port, '127.0.0.1', () => {
+  console.log(`OpenAI stub on http://127.0.0.1:${port}/v1 (latency ${latency}ms, failure rate ${failureRate})`)
+})
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+In-memory stand-in for the Task Matrix API, for running add_tasks.py,
+patch_urgency.py and scripts/bench_tasks.py without a deployment or database.
+
+Run:  python3 scripts/task_api_stub.py
+Then: API_BASE=http://127.0.0.1:8788 python3 add_tasks.py --bulk
+
+Serves /api/tasks (JSON and NDJSON), /api/tasks/{id}, /api/tasks/bulk,
+/api/tasks/match and the import job routes with the same request and
+response shapes as the Next.js routes. STUB_PORT (default 8788),
+STUB_LATENCY_MS (default 0), STUB_JITTER_MS (default 0), STUB_FAILURE_RATE
+(0–1, answered with a 500) and STUB_THROTTLE_RATE (0–1, answered with a 429
+and Retry-After) shape the responses. POST /__bench/reset empties the store.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskmatrix.sync import in_category  # noqa: E402
+
+PORT = int(os.environ.get("STUB_PORT") or 8788)
+LATENCY = float(os.environ.get("STUB_LATENCY_MS") or 0) / 1000
+JITTER = float(os.environ.get("STUB_JITTER_MS") or 0) / 1000
+FAILURE_RATE = float(os.environ.get("STUB_FAILURE_RATE") or 0)
+THROTTLE_RATE = float(os.environ.get("STUB_THROTTLE_RATE") or 0)
+RETRY_AFTER = "0.1"
+
+STREAM_CHUNK = 1000
+MAX_MATCH_TITLES = 1000
+IMPORT_ROWS = 120
+IMPORT_STEP = 40
+
+UPDATABLE_FIELDS = ("title", "description", "leverage", "effort", "urgency", "category", "status", "tags")
+_WORD = re.compile(r"[^\W_]+")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def trigrams(text: str) -> set:
+    """pg_trgm's trigrams: lowercase words padded with two spaces before, one after."""
+    grams = set()
+    for word in _WORD.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class Store:
+    """Tasks in insertion order, plus the source_id and trigram indexes the routes need."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.tasks = {}
+        self.by_source_id = {}
+        self.by_trigram = defaultdict(set)
+        self.grams = {}
+        self.jobs = {}
+        # Scripted faults for tests, served one per request ahead of the routes:
+        # {"status": 429, "headers": {...}} answers with that status, {"drop": True}
+        # serves the request and then closes the keep-alive connection without saying so,
+        # {"delay": seconds} serves it late (past a client timeout, say)
+        self.faults = deque()
+
+    def _index_title(self, task):
+        old = self.grams.pop(task["id"], ())
+        for g in old:
+            self.by_trigram[g].discard(task["id"])
+        grams = trigrams(task["title"])
+        for g in grams:
+            self.by_trigram[g].add(task["id"])
+        self.grams[task["id"]] = grams
+
+    def insert(self, fields: dict) -> dict:
+        now = _now()
+        task = {
+            "id": str(uuid.uuid4()),
+            "title": fields.get("title"),
+            "description": fields.get("description") or None,
+            "source": fields.get("source") or "manual",
+            "source_id": fields.get("source_id") or None,
+            "leverage": fields.get("leverage", 5),
+            "effort": fields.get("effort", 5),
+            "urgency": fields.get("urgency") or "whenever",
+            "category": fields.get("category") or None,
+            "status": fields.get("status") or "active",
+            "context_url": fields.get("context_url") or None,
+            "tags": fields.get("tags") or [],
+            "metadata": {},
+            "created_at": now,
+            "updated_at": now,
+            "completed_at": None,
+        }
+        self.tasks[task["id"]] = task
+        if task["source_id"]:
+            self.by_source_id[task["source_id"]] = task
+        self._index_title(task)
+        return task
+
+    def update(self, task_id: str, fields: dict):
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        for name in UPDATABLE_FIELDS:
+            if name in fields:
+                task[name] = fields[name]
+        # Like bulk_update_tasks: only completing a task stamps completed_at
+        if fields.get("status") == "completed":
+            task["completed_at"] = _now()
+        task["updated_at"] = _now()
+        if "title" in fields:
+            self._index_title(task)
+        return task
+
+    def delete(self, task_id: str) -> bool:
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            return False
+        if task["source_id"]:
+            self.by_source_id.pop(task["source_id"], None)
+        for g in self.grams.pop(task_id, ()):
+            self.by_trigram[g].discard(task_id)
+        return True
+
+    def match(self, title: str, min_similarity: float, status: str):
+        """Closest task by trigram similarity, like match_task_titles() in the schema."""
+        query = trigrams(title)
+        if not query:
+            return None, None
+        # Prefix filter: a task scoring >= min_similarity must contain at least one of
+        # the len - ceil(min·len) + 1 rarest query trigrams, so only those are scanned
+        rarest = sorted(query, key=lambda g: len(self.by_trigram.get(g, ())))
+        needed = len(query) - math.ceil(min_similarity * len(query) - 1e-9) + 1
+        candidates = set()
+        for g in rarest[:max(1, needed)]:
+            candidates.update(self.by_trigram.get(g, ()))
+
+        best, best_sim = None, 0.0
+        for task_id in candidates:
+            task = self.tasks[task_id]
+            if status != "all" and task["status"] != status:
+                continue
+            grams = self.grams[task_id]
+            shared = len(query & grams)
+            sim = shared / (len(query) + len(grams) - shared)
+            if sim > best_sim:
+                best, best_sim = task, sim
+        if best is None or best_sim < min_similarity:
+            return None, None
+        return best, round(best_sim, 4)
+
+
+STORE = Store()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "TaskMatrixStub/1.0"
+
+    def log_message(self, *args):
+        pass
+
+    def end_headers(self):
+        # Server-Timing like the real routes, so --profile has stages to show: the
+        # simulated latency and the whole request as seen by the stub
+        started = getattr(self, "_started", None)
+        if started is not None:
+            total = (time.perf_counter() - started) * 1000
+            self.send_header("Server-Timing", f"latency;dur={self._latency_ms:.1f}, total;dur={total:.1f}")
+            self._started = None
+        super().end_headers()
+
+    # ─── Responses ───────────────────────────────────────────────────────────
+
+    def _send(self, status: int, body: bytes, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, obj, headers=None):
+        self._send(status, json.dumps(obj).encode("utf-8"), headers=headers)
+
+    def _stream(self, rows):
+        """NDJSON in chunked encoding, a chunk per STREAM_CHUNK rows like the paged route."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(rows), STREAM_CHUNK):
+            data = "".join(json.dumps(r) + "\n" for r in rows[start:start + STREAM_CHUNK]).encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            return None
+
+    # ─── Dispatch ────────────────────────────────────────────────────────────
+
+    def _handle(self, method: str):
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        body = self._body() if method in ("POST", "PUT", "PATCH") else None
+
+        if parts == ["__bench", "reset"] and method == "POST":
+            with STORE.lock:
+                STORE.reset()
+            return self._json(200, {"success": True})
+
+        self._started = time.perf_counter()
+        self._latency_ms = 0.0
+        if LATENCY or JITTER:
+            delay = LATENCY + random.uniform(0, JITTER)
+            self._latency_ms = delay * 1000
+            time.sleep(delay)
+        with STORE.lock:
+            fault = STORE.faults.popleft() if STORE.faults else {}
+        if "status" in fault:
+            return self._json(fault["status"], {"error": "stub fault"}, fault.get("headers"))
+        if fault.get("drop"):
+            self.close_connection = True
+        if "delay" in fault:
+            time.sleep(fault["delay"])
+        if THROTTLE_RATE and random.random() < THROTTLE_RATE:
+            return self._json(429, {"error": "stub throttle"}, {"Retry-After": RETRY_AFTER})
+        if FAILURE_RATE and random.random() < FAILURE_RATE:
+            return self._json(500, {"error": "stub failure"})
+        if body is None and method in ("POST", "PUT", "PATCH"):
+            return self._json(400, {"error": "Invalid JSON"})
+
+        route = {
+            ("GET", "api/tasks"): self.list_tasks,
+            ("POST", "api/tasks"): self.create_task,
+            ("POST", "api/tasks/bulk"): self.bulk_create,
+            ("PATCH", "api/tasks/bulk"): self.bulk_update,
+            ("POST", "api/tasks/match"): self.match_titles,
+            ("POST", "api/import/slack"): lambda q, b: self.enqueue_import("slack"),
+            ("POST", "api/import/airtable"): lambda q, b: self.enqueue_import("airtable"),
+        }.get((method, "/".join(parts)))
+        if route:
+            return route(parse_qs(url.query), body)
+
+        if len(parts) == 3 and parts[:2] == ["api", "tasks"]:
+            if method == "PUT":
+                return self.update_task(parts[2], body)
+            if method == "DELETE":
+                return self.delete_task(parts[2])
+        if len(parts) == 4 and parts[:3] == ["api", "import", "jobs"] and method == "GET":
+            return self.import_job(parts[3])
+        return self._json(404, {"error": "Not found"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    # ─── Tasks ───────────────────────────────────────────────────────────────
+
+    def list_tasks(self, query, _body):
+        arg = lambda name: query.get(name, [None])[0]  # noqa: E731
+        status = arg("status") or "active"
+        urgency, category, prefix = arg("urgency"), arg("category"), arg("category_prefix")
+        search = (arg("search") or "").strip().lower()
+        fields = arg("fields")
+        limit = int(arg("limit")) if arg("limit") else None
+
+        with STORE.lock:
+            rows = [
+                t for t in STORE.tasks.values()
+                if (status == "all" or t["status"] == status)
+                and (not urgency or t["urgency"] == urgency)
+                and (not category or t["category"] == category)
+                and (not prefix or in_category(t["category"], prefix))
+                and (not search or search in t["title"].lower() or search in (t["description"] or "").lower())
+            ]
+        rows.sort(key=lambda t: t["created_at"], reverse=True)
+        if limit:
+            rows = rows[:limit]
+        if fields:
+            names = fields.split(",")
+            rows = [{n: t.get(n) for n in names} for t in rows]
+
+        if arg("format") == "ndjson" or "application/x-ndjson" in (self.headers.get("Accept") or ""):
+            return self._stream(rows)
+        return self._json(200, rows)
+
+    def create_task(self, _query, body):
+        if not body.get("title"):
+            return self._json(400, {"error": "title is required"})
+        with STORE.lock:
+            task = STORE.insert(body)
+        return self._json(201, task)
+
+    def update_task(self, task_id, body):
+        with STORE.lock:
+            task = STORE.update(task_id, body)
+        if task is None:
+            return self._json(404, {"error": "Task not found"})
+        return self._json(200, task)
+
+    def delete_task(self, task_id):
+        with STORE.lock:
+            found = STORE.delete(task_id)
+        if not found:
+            return self._json(404, {"error": "Task not found"})
+        return self._json(200, {"success": True})
+
+    def bulk_create(self, _query, body):
+        if not isinstance(body.get("tasks"), list):
+            return self._json(400, {"error": "Expected { tasks: [...] }"})
+        refresh = body.get("refresh") is True
+        inserted, updated, skipped = [], [], 0
+        with STORE.lock:
+            for row in body["tasks"]:
+                existing = STORE.by_source_id.get(row.get("source_id")) if row.get("source_id") else None
+                if existing is None:
+                    inserted.append(STORE.insert(row))
+                elif refresh:
+                    updated.append(STORE.update(existing["id"], {k: row[k] for k in ("title", "description") if k in row}))
+                else:
+                    skipped += 1
+        return self._json(201, {"imported": len(inserted), "updated": len(updated), "skipped": skipped,
+                                "tasks": inserted + updated})
+
+    def bulk_update(self, _query, body):
+        if not isinstance(body.get("tasks"), list):
+            return self._json(400, {"error": "Expected { tasks: [{ id, ...fields }] }"})
+        if not all(isinstance(p, dict) and isinstance(p.get("id"), str) for p in body["tasks"]):
+            return self._json(400, {"error": "Every patch needs an id"})
+        with STORE.lock:
+            tasks = {p["id"]: STORE.update(p["id"], p) for p in body["tasks"]}
+        tasks = [t for t in tasks.values() if t is not None]
+        return self._json(200, {"updated": len(tasks), "tasks": tasks})
+
+    def match_titles(self, _query, body):
+        titles = body.get("titles")
+        if not isinstance(titles, list) or not all(isinstance(t, str) for t in titles):
+            return self._json(400, {"error": "Expected { titles: [string, ...] }"})
+        if len(titles) > MAX_MATCH_TITLES:
+            return self._json(400, {"error": f"At most {MAX_MATCH_TITLES} titles per request"})
+        min_similarity = body.get("min_similarity", 0.5)
+        status = body.get("status", "all")
+        matches = []
+        with STORE.lock:
+            for title in titles:
+                task, similarity = STORE.match(title, min_similarity, status)
+                matches.append({"query": title, "task": task, "similarity": similarity})
+        return self._json(200, {"matches": matches})
+
+    # ─── Imports ─────────────────────────────────────────────────────────────
+    # Jobs advance by IMPORT_STEP synthetic rows per progress poll, the way a real
+    # job moves one checkpointed slice per worker run
+
+    def enqueue_import(self, kind):
+        with STORE.lock:
+            job = next((j for j in STORE.jobs.values()
+                        if j["kind"] == kind and j["status"] in ("queued", "running")), None)
+            if job is None:
+                now = _now()
+                job = {
+                    "id": str(uuid.uuid4()), "kind": kind, "status": "queued", "processed": 0,
+                    "total": IMPORT_ROWS, "imported": 0, "updated": 0, "skipped": 0,
+                    "overviews_pending": 0, "error": None, "locked_until": None,
+                    "created_at": now, "updated_at": now, "finished_at": None,
+                }
+                STORE.jobs[job["id"]] = job
+        return self._json(202, {"job": job})
+
+    def import_job(self, job_id):
+        with STORE.lock:
+            job = STORE.jobs.get(job_id)
+            if job is None:
+                return self._json(404, {"error": "Import job not found"})
+            if job["status"] in ("queued", "running"):
+                start = job["processed"]
+                for n in range(start, min(start + IMPORT_STEP, IMPORT_ROWS)):
+                    STORE.insert({"title": f"{job['kind'].title()} task {n + 1}", "source": job["kind"],
+                                  "source_id": f"{job['kind']}:{job['id']}:{n}"})
+                job["processed"] = job["imported"] = min(start + IMPORT_STEP, IMPORT_ROWS)
+                job["status"] = "completed" if job["processed"] >= IMPORT_ROWS else "running"
+                job["updated_at"] = _now()
+                if job["status"] == "completed":
+                    job["finished_at"] = job["updated_at"]
+        return self._json(200, {"job": job})
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+if __name__ == "__main__":
+    server = Server(("127.0.0.1", PORT), Handler)
+    print(f"Task Matrix stub on http://127.0.0.1:{PORT} (latency {LATENCY * 1000:g}ms "
+          f"+ up to {JITTER * 1000:g}ms, failure rate {FAILURE_RATE}, throttle rate {THROTTLE_RATE})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -19,11 +19,215 @@ create table if not exists tasks (
   tags         text[] default '{}'
 );
 
--- Index for fast fetches by status
-create index if not exists tasks_status_idx on tasks (status);
+-- Slack import details (sender, channel, AI overview)
+alter table tasks add column if not exists metadata jsonb;
+
 create index if not exists tasks_source_idx on tasks (source);
-create index if not exists tasks_urgency_idx on tasks (urgency);
-create index if not exists tasks_category_idx on tasks (category);
+create index if not exists tasks_updated_at_idx on tasks (updated_at, id);  -- GET /api/tasks/changes
+
+-- The board only ever reads active rows, so its indexes cover just those: they stay the
+-- size of the board however much completed/killed history sits beside them (and older
+-- history moves to tasks_archive, below). Other statuses are a small remainder once
+-- archived and are scanned.
+drop index if exists tasks_status_idx;
+drop index if exists tasks_urgency_idx;
+drop index if exists tasks_category_idx;
+create index if not exists tasks_active_created_idx on tasks (created_at desc, id desc) where status = 'active';
+create index if not exists tasks_active_urgency_idx on tasks (urgency, created_at desc, id desc) where status = 'active';
+create index if not exists tasks_active_category_idx on tasks (category, created_at desc, id desc) where status = 'active';
+
+-- Server-side priority ranking (mirrors prioritySort in lib/priority.ts):
+-- urgency first, then leverage ÷ effort. Backs GET /api/tasks?order=priority&limit=N.
+alter table tasks add column if not exists urgency_rank smallint
+  generated always as (case urgency when 'today' then 0 when 'this_week' then 1 else 2 end) stored;
+alter table tasks add column if not exists priority_score numeric
+  generated always as (leverage::numeric / nullif(effort, 0)) stored;
+drop index if exists tasks_priority_idx;
+create index if not exists tasks_active_priority_idx on tasks (urgency_rank, priority_score desc, created_at desc)
+  where status = 'active';
+
+-- Category hierarchy: category_path holds every ancestor of the category path
+-- ("Client Work > ListKit" → {Client Work, Client Work > ListKit}), so a whole subtree is
+-- one GIN-indexed containment test (GET /api/tasks?category_prefix=Client Work).
+-- Normalisation matches normalizeCategory() in lib/categories.ts.
+create or replace function category_ancestors(category text)
+returns text[]
+language sql
+immutable
+as $$
+  select array_agg(array_to_string(parts[1:i], ' > ') order by i)
+  from (select array_remove(regexp_split_to_array(btrim(category), '\s*>\s*'), '') as parts) p,
+       generate_series(1, cardinality(p.parts)) i
+$$;
+
+alter table tasks add column if not exists category_path text[]
+  generated always as (category_ancestors(category)) stored;
+create index if not exists tasks_category_path_idx on tasks using gin (category_path);
+
+-- Search. search_vector is a PostgREST computed field (GET /api/tasks?search=…) rather than
+-- a stored column, so `select *` doesn't ship the tsvector with every row; the GIN index
+-- on the same expression serves it. Titles also get a trigram index for fuzzy matching.
+create extension if not exists pg_trgm;
+
+create or replace function task_search_vector(title text, description text, metadata jsonb)
+returns tsvector
+language sql
+immutable
+as $$
+  select setweight(to_tsvector('english', coalesce(title, '')), 'A')
+      || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+      || setweight(to_tsvector('english', coalesce(metadata->>'ai_overview', '')), 'C')
+$$;
+
+create or replace function search_vector(t tasks)
+returns tsvector
+language sql
+immutable
+as $$
+  select task_search_vector(t.title, t.description, t.metadata)
+$$;
+
+create index if not exists tasks_search_idx on tasks using gin (task_search_vector(title, description, metadata));
+create index if not exists tasks_title_trgm_idx on tasks using gin (title gin_trgm_ops);
+
+-- Cold storage. archive_tasks() moves rows that were completed, killed or archived more
+-- than `retention` ago out of tasks, so the hot table and its indexes hold the working set
+-- and recent history only. tasks_archive has the same columns (generated ones included);
+-- tasks_all unions both for every status but active, and imports still dedup against archived source_ids.
+-- Archived rows are read-only history: PUT/DELETE /api/tasks/[id] only see the hot table.
+create table if not exists tasks_archive (like tasks including defaults including constraints including generated);
+create index if not exists tasks_archive_created_idx on tasks_archive (created_at desc, id desc);
+create index if not exists tasks_archive_source_id_idx on tasks_archive (source_id);
+create index if not exists tasks_archive_category_path_idx on tasks_archive using gin (category_path);
+create index if not exists tasks_archive_search_idx on tasks_archive using gin (task_search_vector(title, description, metadata));
+create index if not exists tasks_archive_title_trgm_idx on tasks_archive using gin (title gin_trgm_ops);
+do $$
+begin
+  alter table tasks_archive add primary key (id);
+exception when invalid_table_definition then null;
+end $$;
+
+create or replace view tasks_all with (security_invoker = true) as
+  select id, title, description, source, source_id, leverage, effort, status, urgency, category,
+         created_at, updated_at, completed_at, context_url, tags, metadata,
+         urgency_rank, priority_score, category_path
+  from tasks
+  union all
+  select id, title, description, source, source_id, leverage, effort, status, urgency, category,
+         created_at, updated_at, completed_at, context_url, tags, metadata,
+         urgency_rank, priority_score, category_path
+  from tasks_archive;
+
+-- Same computed field on the union, for searches that read tasks_all (?status=all, completed, …)
+create or replace function search_vector(t tasks_all)
+returns tsvector
+language sql
+immutable
+as $$
+  select task_search_vector(t.title, t.description, t.metadata)
+$$;
+
+-- Moves up to batch_size closed rows per call and returns how many moved; the scheduled
+-- job below calls it nightly, and it is safe to run by hand (select archive_tasks()).
+create index if not exists tasks_closed_idx on tasks (coalesce(completed_at, updated_at)) where status <> 'active';
+
+create or replace function archive_tasks(retention interval default '90 days', batch_size integer default 10000)
+returns integer
+language sql
+as $$
+  with moved as (
+    delete from tasks
+    where id in (
+      select id from tasks
+      where status <> 'active' and coalesce(completed_at, updated_at) < now() - retention
+      limit batch_size
+    )
+    returning id, title, description, source, source_id, leverage, effort, status, urgency, category,
+              created_at, updated_at, completed_at, context_url, tags, metadata
+  ), archived as (
+    insert into tasks_archive
+      (id, title, description, source, source_id, leverage, effort, status, urgency, category,
+       created_at, updated_at, completed_at, context_url, tags, metadata)
+    select * from moved
+    returning 1
+  )
+  select count(*)::integer from archived;
+$$;
+
+-- Nightly at 03:15 UTC with pg_cron (Database → Extensions); without it, run archive_tasks() by hand
+do $$
+begin
+  perform cron.schedule('archive-tasks', '15 3 * * *', 'select archive_tasks()');
+exception when invalid_schema_name or undefined_function then null;
+end $$;
+
+-- Tombstones for GET /api/tasks/changes: a deleted row has no updated_at left to poll, so
+-- every delete from tasks (DELETE /api/tasks/[id], archive_tasks()) leaves its id here.
+-- One insert per statement, so archiving a batch costs a single extra write.
+create table if not exists task_deletions (
+  task_id     uuid primary key,
+  deleted_at  timestamptz not null default now()
+);
+create index if not exists task_deletions_deleted_at_idx on task_deletions (deleted_at, task_id);
+
+create or replace function record_task_deletions()
+returns trigger
+language plpgsql
+as $$
+begin
+  insert into task_deletions (task_id)
+  select id from gone
+  on conflict (task_id) do update set deleted_at = excluded.deleted_at;
+  return null;
+end;
+$$;
+
+drop trigger if exists tasks_record_deletions on tasks;
+create trigger tasks_record_deletions
+  after delete on tasks
+  referencing old table as gone
+  for each statement execute function record_task_deletions();
+
+-- A board open longer than this misses deletes older than it; any reload catches up
+do $$
+begin
+  perform cron.schedule('prune-task-deletions', '30 3 * * *',
+    $cron$delete from task_deletions where deleted_at < now() - interval '30 days'$cron$);
+exception when invalid_schema_name or undefined_function then null;
+end $$;
+
+-- Closest existing title for each of `titles` (POST /api/tasks/match), so scripts can
+-- reconcile edited titles without downloading the board. Candidates come from the trigram
+-- indexes via %, which also applies pg_trgm's similarity_threshold (0.3 by default).
+-- task_status other than 'active' also searches tasks_archive.
+create or replace function match_task_titles(titles text[], min_similarity real default 0.5, task_status text default 'all')
+returns table (query text, task jsonb, similarity real)
+language sql
+stable
+as $$
+  select q.title, m.task, m.sim
+  from unnest(titles) as q(title)
+  left join lateral (
+    select c.task, c.sim
+    from (
+      select to_jsonb(t) as task, similarity(t.title, q.title) as sim
+      from tasks t
+      where t.title % q.title
+        and similarity(t.title, q.title) >= min_similarity
+        and (task_status = 'all' or t.status = task_status)
+      union all
+      -- Archived rows are never active; the first condition skips the archive outright then
+      select to_jsonb(a), similarity(a.title, q.title)
+      from tasks_archive a
+      where task_status <> 'active'
+        and a.title % q.title
+        and similarity(a.title, q.title) >= min_similarity
+        and (task_status = 'all' or a.status = task_status)
+    ) c
+    order by c.sim desc
+    limit 1
+  ) m on true;
+$$;
 
 -- Auto-update updated_at on row change
 create or replace function update_updated_at()
@@ -39,6 +243,173 @@ create trigger tasks_updated_at
   before update on tasks
   for each row execute function update_updated_at();
 
+-- Slack import high-water marks: newest message ts already imported per channel,
+-- so repeat imports only fetch newer history
+create table if not exists slack_sync_state (
+  channel_id  text primary key,
+  last_ts     text not null,
+  updated_at  timestamptz default now()
+);
+
+-- Airtable import sync point: records modified after synced_at are fetched next time
+create table if not exists airtable_sync_state (
+  table_key   text primary key,   -- "<base id>/<table name>"
+  synced_at   timestamptz not null
+);
+
+-- AI overviews keyed by sha256(model + Slack context), so retried imports and
+-- duplicate messages never pay for the same completion twice
+create table if not exists ai_overview_cache (
+  hash        text primary key,
+  overview    text not null,
+  created_at  timestamptz default now()
+);
+
+-- Counts behind the board header and sidebar (GET /api/tasks/summary), aggregated in one
+-- round trip instead of shipping every row to the browser. task_status 'all' covers every
+-- status, archived history included. Quadrant thresholds match quadrantOf() in lib/summary.ts.
+-- The active board is read with a literal status = 'active', so the planner can use the
+-- covering partial index below (an index-only scan); other statuses scan the small
+-- non-active remainder of the hot table.
+create index if not exists tasks_active_summary_idx on tasks (urgency, source, category, leverage, effort)
+  include (priority_score) where status = 'active';
+
+create or replace function task_summary(task_status text default 'active')
+returns jsonb
+language sql
+stable
+as $$
+  with t as (
+    select leverage, effort, urgency, source, category, priority_score
+    from tasks
+    where task_status = 'active' and status = 'active'
+    union all
+    select leverage, effort, urgency, source, category, priority_score
+    from tasks
+    where task_status <> 'active' and (task_status = 'all' or status = task_status)
+    union all
+    select leverage, effort, urgency, source, category, priority_score
+    from tasks_archive
+    where task_status <> 'active' and (task_status = 'all' or status = task_status)
+  )
+  select jsonb_build_object(
+    'total',      (select count(*) from t),
+    'score_sum',  (select coalesce(sum(priority_score), 0) from t),
+    'score_avg',  (select avg(priority_score) from t),
+    'quadrants',  (select jsonb_build_object(
+                     'quick_win', count(*) filter (where leverage >= 6 and effort <= 5),
+                     'big_bet',   count(*) filter (where leverage >= 6 and effort >= 6),
+                     'fill_in',   count(*) filter (where leverage < 6 and effort <= 5),
+                     'eliminate', count(*) filter (where leverage < 6 and effort >= 6))
+                   from t),
+    'urgency',    (select coalesce(jsonb_object_agg(urgency, n), '{}')
+                   from (select urgency, count(*) n from t where urgency is not null group by urgency) g),
+    'sources',    (select coalesce(jsonb_object_agg(source, n), '{}')
+                   from (select source, count(*) n from t where source is not null group by source) g),
+    'categories', (select coalesce(jsonb_object_agg(category, n), '{}')
+                   from (select category, count(*) n from t where category is not null group by category) g)
+  );
+$$;
+
+-- Background Slack/Airtable imports. POST /api/import/<kind> queues a job and returns
+-- straight away; the worker runs it in slices, saving `checkpoint` after every chunk,
+-- and whichever request finds the job unlocked resumes it from there.
+create table if not exists import_jobs (
+  id                uuid default gen_random_uuid() primary key,
+  kind              text not null check (kind in ('slack', 'airtable')),
+  status            text not null default 'queued' check (status in ('queued', 'running', 'completed', 'failed')),
+  checkpoint        jsonb not null default '{}',
+  processed         integer default 0,
+  total             integer,
+  imported          integer default 0,
+  updated           integer default 0,
+  skipped           integer default 0,
+  overviews_pending integer default 0,
+  error             text,
+  locked_until      timestamptz,           -- a worker holds the job until then
+  created_at        timestamptz default now(),
+  updated_at        timestamptz default now(),
+  finished_at       timestamptz
+);
+
+-- At most one unfinished job per source
+create unique index if not exists import_jobs_active_idx on import_jobs (kind) where status in ('queued', 'running');
+
+drop trigger if exists import_jobs_updated_at on import_jobs;
+create trigger import_jobs_updated_at
+  before update on import_jobs
+  for each row execute function update_updated_at();
+
+-- Batched partial updates for PATCH /api/tasks/bulk.
+-- patches is a JSON array of { id, ...fields }; only the keys present on a patch are written.
+create or replace function bulk_update_tasks(patches jsonb)
+returns setof tasks
+language sql
+as $$
+  update tasks t set
+    title        = case when p ? 'title'       then p->>'title'                else t.title end,
+    description  = case when p ? 'description' then p->>'description'          else t.description end,
+    leverage     = case when p ? 'leverage'    then (p->>'leverage')::integer  else t.leverage end,
+    effort       = case when p ? 'effort'      then (p->>'effort')::integer    else t.effort end,
+    status       = case when p ? 'status'      then p->>'status'               else t.status end,
+    urgency      = case when p ? 'urgency'     then p->>'urgency'              else t.urgency end,
+    category     = case when p ? 'category'    then p->>'category'             else t.category end,
+    tags         = case when jsonb_typeof(p->'tags') = 'array'
+                        then array(select jsonb_array_elements_text(p->'tags')) else t.tags end,
+    completed_at = case when p->>'status' = 'completed' then now()             else t.completed_at end
+  from jsonb_array_elements(patches) p
+  where t.id = (p->>'id')::uuid
+  returning t.*;
+$$;
+
+-- Idempotent insert for every import path (Slack, Airtable, /api/tasks/bulk).
+-- Rows whose source_id already exists are skipped — or, with refresh, get their
+-- title/description updated when they changed — and each returned row says whether
+-- it was inserted, so one round trip yields inserted/updated/skipped counts. Source ids
+-- already in tasks_archive are skipped too, so archiving never lets an import re-add a task.
+create or replace function upsert_tasks(rows jsonb, refresh boolean default false)
+returns table (task jsonb, inserted boolean)
+language sql
+as $$
+  insert into tasks as t
+    (title, description, source, source_id, leverage, effort, urgency, category, status, context_url, tags, metadata)
+  select r.title, r.description, coalesce(r.source, 'manual'), r.source_id,
+         coalesce(r.leverage, 5), coalesce(r.effort, 5), coalesce(r.urgency, 'whenever'), r.category,
+         coalesce(r.status, 'active'), r.context_url, coalesce(r.tags, '{}'), r.metadata
+  from jsonb_to_recordset(rows) as r(
+    title text, description text, source text, source_id text, leverage integer, effort integer,
+    urgency text, category text, status text, context_url text, tags text[], metadata jsonb
+  )
+  where r.source_id is null
+     or not exists (select 1 from tasks_archive a where a.source_id = r.source_id)
+  on conflict (source_id) do update
+    set title = excluded.title, description = excluded.description
+    where refresh and (t.title, t.description) is distinct from (excluded.title, excluded.description)
+  returning to_jsonb(t), (t.xmax = 0);
+$$;
+
 -- Enable Row Level Security (open access — add auth later if needed)
 alter table tasks enable row level security;
 create policy "Allow all" on tasks for all using (true) with check (true);
+
+-- Push row changes to open boards (Supabase Realtime); they fall back to polling without it
+do $$
+begin
+  alter publication supabase_realtime add table tasks;
+exception when duplicate_object or undefined_object then null;
+end $$;
+
+alter table slack_sync_state enable row level security;
+create policy "Allow all" on slack_sync_state for all using (true) with check (true);
+
+alter table airtable_sync_state enable row level security;
+create policy "Allow all" on airtable_sync_state for all using (true) with check (true);
+
+alter table ai_overview_cache enable row level security;
+create policy "Allow all" on ai_overview_cache for all using (true) with check (true);
+
+alter table tasks_archive enable row level security;
+create policy "Allow all" on tasks_archive for all using (true) with check (true);
+
+alter table import_jobs enable row level security;
+create policy "Allow all" on import_jobs for all using (true) with check (true);
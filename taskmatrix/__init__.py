@@ -0,0 +1,29 @@
+"""
+Python client for the Task Matrix API, shared by add_tasks.py and patch_urgency.py.
+
+    from taskmatrix import TaskMatrixClient, plan_sync
+
+    with TaskMatrixClient("https://agency-task-matrix.vercel.app/api/tasks") as api:
+        plan = plan_sync(specs, api.iter_tasks(status="all"), fields=("urgency",))
+        api.bulk_update(plan.patches)
+"""
+
+from .client import APIError, AdaptiveLimiter, Task, TaskMatrixClient, TaskPatch
+from .profile import Profile, parse_server_timing
+from .sync import SyncPlan, TaskIndex, in_category, normalize_category, normalize_title, plan_sync
+
+__all__ = [
+    "APIError",
+    "AdaptiveLimiter",
+    "Profile",
+    "SyncPlan",
+    "Task",
+    "TaskIndex",
+    "TaskMatrixClient",
+    "TaskPatch",
+    "in_category",
+    "normalize_category",
+    "normalize_title",
+    "parse_server_timing",
+    "plan_sync",
+]
@@ -0,0 +1,315 @@
+"""
+HTTP client for the Task Matrix API.
+
+Connections are kept alive and reused from a small pool, failed requests are
+retried with jittered exponential backoff (honouring Retry-After on 429/503,
+up to max_backoff),
+and the number of requests in flight adapts to how the server is coping:
+it creeps up while requests succeed and halves when the server pushes back.
+"""
+
+import email.utils
+import http.client
+import json
+import queue
+import random
+import threading
+import time
+from typing import Iterator, Optional, TypedDict
+from urllib.parse import urlencode, urlsplit
+
+
+class Task(TypedDict, total=False):
+    id: str
+    title: str
+    description: Optional[str]
+    source: str
+    source_id: Optional[str]
+    leverage: int
+    effort: int
+    urgency: str
+    category: Optional[str]
+    status: str
+    tags: list
+    created_at: str
+    updated_at: str
+    completed_at: Optional[str]
+
+
+class TaskPatch(TypedDict, total=False):
+    id: str
+    title: str
+    description: Optional[str]
+    leverage: int
+    effort: int
+    urgency: str
+    category: Optional[str]
+    status: str
+    tags: list
+
+
+class APIError(Exception):
+    """Non-2xx response from the API, raised once retries are exhausted."""
+
+    def __init__(self, status: int, body: bytes, method: str, path: str):
+        self.status = status
+        self.body = body
+        super().__init__(f"HTTP {status} on {method} {path}: {body[:200].decode('utf-8', 'replace')}")
+
+
+# Statuses that mean "not processed, try again later" — safe to retry for any method
+THROTTLED = {429, 503}
+# Other transient failures; only retried for idempotent methods so a POST that
+# actually landed isn't inserted twice
+TRANSIENT = {500, 502, 504}
+IDEMPOTENT = {"GET", "PUT", "PATCH", "DELETE"}
+
+# Titles per POST /api/tasks/match request (the route's limit)
+MATCH_BATCH = 1000
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit: +1/limit per success, halved when throttled."""
+
+    def __init__(self, initial: int = 4, maximum: int = 32):
+        self.limit = float(max(1, min(initial, maximum)))
+        self.maximum = maximum
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def succeeded(self):
+        with self._cond:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def throttled(self):
+        with self._cond:
+            self.limit = max(1.0, self.limit / 2)
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TaskMatrixClient:
+    """Thread-safe client for …/api/tasks.
+
+    api_url is the tasks endpoint, e.g. https://example.vercel.app/api/tasks.
+    Pass a Profile to record every request's latency and server stage timings.
+    """
+
+    def __init__(self, api_url: str, timeout: float = 30, max_retries: int = 5,
+                 concurrency: int = 4, max_concurrency: int = 32,
+                 backoff: float = 0.5, max_backoff: float = 30, profile=None):
+        url = urlsplit(api_url)
+        self.path = url.path.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limiter = AdaptiveLimiter(concurrency, max_concurrency)
+        self.profile = profile
+        self._scheme = url.scheme
+        self._netloc = url.netloc
+        self._pool = queue.LifoQueue()
+
+    # ─── Connections ─────────────────────────────────────────────────────────
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            cls = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            return cls(self._netloc, timeout=self.timeout)
+
+    def _checkin(self, conn: http.client.HTTPConnection):
+        # Most recently used first, so idle sockets at the bottom age out server-side
+        self._pool.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ─── Requests ────────────────────────────────────────────────────────────
+
+    def _sleep(self, attempt: int, retry_after: Optional[float] = None):
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        # A Retry-After of an hour (proxies send those) would park the thread that long
+        time.sleep(min(self.max_backoff, max(delay, retry_after or 0)))
+
+    def _open(self, method: str, path: str, body=None, headers=None):
+        """Send one request and return (conn, response) with the body unread.
+
+        Retries stale keep-alive sockets, connection errors (idempotent methods
+        only), throttling and transient 5xx. The caller must read the response
+        and hand conn back via _checkin, or close it.
+        """
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json", **(headers or {})}
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            conn = self._checkout()
+            reused = conn.sock is not None
+            error = None
+            with self.limiter:
+                try:
+                    conn.request(method, path, body=data, headers=headers)
+                    resp = conn.getresponse()
+                except (http.client.HTTPException, OSError) as e:
+                    conn.close()
+                    error = e
+
+            # Backoff happens outside the limiter so a sleeping retry doesn't hold a slot
+            if error is not None:
+                if reused and isinstance(error, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)):
+                    # The server dropped an idle keep-alive socket — reconnect straight away
+                    continue
+                if method not in IDEMPOTENT or attempt >= self.max_retries:
+                    raise error
+                self._sleep(attempt)
+                attempt += 1
+                continue
+
+            retryable = resp.status in THROTTLED or (resp.status in TRANSIENT and method in IDEMPOTENT)
+            if not retryable:
+                if resp.status < 400:
+                    self.limiter.succeeded()
+                self._record(method, path, resp, started, attempt)
+                return conn, resp
+
+            raw = resp.read()
+            self._checkin(conn)
+            if resp.status in THROTTLED:
+                self.limiter.throttled()
+            if attempt >= self.max_retries:
+                self._record(method, path, resp, started, attempt)
+                raise APIError(resp.status, raw, method, path)
+            self._sleep(attempt, _retry_after(resp.getheader("Retry-After")))
+            attempt += 1
+
+    def _record(self, method: str, path: str, resp, started: float, retries: int):
+        # Time to response headers, backoff included — for NDJSON streams the rows come after
+        if self.profile is not None:
+            self.profile.record(method, path, resp.status, time.perf_counter() - started,
+                                retries, resp.getheader("Server-Timing"))
+
+    def request(self, method: str, path: str = "", body=None, params=None):
+        """JSON request against the tasks endpoint (path is relative to it)."""
+        full = self.path + path + (f"?{urlencode(params)}" if params else "")
+        conn, resp = self._open(method, full, body)
+        try:
+            raw = resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            raise
+        self._checkin(conn)
+        if resp.status >= 400:
+            raise APIError(resp.status, raw, method, full)
+        return json.loads(raw) if raw else None
+
+    # ─── Tasks ───────────────────────────────────────────────────────────────
+
+    def iter_tasks(self, status: str = "active", fields=None, **filters) -> Iterator[Task]:
+        """Yield tasks as they stream in over NDJSON, one row at a time.
+
+        `fields` limits the columns returned, e.g. ("id", "title", "urgency").
+        Extra keyword arguments are passed through as query filters
+        (urgency=..., category=..., limit=...); category_prefix="Client Work"
+        selects a whole category subtree and search="..." runs a full-text
+        search over titles, descriptions and AI overviews.
+        """
+        params = {"status": status, "format": "ndjson", **filters}
+        if fields:
+            params["fields"] = ",".join(fields)
+        full = f"{self.path}?{urlencode(params)}"
+
+        conn, resp = self._open("GET", full, headers={"Accept": "application/x-ndjson"})
+        finished = False
+        try:
+            if resp.status >= 400:
+                raise APIError(resp.status, resp.read(), "GET", full)
+            if "ndjson" not in (resp.getheader("Content-Type") or ""):
+                # Older deployment, or local-storage mode ({ supabaseNotConfigured, tasks: [] })
+                data = json.loads(resp.read())
+                finished = True
+                yield from (data.get("tasks", []) if isinstance(data, dict) else data)
+                return
+            for line in resp:
+                if line.strip():
+                    yield json.loads(line)
+            # Line iteration stops at the end of the body without marking the
+            # response closed, which the connection needs before it can be reused
+            resp.read()
+            finished = True
+        finally:
+            # A half-read stream can't be reused for the next request
+            if finished:
+                self._checkin(conn)
+            else:
+                conn.close()
+
+    def match_titles(self, titles: list, min_similarity: float = 0.5, status: str = "all") -> list:
+        """Closest existing task for each title by trigram similarity (POST /match).
+
+        Returns [{"query", "task", "similarity"}] in the order of titles; task is
+        None when nothing scores at least min_similarity.
+        """
+        matches = []
+        for start in range(0, len(titles), MATCH_BATCH):
+            body = {"titles": titles[start:start + MATCH_BATCH], "min_similarity": min_similarity, "status": status}
+            matches.extend(self.request("POST", "/match", body=body)["matches"])
+        return matches
+
+    def list_tasks(self, status: str = "active", fields=None, **filters) -> list:
+        return list(self.iter_tasks(status, fields, **filters))
+
+    def create_task(self, task: Task) -> Task:
+        return self.request("POST", body=task)
+
+    def update_task(self, task_id: str, updates: TaskPatch) -> Task:
+        return self.request("PUT", f"/{task_id}", body=updates)
+
+    def bulk_create(self, tasks: list, refresh: bool = False) -> dict:
+        """POST /bulk → {imported, updated, skipped, tasks}. Rows with a known
+        source_id are skipped, or refreshed when refresh=True."""
+        body = {"tasks": tasks}
+        if refresh:
+            body["refresh"] = True
+        return self.request("POST", "/bulk", body=body)
+
+    def bulk_update(self, patches: list) -> dict:
+        """PATCH /bulk with [{id, ...changed fields}] → {updated, tasks}."""
+        return self.request("PATCH", "/bulk", body={"tasks": patches})
@@ -0,0 +1,81 @@
+"""
+Client-side latency profile for a script run (--profile).
+
+Every request the client makes is recorded with its wall time, how many
+retries it took and the API's Server-Timing header, so the report at the end
+shows both where the client waited and which server stage (db, openai,
+slack_*, ...) it was waiting on.
+"""
+
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# Task ids in paths (/api/tasks/<uuid>) are folded so PUTs group as one endpoint
+_UUID = re.compile(r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+_DUR = re.compile(r";\s*dur=([0-9.]+)")
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """{stage: ms} from a Server-Timing header; entries without dur are skipped."""
+    stages = {}
+    for entry in (header or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        match = _DUR.search(";" + params)
+        if name and match:
+            stages[name] = stages.get(name, 0.0) + float(match.group(1))
+    return stages
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile: the smallest value with at least p% of values at or below it."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class Profile:
+    """Thread-safe collector; TaskMatrixClient(profile=...) calls record()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = defaultdict(list)   # "GET /api/tasks" -> [ms]
+        self._retries = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._stages = defaultdict(list)    # "db" -> [ms per request]
+
+    def record(self, method: str, path: str, status: int, seconds: float,
+               retries: int = 0, server_timing: Optional[str] = None):
+        endpoint = f"{method} {_UUID.sub('/{id}', path.split('?', 1)[0])}"
+        stages = parse_server_timing(server_timing)
+        with self._lock:
+            self._latency[endpoint].append(seconds * 1000)
+            self._retries[endpoint] += retries
+            if status >= 400:
+                self._errors[endpoint] += 1
+            for stage, ms in stages.items():
+                self._stages[stage].append(ms)
+
+    def report(self) -> str:
+        with self._lock:
+            lines = [f"{'endpoint':<32} {'calls':>6} {'p50 ms':>8} {'p99 ms':>8} {'total s':>8} {'retries':>7} {'errors':>6}"]
+            for endpoint, values in sorted(self._latency.items(), key=lambda kv: -sum(kv[1])):
+                lines.append(
+                    f"{endpoint:<32} {len(values):>6} {percentile(values, 50):>8.1f} "
+                    f"{percentile(values, 99):>8.1f} {sum(values) / 1000:>8.2f} "
+                    f"{self._retries[endpoint]:>7} {self._errors[endpoint]:>6}"
+                )
+            if not self._latency:
+                lines.append("(no requests)")
+            if self._stages:
+                # total is the server's own view of each request; the gap to the
+                # client's latency is network and queueing
+                lines.append("")
+                lines.append(f"{'server stage':<32} {'calls':>6} {'mean ms':>8} {'p99 ms':>8} {'total s':>8}")
+                for stage, values in sorted(self._stages.items(), key=lambda kv: -sum(kv[1])):
+                    lines.append(
+                        f"{stage:<32} {len(values):>6} {sum(values) / len(values):>8.1f} "
+                        f"{percentile(values, 99):>8.1f} {sum(values) / 1000:>8.2f}"
+                    )
+            return "\n".join(lines)
@@ -0,0 +1,146 @@
+"""
+Streaming reader for task seed files.
+
+Seed files are JSONL (one task object per line) or CSV with a header row;
+"-" reads stdin. Rows are parsed and validated one at a time against the
+constraints in supabase-schema.sql, so a file of any size is loaded in
+constant memory.
+"""
+
+import csv
+import io
+import json
+import sys
+from itertools import islice
+
+URGENCIES = ("today", "this_week", "whenever")
+STATUSES = ("active", "completed", "killed", "archived")
+SOURCES = ("manual", "slack", "airtable")
+
+_TEXT_FIELDS = ("description", "category", "source_id", "context_url")
+
+# Column defaults from supabase-schema.sql, filled in only when a row is inserted
+DEFAULTS = {"leverage": 5, "effort": 5, "urgency": "whenever", "status": "active", "source": "manual"}
+
+
+class SeedError(ValueError):
+    """A row that violates the tasks table constraints."""
+
+
+def _score(value, name: str) -> int:
+    # int(True) == 1, so a JSON boolean would otherwise pass as a score
+    if isinstance(value, bool):
+        raise SeedError(f"{name} must be an integer, got {value!r}")
+    try:
+        score = int(value)
+    except (TypeError, ValueError):
+        raise SeedError(f"{name} must be an integer, got {value!r}")
+    if isinstance(value, float) and value != score:
+        raise SeedError(f"{name} must be an integer, got {value!r}")
+    if not 1 <= score <= 10:
+        raise SeedError(f"{name} must be between 1 and 10, got {score}")
+    return score
+
+
+def _choice(value, name: str, allowed: tuple) -> str:
+    if value not in allowed:
+        raise SeedError(f"{name} must be one of {', '.join(allowed)}, got {value!r}")
+    return value
+
+
+def validate_task(row: dict) -> dict:
+    """Return the validated fields row supplies, or raise SeedError.
+
+    Fields the row leaves out stay out, so an update only compares and sends
+    what the seed actually says; with_defaults() completes a row for insert.
+    """
+    if not isinstance(row, dict):
+        raise SeedError("expected an object")
+    title = row.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise SeedError("title is required")
+
+    task = {"title": title.strip()}
+    for name in ("leverage", "effort"):
+        if row.get(name) not in (None, ""):
+            task[name] = _score(row[name], name)
+    for name, allowed in (("urgency", URGENCIES), ("status", STATUSES), ("source", SOURCES)):
+        if row.get(name):
+            task[name] = _choice(row[name], name, allowed)
+    for name in _TEXT_FIELDS:
+        if row.get(name):
+            task[name] = str(row[name])
+
+    tags = row.get("tags")
+    if isinstance(tags, str):
+        # CSV cells carry tags comma-separated
+        tags = [t.strip() for t in tags.split(",") if t.strip()]
+    if tags:
+        if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+            raise SeedError("tags must be a list of strings")
+        task["tags"] = tags
+    return task
+
+
+def with_defaults(task: dict) -> dict:
+    """task with the column defaults filled in, ready for POST /api/tasks."""
+    return {**DEFAULTS, **task}
+
+
+def _open(source):
+    if source == "-":
+        return sys.stdin, False
+    if isinstance(source, io.IOBase):
+        return source, False
+    return open(source, encoding="utf-8", newline=""), True
+
+
+def _records(stream, fmt: str):
+    """Yield (line_no, raw_row_or_None, parse_error_or_None)."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            # Empty cells mean "use the default", same as a missing JSON key
+            yield reader.line_num, {k: v for k, v in row.items() if k and v not in (None, "")}, None
+        return
+
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield line_no, None, SeedError(f"invalid JSON ({e.msg})")
+
+
+def read_seed(source="-", fmt: str = None):
+    """Yield (line_no, task, error) for every row in a JSONL or CSV seed.
+
+    source is a path, "-" for stdin, or an open text stream. fmt is "jsonl"
+    or "csv"; by default it follows the file extension (stdin is JSONL).
+    Exactly one of task and error is None.
+    """
+    if fmt is None:
+        fmt = "csv" if isinstance(source, str) and source.lower().endswith(".csv") else "jsonl"
+    if fmt not in ("jsonl", "csv"):
+        raise ValueError(f"unknown seed format {fmt!r}")
+
+    stream, owned = _open(source)
+    try:
+        for line_no, row, error in _records(stream, fmt):
+            if error is None:
+                try:
+                    row = validate_task(row)
+                except SeedError as e:
+                    row, error = None, e
+            yield line_no, row, error
+    finally:
+        if owned:
+            stream.close()
+
+
+def batched(iterable, size: int):
+    """Yield lists of up to size items without materialising iterable."""
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
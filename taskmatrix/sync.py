@@ -0,0 +1,164 @@
+"""
+Reconcile local task specs against the tasks already in the Task Matrix.
+
+Remote tasks are indexed once by source_id and normalized title, then each
+local spec is classified as an insert, an update (carrying only the fields
+that differ) or unchanged — so a re-run only costs the rows that actually
+changed.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_title(title: str) -> str:
+    """Case-, width- and whitespace-insensitive key for matching titles."""
+    text = unicodedata.normalize("NFKC", title or "").casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def normalize_category(category: str) -> str:
+    """"A>B" and " A > B " both become "A > B" (same as lib/categories.ts)."""
+    return " > ".join(part.strip() for part in (category or "").split(">") if part.strip())
+
+
+def in_category(category, prefix: str) -> bool:
+    """True when category is prefix or one of its subcategories."""
+    if not category:
+        return False
+    c, p = normalize_category(category), normalize_category(prefix)
+    return c == p or c.startswith(p + " > ")
+
+
+def _same(local, remote) -> bool:
+    # The API hands back null for empty descriptions/categories and [] for tags
+    if local in (None, "", []) and remote in (None, "", []):
+        return True
+    return local == remote
+
+
+class TaskIndex:
+    """Hash index over remote tasks keyed on source_id and normalized title.
+
+    remote_tasks may be any iterable (e.g. a streaming generator); it is
+    consumed once. When several remote rows share a key the first one wins.
+    """
+
+    def __init__(self, remote_tasks):
+        self.by_source_id = {}
+        self.by_title = {}
+        self.ids = set()
+        self.size = 0
+        for task in remote_tasks:
+            self.size += 1
+            if task.get("id"):
+                self.ids.add(task["id"])
+            source_id = task.get("source_id")
+            if source_id:
+                self.by_source_id.setdefault(source_id, task)
+            self.by_title.setdefault(normalize_title(task.get("title", "")), task)
+
+    def __len__(self):
+        return self.size
+
+    def match(self, spec: dict):
+        source_id = spec.get("source_id")
+        if source_id and source_id in self.by_source_id:
+            return self.by_source_id[source_id]
+        return self.by_title.get(normalize_title(spec.get("title", "")))
+
+
+@dataclass
+class SyncPlan:
+    inserts: list = field(default_factory=list)     # specs with no remote row
+    updates: list = field(default_factory=list)     # (spec, {"id": ..., **changed_fields})
+    unchanged: list = field(default_factory=list)   # (spec, remote task)
+    duplicates: list = field(default_factory=list)  # specs repeating an earlier spec
+
+    @property
+    def patches(self) -> list:
+        """Update payloads ready for PATCH /api/tasks/bulk."""
+        return [patch for _, patch in self.updates]
+
+
+INSERT, UPDATE, UNCHANGED, DUPLICATE = "insert", "update", "unchanged", "duplicate"
+
+
+def iter_sync(specs, remote_tasks, fields=()):
+    """Classify specs lazily, yielding (kind, spec, detail) one spec at a time.
+
+    detail is the patch {"id": ..., **changed_fields} for updates, the remote
+    task for unchanged specs and None otherwise. Only the names in `fields`
+    are compared; a matched spec that agrees on all of them (or when `fields`
+    is empty) is unchanged. Memory grows with the number of distinct keys,
+    not with the specs themselves.
+    """
+    index = remote_tasks if isinstance(remote_tasks, TaskIndex) else TaskIndex(remote_tasks)
+    seen_keys = set()
+    seen_ids = set()
+
+    for spec in specs:
+        key = spec.get("source_id") or normalize_title(spec.get("title", ""))
+        remote = index.match(spec)
+        if key in seen_keys or (remote is not None and remote["id"] in seen_ids):
+            yield DUPLICATE, spec, None
+            continue
+        seen_keys.add(key)
+
+        if remote is None:
+            yield INSERT, spec, None
+            continue
+        seen_ids.add(remote["id"])
+
+        yield _classify(spec, remote, fields)
+
+
+def _classify(spec: dict, remote: dict, fields) -> tuple:
+    changed = {f: spec[f] for f in fields if f in spec and not _same(spec[f], remote.get(f))}
+    if changed:
+        return UPDATE, spec, {"id": remote["id"], **changed}
+    return UNCHANGED, spec, remote
+
+
+def iter_fuzzy(specs, match_titles, fields=(), claimed=None, known_ids=None):
+    """Resolve specs that had no exact match (INSERTs from iter_sync) by fuzzy title.
+
+    match_titles(titles) returns one {"task": remote_or_None, "similarity": ...}
+    per title, in order — e.g. TaskMatrixClient.match_titles, which does the
+    trigram lookup in the database. Yields (kind, spec, detail, match) with
+    the same kinds and details as iter_sync; specs with no match stay INSERT
+    (match is None). Remote ids in `claimed` (already matched exactly) are never
+    reused, and are added to as fuzzy matches are made. With known_ids (e.g.
+    TaskIndex.ids, taken before a run starts inserting) only those remote tasks
+    count as matches, so a row the same run just inserted never makes a
+    near-identical spec look already present.
+    """
+    specs = list(specs)
+    claimed = set() if claimed is None else claimed
+    matches = match_titles([spec.get("title", "") for spec in specs]) if specs else []
+
+    for spec, match in zip(specs, matches):
+        remote = match.get("task")
+        if remote is None or remote["id"] in claimed or (known_ids is not None and remote["id"] not in known_ids):
+            yield INSERT, spec, None, None
+            continue
+        claimed.add(remote["id"])
+        yield (*_classify(spec, remote, fields), match)
+
+
+def plan_sync(specs, remote_tasks, fields=()) -> SyncPlan:
+    """Classify every spec against remote_tasks in a single pass (see iter_sync)."""
+    plan = SyncPlan()
+    for kind, spec, detail in iter_sync(specs, remote_tasks, fields):
+        if kind == INSERT:
+            plan.inserts.append(spec)
+        elif kind == UPDATE:
+            plan.updates.append((spec, detail))
+        elif kind == UNCHANGED:
+            plan.unchanged.append((spec, detail))
+        else:
+            plan.duplicates.append(spec)
+    return plan
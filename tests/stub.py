@@ -0,0 +1,39 @@
+"""Run scripts/task_api_stub.py in-process for the script tests."""
+
+import importlib.util
+import json
+import os
+import threading
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_spec = importlib.util.spec_from_file_location("task_api_stub", os.path.join(ROOT, "scripts", "task_api_stub.py"))
+task_api_stub = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(task_api_stub)
+
+
+class StubServer:
+    """Context manager serving the stub on a free port; .api_base is its URL."""
+
+    def __enter__(self):
+        with task_api_stub.STORE.lock:
+            task_api_stub.STORE.reset()
+        self.server = task_api_stub.Server(("127.0.0.1", 0), task_api_stub.Handler)
+        self.api_base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fault(self, **fault):
+        """Queue a scripted fault for the next request (see Store.faults in the stub)."""
+        with task_api_stub.STORE.lock:
+            task_api_stub.STORE.faults.append(fault)
+
+    def tasks(self, status="all") -> list:
+        with urllib.request.urlopen(f"{self.api_base}/api/tasks?status={status}") as resp:
+            return json.loads(resp.read())
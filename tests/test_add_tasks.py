@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from taskmatrix import APIError, TaskMatrixClient
+from tests.stub import ROOT, StubServer
+
+sys.path.insert(0, ROOT)
+from add_tasks import load_chunk  # noqa: E402
+
+
+def run_add_tasks(api_base: str, rows: list, *args) -> str:
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+        f.writelines(json.dumps(row) + "\n" for row in rows)
+    try:
+        result = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "add_tasks.py"), f.name, *args],
+            env={**os.environ, "API_BASE": api_base}, capture_output=True, text=True, timeout=60,
+        )
+    finally:
+        os.unlink(f.name)
+    if result.returncode != 0:
+        raise AssertionError(result.stdout + result.stderr)
+    return result.stdout
+
+
+class FuzzyLoadTest(unittest.TestCase):
+    def test_near_duplicates_in_one_run_are_all_added(self):
+        # Each title is within trigram range of the others, but all are new to the board
+        rows = [{"title": f"Unique task number {i} for the fuzzy run"} for i in range(60)]
+        rows.append({"title": "Build pitch deck for SaaS clients"})
+        rows.append({"title": "Build pitch deck for agency clients"})
+        with StubServer() as stub:
+            run_add_tasks(stub.api_base, rows, "--bulk", "--batch-size", "20", "--fuzzy")
+            titles = sorted(t["title"] for t in stub.tasks())
+        self.assertEqual(titles, sorted(r["title"] for r in rows))
+
+    def test_near_duplicate_of_existing_task_is_skipped(self):
+        with StubServer() as stub:
+            run_add_tasks(stub.api_base, [{"title": "Build pitch deck for SaaS clients"}])
+            out = run_add_tasks(stub.api_base, [{"title": "Build pitch deck for SaaS client"}], "--fuzzy")
+            titles = [t["title"] for t in stub.tasks()]
+        self.assertEqual(titles, ["Build pitch deck for SaaS clients"])
+        self.assertIn("≈", out)
+
+
+class UpdateTest(unittest.TestCase):
+    def test_partial_row_only_updates_the_fields_it_supplies(self):
+        with StubServer() as stub:
+            run_add_tasks(stub.api_base, [{"title": "Audit ad spend", "leverage": 7, "effort": 8, "urgency": "today"}])
+            out = run_add_tasks(stub.api_base, [{"title": "Audit ad spend", "urgency": "whenever", "leverage": 3}],
+                                "--update")
+            [task] = stub.tasks()
+        self.assertEqual((task["leverage"], task["effort"], task["urgency"]), (3, 8, "whenever"))
+        self.assertIn("(leverage, urgency)", out)
+
+    def test_defaults_are_filled_in_on_insert(self):
+        with StubServer() as stub:
+            run_add_tasks(stub.api_base, [{"title": "Bare row"}], "--bulk")
+            [task] = stub.tasks()
+        self.assertEqual((task["leverage"], task["effort"], task["urgency"]), (5, 5, "whenever"))
+
+
+class LoadChunkTest(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer().__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+        self.chunk = [(1, {"title": "First"}), (2, {"title": "Second"})]
+
+    def test_rejected_batch_falls_back_to_single_rows(self):
+        api = TaskMatrixClient(f"{self.stub.api_base}/api/tasks", backoff=0.01)
+        self.addCleanup(api.close)
+        self.stub.fault(status=500)
+        results, chunk_err = load_chunk(api, self.chunk)
+        self.assertIsInstance(chunk_err, APIError)
+        self.assertEqual([e for _, _, e in results], [None, None])
+        self.assertEqual(len(self.stub.tasks()), 2)
+
+    def test_batch_with_no_answer_is_not_posted_again(self):
+        api = TaskMatrixClient(f"{self.stub.api_base}/api/tasks", timeout=0.2)
+        self.addCleanup(api.close)
+        self.stub.fault(delay=0.5)
+        results, chunk_err = load_chunk(api, self.chunk)
+        self.assertIsInstance(chunk_err, OSError)
+        self.assertTrue(all(e is chunk_err for _, _, e in results))
+        time.sleep(0.5)  # the server commits the batch after the client gave up
+        self.assertEqual(sorted(t["title"] for t in self.stub.tasks()), ["First", "Second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import email.utils
+import threading
+import time
+import unittest
+from unittest import mock
+
+from taskmatrix.client import AdaptiveLimiter, APIError, TaskMatrixClient, _retry_after
+from tests.stub import StubServer
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_seconds_and_http_dates(self):
+        self.assertEqual(_retry_after("2.5"), 2.5)
+        self.assertEqual(_retry_after("-3"), 0.0)
+        later = email.utils.formatdate(time.time() + 60, usegmt=True)
+        self.assertAlmostEqual(_retry_after(later), 60, delta=2)
+
+    def test_missing_or_garbage_is_none(self):
+        for value in (None, "", "soon"):
+            self.assertIsNone(_retry_after(value))
+
+
+class AdaptiveLimiterTest(unittest.TestCase):
+    def test_grows_on_success_up_to_the_maximum(self):
+        limiter = AdaptiveLimiter(initial=2, maximum=3)
+        for _ in range(2):
+            limiter.succeeded()
+        self.assertAlmostEqual(limiter.limit, 2.9)  # +1/2, then +1/2.5
+        for _ in range(10):
+            limiter.succeeded()
+        self.assertEqual(limiter.limit, 3.0)
+
+    def test_halves_when_throttled_but_never_below_one(self):
+        limiter = AdaptiveLimiter(initial=8)
+        limiter.throttled()
+        self.assertEqual(limiter.limit, 4.0)
+        for _ in range(5):
+            limiter.throttled()
+        self.assertEqual(limiter.limit, 1.0)
+
+    def test_blocks_past_the_limit(self):
+        limiter = AdaptiveLimiter(initial=1)
+        entered = threading.Event()
+
+        def second():
+            with limiter:
+                entered.set()
+
+        with limiter:
+            thread = threading.Thread(target=second)
+            thread.start()
+            self.assertFalse(entered.wait(0.1))
+        self.assertTrue(entered.wait(1))
+        thread.join()
+
+
+class ClientRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer().__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+        self.api = TaskMatrixClient(f"{self.stub.api_base}/api/tasks", backoff=0.01, max_backoff=0.05)
+        self.addCleanup(self.api.close)
+
+    def test_throttled_request_is_retried_and_the_limit_backs_off(self):
+        self.stub.fault(status=429, headers={"Retry-After": "0"})
+        self.api.create_task({"title": "after a 429"})
+        self.assertEqual([t["title"] for t in self.stub.tasks()], ["after a 429"])
+        self.assertLess(self.api.limiter.limit, 4)
+
+    def test_retry_after_is_capped_at_max_backoff(self):
+        self.stub.fault(status=503, headers={"Retry-After": "3600"})
+        with mock.patch("taskmatrix.client.time.sleep") as sleep:
+            self.api.list_tasks()
+        self.assertEqual(sleep.call_count, 1)
+        self.assertLessEqual(sleep.call_args.args[0], 0.05)
+
+    def test_transient_5xx_is_retried_for_get_but_not_post(self):
+        self.stub.fault(status=500)
+        self.assertEqual(self.api.list_tasks(), [])
+        self.stub.fault(status=500)
+        with self.assertRaises(APIError) as raised:
+            self.api.create_task({"title": "not retried"})
+        self.assertEqual(raised.exception.status, 500)
+        self.assertEqual(self.stub.tasks(), [])
+
+    def test_gives_up_after_max_retries(self):
+        api = TaskMatrixClient(f"{self.stub.api_base}/api/tasks", max_retries=2, backoff=0.01)
+        self.addCleanup(api.close)
+        for _ in range(3):
+            self.stub.fault(status=429, headers={"Retry-After": "0"})
+        with self.assertRaises(APIError) as raised:
+            api.list_tasks()
+        self.assertEqual(raised.exception.status, 429)
+
+    def test_connections_are_reused_and_stale_ones_replaced(self):
+        self.api.list_tasks()
+        conn = self.api._pool.get_nowait()
+        self.api._checkin(conn)
+        self.api.list_tasks()
+        self.assertIs(self.api._pool.get_nowait(), conn)
+        self.api._checkin(conn)
+
+        # The server closes the idle socket; the next request reconnects without a retry
+        self.stub.fault(drop=True)
+        self.api.list_tasks()
+        self.api.create_task({"title": "on a fresh socket"})
+        self.assertEqual([t["title"] for t in self.stub.tasks()], ["on a fresh socket"])
+
+
+if __name__ == "__main__":
+    unittest.main()
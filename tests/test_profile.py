@@ -0,0 +1,26 @@
+import unittest
+
+from taskmatrix.profile import percentile, parse_server_timing
+
+
+class PercentileTest(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(200, 0, -1)]
+        self.assertEqual(percentile(values, 50), 100)
+        self.assertEqual(percentile(values, 99), 198)
+        self.assertEqual(percentile(values, 100), 200)
+
+    def test_small_and_single_samples(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertEqual(percentile([7, 9], 0), 7)
+
+
+class ServerTimingTest(unittest.TestCase):
+    def test_sums_repeated_stages_and_skips_entries_without_dur(self):
+        header = 'db;dur=12.5, openai;desc="overview";dur=300, db;dur=2.5, cache'
+        self.assertEqual(parse_server_timing(header), {"db": 15.0, "openai": 300.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
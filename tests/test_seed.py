@@ -0,0 +1,38 @@
+import io
+import unittest
+
+from taskmatrix.seed import SeedError, read_seed, validate_task, with_defaults
+
+
+class ValidateTaskTest(unittest.TestCase):
+    def test_scores_accept_integers(self):
+        task = validate_task({"title": " Ship it ", "leverage": 8, "effort": "3"})
+        self.assertEqual((task["title"], task["leverage"], task["effort"]), ("Ship it", 8, 3))
+
+    def test_missing_fields_stay_missing_until_insert(self):
+        task = validate_task({"title": "x", "urgency": "today", "effort": ""})
+        self.assertEqual(task, {"title": "x", "urgency": "today"})
+        self.assertEqual(with_defaults(task), {
+            "title": "x", "urgency": "today", "leverage": 5, "effort": 5, "status": "active", "source": "manual",
+        })
+
+    def test_booleans_are_not_scores(self):
+        for value in (True, False):
+            with self.assertRaisesRegex(SeedError, "leverage must be an integer"):
+                validate_task({"title": "x", "leverage": value})
+
+    def test_out_of_range_and_fractional_scores_are_rejected(self):
+        for value in (0, 11, 2.5, "high"):
+            with self.assertRaises(SeedError):
+                validate_task({"title": "x", "effort": value})
+
+
+class ReadSeedTest(unittest.TestCase):
+    def test_bad_rows_are_reported_with_their_line(self):
+        seed = io.StringIO('{"title": "ok"}\n{"title": "flag", "leverage": true}\nnot json\n')
+        results = [(line, task is not None, error is not None) for line, task, error in read_seed(seed)]
+        self.assertEqual(results, [(1, True, False), (2, False, True), (3, False, True)])
+
+
+if __name__ == "__main__":
+    unittest.main()
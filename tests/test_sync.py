@@ -0,0 +1,99 @@
+import unittest
+
+from taskmatrix.sync import (
+    DUPLICATE, INSERT, UNCHANGED, UPDATE, TaskIndex, in_category, iter_fuzzy, iter_sync,
+    normalize_category, normalize_title, plan_sync,
+)
+
+REMOTE = [
+    {"id": "a", "title": "Write  Q3 Report", "source_id": None, "urgency": "today", "category": None},
+    {"id": "b", "title": "Renamed on the board", "source_id": "slack-1", "urgency": "whenever", "category": "Ops"},
+    {"id": "c", "title": "Write Q3 report", "source_id": None, "urgency": "this_week", "category": None},
+]
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_titles_ignore_case_width_and_whitespace(self):
+        self.assertEqual(normalize_title("  Write\tＱ3   REPORT "), "write q3 report")
+        self.assertEqual(normalize_title(None), "")
+
+    def test_categories(self):
+        self.assertEqual(normalize_category(" Client Work>ListKit "), "Client Work > ListKit")
+        self.assertTrue(in_category("Client Work > ListKit", "Client Work"))
+        self.assertFalse(in_category("Client Workshop", "Client Work"))
+
+
+class TaskIndexTest(unittest.TestCase):
+    def test_source_id_takes_precedence_over_title(self):
+        index = TaskIndex(REMOTE)
+        self.assertEqual(index.match({"title": "Write Q3 report", "source_id": "slack-1"})["id"], "b")
+        self.assertEqual(index.match({"title": "write q3 REPORT", "source_id": "slack-9"})["id"], "a")
+
+    def test_first_row_wins_for_a_shared_title(self):
+        index = TaskIndex(iter(REMOTE))
+        self.assertEqual(index.match({"title": "WRITE Q3 REPORT"})["id"], "a")
+        self.assertEqual((len(index), index.ids), (3, {"a", "b", "c"}))
+
+
+class IterSyncTest(unittest.TestCase):
+    def test_classifies_and_diffs_only_the_given_fields(self):
+        specs = [
+            {"title": "write q3 report", "urgency": "this_week", "category": "Finance"},
+            {"title": "Anything", "source_id": "slack-1", "urgency": "whenever", "category": ""},
+            {"title": "Brand new"},
+        ]
+        results = list(iter_sync(specs, REMOTE, fields=("urgency",)))
+        self.assertEqual([kind for kind, _, _ in results], [UPDATE, UNCHANGED, INSERT])
+        self.assertEqual(results[0][2], {"id": "a", "urgency": "this_week"})
+
+    def test_fields_missing_from_the_spec_are_left_alone(self):
+        [(kind, _, detail)] = iter_sync([{"title": "Write Q3 report"}], REMOTE, fields=("urgency", "category"))
+        self.assertEqual((kind, detail["id"]), (UNCHANGED, "a"))
+
+    def test_duplicates_within_the_file(self):
+        specs = [
+            {"title": "Brand new"},
+            {"title": "BRAND  new"},
+            {"title": "Write Q3 report"},
+            {"title": "Other title", "source_id": "slack-1"},
+            {"title": "Renamed on the board"},  # same remote row as the source_id match
+        ]
+        kinds = [kind for kind, _, _ in iter_sync(specs, REMOTE)]
+        self.assertEqual(kinds, [INSERT, DUPLICATE, UNCHANGED, UNCHANGED, DUPLICATE])
+
+    def test_plan_sync_groups_the_same_results(self):
+        plan = plan_sync([{"title": "New"}, {"title": "new"}, {"title": "Write Q3 report", "urgency": "today"},
+                          {"title": "Renamed on the board", "urgency": "today"}], REMOTE, fields=("urgency",))
+        self.assertEqual([s["title"] for s in plan.inserts], ["New"])
+        self.assertEqual([s["title"] for s in plan.duplicates], ["new"])
+        self.assertEqual(len(plan.unchanged), 1)
+        self.assertEqual(plan.patches, [{"id": "b", "urgency": "today"}])
+
+
+class IterFuzzyTest(unittest.TestCase):
+    def match_titles(self, titles):
+        return [{"task": REMOTE[1], "similarity": 0.8} for _ in titles]
+
+    def test_claimed_and_unknown_ids_stay_inserts(self):
+        specs = [{"title": "Renamed on board"}, {"title": "Renamed on a board"}]
+        results = list(iter_fuzzy(specs, self.match_titles, ("urgency",), claimed=set()))
+        self.assertEqual([kind for kind, *_ in results], [UNCHANGED, INSERT])
+
+        claimed = {"b"}
+        results = list(iter_fuzzy(specs[:1], self.match_titles, claimed=claimed))
+        self.assertEqual(results[0][0], INSERT)
+
+        results = list(iter_fuzzy(specs[:1], self.match_titles, known_ids={"a"}))
+        self.assertEqual(results[0][0], INSERT)
+
+    def test_update_carries_the_match(self):
+        [(kind, _, detail, match)] = iter_fuzzy(
+            [{"title": "Renamed on board", "urgency": "today"}], self.match_titles, ("urgency",), known_ids={"b"})
+        self.assertEqual((kind, detail, match["similarity"]), (UPDATE, {"id": "b", "urgency": "today"}, 0.8))
+
+    def test_no_specs_means_no_lookup(self):
+        self.assertEqual(list(iter_fuzzy([], lambda titles: self.fail("looked up"))), [])
+
+
+if __name__ == "__main__":
+    unittest.main()